@@ -2,6 +2,7 @@
 
 from machine import Pin, PWM
 import time
+from calibration import get_profile
 
 servo_y = PWM(Pin(15))
 servo_y.freq(50)
@@ -9,10 +10,10 @@ servo_y.freq(50)
 servo_x = PWM(Pin(14))
 servo_x.freq(50)
 
+servo_profile = get_profile('df9gms_wide')  # 0.5-2.5 ms over 180°
+
 def set_angle(servo, angle):
-    angle = max(0, min(180, angle))
-    duty_ns = int(500000 + (angle / 180) * 2000000)
-    servo.duty_ns(duty_ns)
+    servo.duty_ns(servo_profile.to_ns(angle))
 
 time.sleep(2)  # Let things settle
 
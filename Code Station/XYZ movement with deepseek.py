@@ -1,6 +1,7 @@
 import machine
 import time
-import math
+from easing import get_table, interpolate
+from calibration import get_profile
 
 # Servo setup with power management
 servo_y = machine.PWM(machine.Pin(15))
@@ -11,26 +12,22 @@ servo_y.freq(50)
 servo_x.freq(50)
 servo_z.freq(50)
 
-# Conservative calibration for DF9GMS
-SERVO_MIN_US = 600
-SERVO_MAX_US = 2400
-SERVO_MIN_DUTY = int((SERVO_MIN_US * 65535) / 20000)
-SERVO_MAX_DUTY = int((SERVO_MAX_US * 65535) / 20000)
+# Conservative calibration for DF9GMS (600-2400 us, see calibration.py)
+servo_profile = get_profile('df9gms_safe')
 
 # Initial positions
 current_y = 90
 current_x = 80
 current_z = 90
 
+easing = get_table('cosine')
+
 # Power stabilization
 time.sleep(1)
 print("Power stabilized")
 
 def angle_to_duty(angle):
-    angle = max(0, min(180, angle))
-    pulse_width = SERVO_MIN_US + (angle / 180) * (SERVO_MAX_US - SERVO_MIN_US)
-    duty = int((pulse_width * 65535) / 20000)
-    return max(SERVO_MIN_DUTY, min(SERVO_MAX_DUTY, duty))
+    return servo_profile.to_u16(angle)
 
 def set_servo_ultra_smooth(servo, current_angle, target_angle, duration=3.0):
     """Ultra smooth movement with cosine easing"""
@@ -40,13 +37,15 @@ def set_servo_ultra_smooth(servo, current_angle, target_angle, duration=3.0):
     steps = 150  # More steps for smoother movement
     step_delay = duration / steps
     
+    # angle_to_duty is linear, so easing the duty directly matches easing the angle
+    start_duty = angle_to_duty(current_angle)
+    target_duty = angle_to_duty(target_angle)
+    
     for i in range(steps + 1):
-        t = i / steps
         # Cosine easing for very smooth movement
-        smooth_t = 0.5 - 0.5 * math.cos(t * math.pi)
+        smooth_w = easing.sample(i, steps)
         
-        intermediate_angle = current_angle + (target_angle - current_angle) * smooth_t
-        servo.duty_u16(angle_to_duty(intermediate_angle))
+        servo.duty_u16(interpolate(start_duty, target_duty, smooth_w))
         time.sleep(step_delay)
     
     return target_angle
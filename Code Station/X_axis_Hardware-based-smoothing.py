@@ -1,6 +1,6 @@
 from machine import Pin, PWM
 import utime
-import math
+from easing import get_table, interpolate
 
 MID = 1500000
 MIN = 1000000
@@ -8,6 +8,7 @@ MAX = 2000000
 
 pwm = PWM(Pin(14))
 pwm.freq(50)
+easing = get_table('quad_in_out')
 
 def smooth_move_variable(start_ns, end_ns, duration=3.0):
     """Variable speed - slower at start/end, faster in middle"""
@@ -16,13 +17,10 @@ def smooth_move_variable(start_ns, end_ns, duration=3.0):
     
     for i in range(steps + 1):
         t = i / steps
-        # Slow start and slow end (ease in-out)
-        if t < 0.5:
-            ease_t = 2 * t * t  # Accelerate
-        else:
-            ease_t = 1 - pow(-2 * t + 2, 2) / 2  # Decelerate
+        # Slow start and slow end (quadratic ease in-out table)
+        ease_w = easing.sample(i, steps)
             
-        current_pos = int(start_ns + (end_ns - start_ns) * ease_t)
+        current_pos = interpolate(start_ns, end_ns, ease_w)
         pwm.duty_ns(current_pos)
         
         # Variable delay for smoother motion
@@ -0,0 +1,202 @@
+# Precompile the controller libraries (runs on the PC, not the Pico).
+#
+#   python3 build_mpy.py --mpy                 # build/*.mpy via mpy-cross
+#   python3 build_mpy.py --manifest            # manifest.py to freeze them
+#   python3 build_mpy.py --report [out.json]   # source vs bytecode load cost
+#
+# A .py module is parsed and compiled on the Pico every time it is imported,
+# which costs boot time and leaves the compiler's garbage on the heap. A .mpy
+# is already bytecode, and a frozen module (built into the firmware) runs its
+# bytecode straight from flash.
+#
+#   .mpy     pip install mpy-cross (same version as the firmware), then
+#            --mpy and copy build/ to the root of the Pico's filesystem
+#   frozen   --manifest, then build the firmware with it:
+#            make -C ports/rp2 BOARD=RPI_PICO FROZEN_MANIFEST=$PWD/manifest.py
+#
+# Either way delete the .py copies of those modules from the Pico: the import
+# system finds foo.py before foo.mpy, and '' comes before '.frozen' in
+# sys.path. The launchers (Final_code_*.py) stay .py. On the Pico,
+# pia.app.import_report() logs what each import actually costs.
+
+import ast
+import json
+import marshal
+import os
+import shutil
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ENTRY_SCRIPTS = ('Final_code_xyz_movement.py', 'Final_code_Movement+LEDs.py')
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.py'
+MPY_ARCH = 'armv6m'       # RP2040 (Cortex-M0+)
+REPEAT = 20               # Timing runs per module in the report
+
+
+# ==================== MODULE DISCOVERY ====================
+def module_path(name):
+    """Source file of a Code Station module ('pia.motion' -> 'pia/motion.py'), or None"""
+    parts = name.split('.')
+    package = os.path.join(*parts, '__init__.py')
+    if os.path.exists(os.path.join(HERE, package)):
+        return package
+    module = os.path.join(*parts) + '.py'
+    if os.path.exists(os.path.join(HERE, module)):
+        return module
+    return None
+
+
+def _imported_names(path):
+    """Every module path imported anywhere in a file, including inside functions"""
+    with open(os.path.join(HERE, path)) as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+            # from pia import motion_tests
+            names.extend(node.module + '.' + alias.name for alias in node.names)
+    return names
+
+
+def library_modules(entries=ENTRY_SCRIPTS):
+    """Code Station modules the entry scripts import, directly or not (paths, sorted)"""
+    found = set()
+    pending = list(entries)
+    while pending:
+        path = pending.pop()
+        for name in _imported_names(path):
+            parts = name.split('.')
+            for i in range(1, len(parts) + 1):  # pia.motion imports pia first
+                dep = module_path('.'.join(parts[:i]))
+                if dep and dep not in found:
+                    found.add(dep)
+                    pending.append(dep)
+    return sorted(found)
+
+
+# ==================== BUILD ====================
+def build_mpy(paths, out_dir=BUILD_DIR):
+    """Cross-compile paths into out_dir/*.mpy, keeping the package layout"""
+    mpy_cross = shutil.which('mpy-cross')
+    if mpy_cross is None:
+        print("❌ mpy-cross not found (pip install mpy-cross, matching the firmware version)")
+        return False
+    for path in paths:
+        target = os.path.join(out_dir, path[:-len('.py')] + '.mpy')
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        subprocess.run([mpy_cross, '-march=' + MPY_ARCH, '-o', target, os.path.join(HERE, path)],
+                       check=True)
+        print(f"📦 {target}: {os.path.getsize(target)} bytes")
+    return True
+
+
+def write_manifest(paths, path=MANIFEST):
+    """Freeze manifest for the rp2 port: the top-level modules plus the pia package"""
+    lines = [
+        "# Generated by build_mpy.py",
+        'include("$(PORT_DIR)/boards/manifest.py")',
+    ]
+    for module in paths:
+        if os.sep not in module:
+            lines.append(f'module("{module}", base_path="{HERE}")')
+    if any(module.startswith('pia' + os.sep) for module in paths):
+        lines.append(f'package("pia", base_path="{HERE}")')
+    with open(path, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    print(f"📝 Manifest written to {path} ({len(lines) - 2} entries)")
+
+
+# ==================== LOAD COST REPORT ====================
+def _measure(load):
+    """(average seconds, peak traced bytes) of calling load()"""
+    tracemalloc.start()
+    load()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        load()
+    return (time.perf_counter() - started) / REPEAT, peak
+
+
+def report(paths, out_dir=BUILD_DIR):
+    """
+    What importing each module costs from source vs from bytecode
+    On the PC, CPython's compile() stands in for the Pico parsing a .py and
+    marshal.loads() for it loading a .mpy, so the ratio is what to look at
+    """
+    results = []
+    for path in paths:
+        with open(os.path.join(HERE, path)) as f:
+            source = f.read()
+        code = compile(source, path, 'exec')
+        data = marshal.dumps(code)
+        compile_s, compile_peak = _measure(lambda: compile(source, path, 'exec'))
+        load_s, load_peak = _measure(lambda: marshal.loads(data))
+        mpy = os.path.join(out_dir, path[:-len('.py')] + '.mpy')
+        results.append({
+            'module': path,
+            'source_bytes': len(source.encode()),
+            'mpy_bytes': os.path.getsize(mpy) if os.path.exists(mpy) else None,
+            'compile_us': round(compile_s * 1000000),
+            'compile_peak_bytes': compile_peak,
+            'load_us': round(load_s * 1000000),
+            'load_peak_bytes': load_peak,
+        })
+    return results
+
+
+def print_report(results):
+    print("=" * 84)
+    print("📦 IMPORT COST: compile from source vs load bytecode (CPython proxy)")
+    print("=" * 84)
+    print(f"{'module':<22}{'source B':>10}{'mpy B':>8}{'compile us':>12}{'peak B':>10}"
+          f"{'load us':>10}{'peak B':>10}")
+    totals = [0, 0, 0, 0, 0]
+    for r in results:
+        mpy = r['mpy_bytes'] if r['mpy_bytes'] is not None else '-'
+        print(f"{r['module']:<22}{r['source_bytes']:>10}{mpy:>8}{r['compile_us']:>12}"
+              f"{r['compile_peak_bytes']:>10}{r['load_us']:>10}{r['load_peak_bytes']:>10}")
+        for i, key in enumerate(('source_bytes', 'compile_us', 'compile_peak_bytes',
+                                 'load_us', 'load_peak_bytes')):
+            totals[i] += r[key]
+    print(f"{'total':<22}{totals[0]:>10}{'':>8}{totals[1]:>12}{totals[2]:>10}"
+          f"{totals[3]:>10}{totals[4]:>10}")
+    print(f"Bytecode loads {totals[1] / max(1, totals[3]):.1f}x faster with "
+          f"{totals[2] / max(1, totals[4]):.1f}x less peak memory")
+    print("=" * 84)
+
+
+# ==================== COMMAND LINE ====================
+def main(argv):
+    paths = library_modules()
+    if len(argv) < 2:
+        print("usage: python3 build_mpy.py --mpy | --manifest | --report [out.json]")
+        print("modules: " + " ".join(paths))
+        return 1
+    status = 0
+    args = argv[1:]
+    if '--mpy' in args and not build_mpy(paths):
+        status = 1
+    if '--manifest' in args:
+        write_manifest(paths)
+    if '--report' in args:
+        results = report(paths)
+        print_report(results)
+        i = args.index('--report')
+        if i + 1 < len(args) and not args[i + 1].startswith('--'):
+            with open(args[i + 1], 'w') as f:
+                json.dump({'repeat': REPEAT, 'results': results}, f, indent=2)
+            print(f"📝 Results written to {args[i + 1]}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
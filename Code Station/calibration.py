@@ -0,0 +1,119 @@
+from array import array
+
+# ==================== SERVO CALIBRATION ====================
+# One profile per servo type/mounting. Each profile precomputes an integer
+# angle → duty table (whole degrees 0..180) in both duty_ns and duty_u16 form,
+# so converting an angle is a single indexed load instead of dict lookups and
+# float division on every tick.
+
+MAX_DEGREES = 180
+PWM_PERIOD_NS = 20000000  # 50 Hz servo frame
+
+# name: (min pulse ns, max pulse ns, angular span in degrees)
+PROFILE_SPECS = {
+    'final': (1000000, 2000000, 180),      # Final_code controllers (1-2 ms)
+    'df9gms_wide': (500000, 2500000, 180),  # set_angle() scripts
+    'df9gms_165': (500000, 2500000, 165),   # xyz Movement_with_Delay.py Y/Z axes
+    'df9gms_safe': (600000, 2400000, 180),  # XYZ movement with deepseek.py
+}
+
+
+class ServoProfile:
+    def __init__(self, min_ns, max_ns, span_deg=MAX_DEGREES, correction=None):
+        """
+        min_ns/max_ns: pulse width at 0° and at span_deg
+        correction: optional [(degrees, offset_ns), ...] measured on the servo,
+                    linearly interpolated and added to the ideal pulse
+        """
+        self.min_ns = min_ns
+        self.max_ns = max_ns
+        self.span_deg = span_deg
+        self.correction = correction
+        self.ns_table = array('i', [0] * (MAX_DEGREES + 1))
+        self.u16_table = array('H', [0] * (MAX_DEGREES + 1))
+
+        for deg in range(MAX_DEGREES + 1):
+            ns = min_ns + (deg * (max_ns - min_ns)) // span_deg
+            if correction:
+                ns += self._correction_at(deg)
+            ns = max(min_ns, min(max_ns, ns))  # Never drive past the end stops
+            self.ns_table[deg] = ns
+            self.u16_table[deg] = min(65535, (ns * 65535) // PWM_PERIOD_NS)
+
+    def _correction_at(self, deg):
+        points = self.correction
+        if deg <= points[0][0]:
+            return points[0][1]
+        for (d0, o0), (d1, o1) in zip(points, points[1:]):
+            if deg <= d1:
+                return o0 + (o1 - o0) * (deg - d0) // (d1 - d0)
+        return points[-1][1]
+
+    def to_ns(self, degrees):
+        """Pulse width in ns for an angle (clamped to 0..180)"""
+        return self.ns_table[max(0, min(MAX_DEGREES, int(degrees)))]
+
+    def to_u16(self, degrees):
+        """duty_u16 value for an angle (clamped to 0..180)"""
+        return self.u16_table[max(0, min(MAX_DEGREES, int(degrees)))]
+
+    def to_degrees(self, ns):
+        """Nearest whole angle for a pulse width (inverse table lookup)"""
+        table = self.ns_table
+        lo, hi = 0, MAX_DEGREES
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if table[mid] < ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo > 0 and ns - table[lo - 1] < table[lo] - ns:
+            return lo - 1
+        return lo
+
+    def centi_to_ns(self, centidegrees):
+        """Pulse width for an angle in 1/100° (interpolated between table entries)"""
+        centidegrees = max(0, min(MAX_DEGREES * 100, int(centidegrees)))
+        deg, frac = divmod(centidegrees, 100)
+        ns = self.ns_table[deg]
+        if frac:
+            ns += (self.ns_table[deg + 1] - ns) * frac // 100
+        return ns
+
+    def ns_to_centi(self, ns):
+        """Angle in 1/100° for a pulse width (inverse of centi_to_ns)"""
+        table = self.ns_table
+        if ns <= table[0]:
+            return 0
+        if ns >= table[MAX_DEGREES]:
+            return MAX_DEGREES * 100
+        lo, hi = 0, MAX_DEGREES
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if table[mid] < ns:
+                lo = mid + 1
+            else:
+                hi = mid
+        # table[lo - 1] < ns <= table[lo]
+        step = table[lo] - table[lo - 1]
+        return (lo - 1) * 100 + ((ns - table[lo - 1]) * 100 + step // 2) // step
+
+
+_profiles = {}
+
+
+def get_profile(name):
+    """Return the shared profile for name, building its tables on first use"""
+    profile = _profiles.get(name)
+    if profile is None:
+        if name not in PROFILE_SPECS:
+            raise ValueError("unknown servo profile: %s" % name)
+        profile = ServoProfile(*PROFILE_SPECS[name])
+        _profiles[name] = profile
+    return profile
+
+
+def register_profile(name, profile):
+    """Add a custom (e.g. corrected) profile under name"""
+    _profiles[name] = profile
+    return profile
@@ -0,0 +1,155 @@
+# Motion clip compiler (runs on the PC, not the Pico).
+#
+#   python3 clip_compiler.py full_sequence.clip.json [full_sequence.clip]
+#
+# Reads a declarative sequence description (axes, keyframes, easing, LED
+# colours), evaluates the whole timeline once and writes every frame's duty
+# values and LED frame into a compact binary clip (format: clip_format.py).
+# Copy the .clip file to the Pico; clip_player.py streams it back.
+
+import json
+import struct
+import sys
+
+from calibration import get_profile
+from clip_format import HEADER_FORMAT, NO_LED_CHANGE, pack_header
+from easing import get_table
+from sequence import compile_sequences
+
+
+# ==================== LED FRAMES ====================
+def _grb_frame(color, num_leds):
+    r, g, b = color
+    return bytes((g, r, b)) * num_leds
+
+
+def _mix_colors(colors, mask):
+    """Per-channel max of the colors set in mask (as the LED controller does)"""
+    r = g = b = 0
+    for bit, color in enumerate(colors):
+        if mask & (1 << bit):
+            r = max(r, color[0])
+            g = max(g, color[1])
+            b = max(b, color[2])
+    return (r, g, b)
+
+
+def _led_colors(desc, timeline, colors):
+    """Color per frame: axis colors while moving, then the finale fade"""
+    frame_ms = desc['frame_ms']
+    finale = desc.get('leds', {}).get('finale')
+    spans = [timeline.track_span(axis) for axis in timeline.order]
+
+    finale_at = timeline.total_frames
+    fade_frames = 0
+    if finale:
+        fade_frames = max(1, int(finale['duration'] * 1000) // frame_ms)
+        finale_at = max(0, timeline.total_frames - fade_frames)
+    total = max(timeline.total_frames, finale_at + fade_frames)
+
+    out = []
+    for n in range(total + 1):
+        if finale and n >= finale_at:
+            start, end = finale['fade']
+            steps = finale.get('steps', 20)
+            step = min(n - finale_at, fade_frames) * steps // fade_frames
+            level = start + (end - start) * step // steps
+            out.append((level, level, level))
+        else:
+            active = 0
+            for bit, span in enumerate(spans):
+                if span[0] <= n < span[1]:
+                    active |= 1 << bit
+            out.append(_mix_colors(colors, active))
+    if finale:
+        out.append((0, 0, 0))  # Fade ends with the LEDs cleared
+    return out
+
+
+# ==================== COMPILER ====================
+def compile_clip(desc):
+    """Evaluate a clip description; returns the clip file contents"""
+    frame_ms = desc['frame_ms']
+    axes = desc['axes']
+    profiles = {a['axis']: get_profile(a.get('profile', 'final')) for a in axes}
+    easing = get_table(desc.get('easing', 'cosine'))
+
+    def to_ns(axis, degrees):
+        return profiles[axis].to_ns(degrees)
+
+    start = {a['axis']: to_ns(a['axis'], a['start']) for a in axes}
+    timeline = compile_sequences(
+        {a['axis']: a['keyframes'] for a in axes}, start, to_ns,
+        order=[a['axis'] for a in axes], frame_ms=frame_ms,
+        segment_duration=desc.get('segment_duration', 4.0),
+        hold=desc.get('hold', 0.0), overlap=desc.get('overlap', 1.0))
+
+    num_leds = desc.get('leds', {}).get('count', 0)
+    color_of = {a['axis']: tuple(a.get('color', (0, 0, 0))) for a in axes}
+    led_colors = []
+    if num_leds:
+        led_colors = _led_colors(desc, timeline, [color_of[axis] for axis in timeline.order])
+    num_frames = max(timeline.total_frames + 1, len(led_colors))
+
+    # Evaluate every axis on every frame
+    duty_frames = []
+    positions = dict(start)
+    timeline.rewind()
+    for n in range(num_frames):
+        if timeline.order:
+            timeline.sample_into(min(n, timeline.total_frames), easing, positions)
+        duty_frames.append([positions[a['axis']] for a in axes])
+
+    max_ns = max(max(frame) for frame in duty_frames)
+    shift = 0
+    while (max_ns + (1 << shift) // 2) >> shift > 0xFFFF:
+        shift += 1
+
+    # Deduplicate LED frames; every record names the frame to show, so a
+    # player that drops frames still ends up on the right colors
+    led_table = []
+    led_index = {}
+    led_refs = []
+    for n in range(num_frames):
+        color = led_colors[n] if n < len(led_colors) else None
+        if color is None:
+            led_refs.append(NO_LED_CHANGE)
+            continue
+        frame = _grb_frame(color, num_leds)
+        if frame not in led_index:
+            led_index[frame] = len(led_table)
+            led_table.append(frame)
+        led_refs.append(led_index[frame])
+
+    out = pack_header([a['axis'] for a in axes], [a['pin'] for a in axes], frame_ms,
+                      num_frames, num_leds, led_table, shift)
+    record = struct.Struct('<%dH' % (len(axes) + 1))
+    half = (1 << shift) // 2
+    for duties, led in zip(duty_frames, led_refs):
+        out += record.pack(*[(ns + half) >> shift for ns in duties], led)
+    return bytes(out)
+
+
+def main(argv):
+    if len(argv) < 2:
+        print("usage: python3 clip_compiler.py description.json [output.clip]")
+        return 1
+    source = argv[1]
+    if len(argv) > 2:
+        target = argv[2]
+    elif source.endswith('.clip.json'):
+        target = source[:-len('.json')]
+    else:
+        target = source.rsplit('.', 1)[0] + '.clip'
+    with open(source) as f:
+        desc = json.load(f)
+    data = compile_clip(desc)
+    with open(target, 'wb') as f:
+        f.write(data)
+    frames = struct.unpack_from(HEADER_FORMAT, data)[4]
+    print(f"🎞️  {target}: {frames} frames ({frames * desc['frame_ms'] / 1000:.1f}s), {len(data)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
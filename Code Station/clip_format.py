@@ -0,0 +1,43 @@
+import struct
+
+# ==================== MOTION CLIP FILE FORMAT ====================
+# Written by clip_compiler.py on the host, read by clip_player.py on the Pico.
+# All values little-endian.
+#
+#   header   magic 'PIAC', version u8, axes u8, frame_ms u16, frames u32,
+#            leds u16, led_frames u16, duty_shift u8, reserved u8
+#   axes     per axis: name (1 byte) + pin u8
+#   leds     led_frames x (leds x 3) bytes of GRB data (deduplicated frames)
+#   records  frames x (axes x u16 duty + u16 led frame index)
+#
+# duty = duty_ns >> duty_shift (the compiler picks the smallest shift that
+# fits u16). The led index names the LED frame to show (players only push it
+# when it differs from the one already shown); NO_LED_CHANGE = no LED data.
+
+CLIP_MAGIC = b'PIAC'
+CLIP_VERSION = 1
+HEADER_FORMAT = '<4sBBHIHHBB'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+AXIS_ENTRY_SIZE = 2
+NO_LED_CHANGE = 0xFFFF
+
+
+def pack_header(axes, pins, frame_ms, num_frames, num_leds, led_table, duty_shift):
+    """Header, axis table and LED frame table: everything before the records"""
+    out = bytearray(struct.pack(HEADER_FORMAT, CLIP_MAGIC, CLIP_VERSION, len(axes), frame_ms,
+                                num_frames, num_leds, len(led_table), duty_shift, 0))
+    for axis, pin in zip(axes, pins):
+        out += struct.pack('<cB', axis.encode(), pin)
+    for frame in led_table:
+        out += frame
+    return out
+
+
+def record_size(num_axes):
+    """Bytes per frame record"""
+    return num_axes * 2 + 2
+
+
+def records_offset(num_axes, num_leds, num_led_frames):
+    """File offset of the first frame record"""
+    return HEADER_SIZE + num_axes * AXIS_ENTRY_SIZE + num_led_frames * num_leds * 3
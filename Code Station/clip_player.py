@@ -0,0 +1,144 @@
+import struct
+import log
+from clip_format import (CLIP_MAGIC, CLIP_VERSION, HEADER_FORMAT, HEADER_SIZE,
+                         AXIS_ENTRY_SIZE, NO_LED_CHANGE, record_size, records_offset)
+
+# ==================== MOTION CLIP PLAYER ====================
+# Streams a compiled clip (see clip_compiler.py) from flash. Records are read
+# CHUNK_FRAMES at a time with readinto() into one preallocated buffer that is
+# reused for the whole clip, so RAM use does not depend on the clip length.
+# Frames write the stored duty values - integer shifts only, no float math
+# and no easing at runtime.
+
+CHUNK_FRAMES = 32  # Records per flash read (8 bytes each for 3 axes)
+
+
+class ClipPlayer:
+    def __init__(self, path, chunk_frames=CHUNK_FRAMES):
+        self.path = path
+        self.file = open(path, 'rb')
+        header = self.file.read(HEADER_SIZE)
+        (magic, version, self.num_axes, self.frame_ms, self.num_frames,
+         self.num_leds, num_led_frames, self.duty_shift, _) = struct.unpack(HEADER_FORMAT, header)
+        if magic != CLIP_MAGIC or version != CLIP_VERSION:
+            self.file.close()
+            raise ValueError("%s is not a version %d motion clip" % (path, CLIP_VERSION))
+
+        axis_table = self.file.read(self.num_axes * AXIS_ENTRY_SIZE)
+        self.axes = [chr(axis_table[k * 2]) for k in range(self.num_axes)]
+        self.pins = [axis_table[k * 2 + 1] for k in range(self.num_axes)]
+
+        # Deduplicated LED frames stay in RAM (a handful of distinct frames)
+        frame_bytes = self.num_leds * 3
+        table = memoryview(self.file.read(num_led_frames * frame_bytes))
+        self.led_frames = [table[i * frame_bytes:(i + 1) * frame_bytes]
+                           for i in range(num_led_frames)]
+
+        self.record_size = record_size(self.num_axes)
+        self.chunk = bytearray(self.record_size * chunk_frames)
+        self._chunk_mv = memoryview(self.chunk)
+        self.chunk_start = 0      # Frame index of the first record in chunk
+        self.chunk_frames = 0     # Records currently loaded
+        self.offset = 0           # Byte offset of the current record in chunk
+        self.chunk_reads = 0
+        self.data_offset = records_offset(self.num_axes, self.num_leds, num_led_frames)
+        self.position = -1        # Frame the file is positioned at (-1: unknown)
+        self.first = self._first_positions()
+
+    def _first_positions(self):
+        self.read_frame(0)
+        return {axis: self.duty_ns(k) for k, axis in enumerate(self.axes)}
+
+    def close(self):
+        self.file.close()
+
+    def duration(self):
+        return (self.num_frames - 1) * self.frame_ms / 1000
+
+    # ---------- records ----------
+    def read_frame(self, frame):
+        """Select record `frame`, reading the next chunk from flash when needed"""
+        index = frame - self.chunk_start
+        if index < 0 or index >= self.chunk_frames:
+            self._load_chunk(frame)
+            index = 0
+        self.offset = index * self.record_size
+
+    def _load_chunk(self, frame):
+        if frame != self.position:
+            self.file.seek(self.data_offset + frame * self.record_size)
+        read = self.file.readinto(self._chunk_mv) or 0
+        self.chunk_start = frame
+        self.chunk_frames = read // self.record_size
+        self.position = frame + self.chunk_frames
+        self.chunk_reads += 1
+
+    def duty_ns(self, k):
+        """Duty of axis slot k in the selected record"""
+        chunk = self.chunk
+        i = self.offset + 2 * k
+        return (chunk[i] | (chunk[i + 1] << 8)) << self.duty_shift
+
+    def led_index(self):
+        chunk = self.chunk
+        i = self.offset + 2 * self.num_axes
+        return chunk[i] | (chunk[i + 1] << 8)
+
+    def final_positions(self):
+        """duty_ns each axis ends on"""
+        self.read_frame(self.num_frames - 1)
+        return {axis: self.duty_ns(k) for k, axis in enumerate(self.axes)}
+
+    def starts_at(self, positions, tolerance_ns=1 << 8):
+        """True if the clip's first frame matches positions {axis: ns}"""
+        for axis, ns in self.first.items():
+            if abs(positions.get(axis, ns) - ns) > tolerance_ns:
+                return False
+        return True
+
+    # ---------- playback ----------
+    def task(self, servos, strip=None, output=None, frame_ms=None):
+        """
+        MotionEngine task playing the clip on servos {axis: PWM}
+        strip: optional led_driver.LedStrip for the LED frames
+        output: pwm_output.PwmOutput to flush after each frame, when servos
+                are its channels and nothing else flushes it
+        frame_ms: engine frame period, when it differs from the clip's
+        """
+        pwms = [servos[axis] for axis in self.axes]
+        last = self.num_frames - 1
+        shown = NO_LED_CHANGE
+        n = yield
+        while True:
+            if frame_ms is not None:
+                n = n * frame_ms // self.frame_ms
+            frame = n if n < last else last
+            self.read_frame(frame)
+            for k in range(self.num_axes):
+                pwms[k].duty_ns(self.duty_ns(k))
+            if output is not None:
+                output.flush()
+            led = self.led_index()
+            if strip is not None and led != NO_LED_CHANGE and led != shown:
+                strip.buf[:] = self.led_frames[led]
+                strip.show()
+                shown = led
+            if frame >= last:
+                break
+            n = yield
+
+    def play(self, servos, clock, strip=None, output=None):
+        """Play the whole clip on its own FrameScheduler"""
+        task = self.task(servos, strip, output)
+        next(task)
+        completed = False
+        try:
+            for frame in clock.frames(self.num_frames - 1):
+                task.send(frame)
+        except StopIteration:
+            completed = True
+        finally:
+            clock.end(completed)
+        log.default.frames_done()  # The clip's last frame ends the loop early
+        if strip is not None:
+            strip.flush()
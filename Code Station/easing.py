@@ -0,0 +1,102 @@
+import math
+from array import array
+
+# ==================== FIXED-POINT EASING TABLES ====================
+# Easing weights are stored in Q16 fixed point: 0 = start, 65536 = target.
+# Each curve is sampled once per resolution, then moves only do integer
+# table lookups with linear interpolation between neighbouring entries.
+
+Q16_SHIFT = 16
+Q16_ONE = 1 << Q16_SHIFT
+DEFAULT_RESOLUTION = 256
+
+
+def _cosine(t):
+    """Smooth cosine easing (Final_code controllers)"""
+    return 0.5 - 0.5 * math.cos(t * math.pi)
+
+
+def _smoothstep(t):
+    """Cubic smoothstep easing (x-axis_MOVEMENT.py)"""
+    return t * t * (3 - 2 * t)
+
+
+def _quad_in_out(t):
+    """Quadratic ease in-out (X_axis_Hardware-based-smoothing.py)"""
+    if t < 0.5:
+        return 2 * t * t
+    return 1 - pow(-2 * t + 2, 2) / 2
+
+
+def _linear(t):
+    return t
+
+
+CURVES = {
+    'cosine': _cosine,
+    'smoothstep': _smoothstep,
+    'quad_in_out': _quad_in_out,
+    'linear': _linear,
+}
+
+
+class EasingTable:
+    def __init__(self, curve, resolution=DEFAULT_RESOLUTION):
+        if curve not in CURVES:
+            raise ValueError("unknown easing curve: %s" % curve)
+        fn = CURVES[curve]
+        self.curve = curve
+        self.resolution = resolution
+        self.values = array('i', [int(fn(i / resolution) * Q16_ONE + 0.5)
+                                  for i in range(resolution + 1)])
+        # Pin both ends so a finished move always lands exactly on target
+        self.values[0] = 0
+        self.values[resolution] = Q16_ONE
+
+    def sample(self, step, total_steps):
+        """Q16 eased weight for step out of total_steps"""
+        if step >= total_steps:
+            return Q16_ONE
+        if step <= 0:
+            return 0
+        scaled = step * self.resolution
+        idx = scaled // total_steps
+        frac = scaled - idx * total_steps
+        values = self.values
+        a = values[idx]
+        if frac == 0:
+            return a
+        return a + (values[idx + 1] - a) * frac // total_steps
+
+    def sample_q16(self, t_q16):
+        """Q16 eased weight for a Q16 progress value (0..65536)"""
+        return self.sample(t_q16, Q16_ONE)
+
+
+def register_curve(name, fn):
+    """Add an easing function fn(t) -> 0..1 under name"""
+    CURVES[name] = fn
+    return name
+
+
+_tables = {}
+
+
+def get_table(curve='cosine', resolution=DEFAULT_RESOLUTION):
+    """Return the shared table for curve/resolution, building it on first use"""
+    key = (curve, resolution)
+    table = _tables.get(key)
+    if table is None:
+        table = EasingTable(curve, resolution)
+        _tables[key] = table
+    return table
+
+
+def interpolate(start, target, weight_q16):
+    """
+    Blend start → target by a Q16 weight using integer math only
+    The delta is split so both products stay MicroPython small ints
+    (no heap allocation) for deltas up to ~2 ms; see trajectory.MoveKernel
+    """
+    delta = target - start
+    return start + (((delta >> 7) * weight_q16) >> 9) + (((delta & 127) * weight_q16) >> 16)
@@ -0,0 +1,94 @@
+# Per-tick CPU cost of the old float easing vs the fixed-point tables.
+# Runs on the Pico (utime) and on a PC (time). Only the Pico numbers matter:
+# CPython has hardware floats, the RP2040 boxes and soft-emulates every one.
+
+import math
+from easing import get_table, interpolate
+
+try:
+    from utime import ticks_us, ticks_diff
+except ImportError:
+    import time
+
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+START_NS = 1000000
+TARGET_NS = 2000000
+TICKS = 400  # 4 s move at 10 ms per tick (coordinated_move)
+
+
+# ==================== OLD FLOAT EASING ====================
+def _float_cosine(i, total):
+    t = i / total
+    return 0.5 - 0.5 * math.cos(t * math.pi)
+
+
+def _float_smoothstep(i, total):
+    t = i / total
+    return t * t * (3 - 2 * t)
+
+
+def _float_quad_in_out(i, total):
+    t = i / total
+    if t < 0.5:
+        return 2 * t * t
+    return 1 - pow(-2 * t + 2, 2) / 2
+
+
+FLOAT_CURVES = {
+    'cosine': _float_cosine,
+    'smoothstep': _float_smoothstep,
+    'quad_in_out': _float_quad_in_out,
+}
+
+
+# ==================== BENCHMARK ====================
+def time_float(fn, ticks=TICKS):
+    start = ticks_us()
+    for i in range(ticks + 1):
+        ease_t = fn(i, ticks)
+        current_ns = int(START_NS + (TARGET_NS - START_NS) * ease_t)
+    return ticks_diff(ticks_us(), start) / (ticks + 1)
+
+
+def time_table(table, ticks=TICKS):
+    start = ticks_us()
+    for i in range(ticks + 1):
+        ease_w = table.sample(i, ticks)
+        current_ns = interpolate(START_NS, TARGET_NS, ease_w)
+    return ticks_diff(ticks_us(), start) / (ticks + 1)
+
+
+def max_error_ns(fn, table, ticks=TICKS):
+    """Largest difference between float and table positions over one move"""
+    worst = 0
+    for i in range(ticks + 1):
+        exact = int(START_NS + (TARGET_NS - START_NS) * fn(i, ticks))
+        fixed = interpolate(START_NS, TARGET_NS, table.sample(i, ticks))
+        worst = max(worst, abs(exact - fixed))
+    return worst
+
+
+def run(rounds=5):
+    print("=" * 56)
+    print("⏱️  EASING PER-TICK CPU TIME (%d ticks per move)" % TICKS)
+    print("=" * 56)
+    results = {}
+    for curve, fn in FLOAT_CURVES.items():
+        table = get_table(curve)
+        before = min(time_float(fn) for _ in range(rounds))
+        after = min(time_table(table) for _ in range(rounds))
+        error = max_error_ns(fn, table)
+        results[curve] = (before, after, error)
+        print("%-12s float %7.2f us  table %7.2f us  (%.1fx)  max err %d ns" % (
+            curve, before, after, before / after if after else 0, error))
+    print("=" * 56)
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+# ==================== HOT-LOOP KERNELS ====================
+# The innermost loops of the motion and LED paths, as plain functions over
+# preallocated buffers so they can be compiled by MicroPython's code
+# emitters (kernels_native.py):
+#
+#   sample_axes     per-tick duty of every axis of a move (trajectory.MoveKernel)
+#   render_rainbow  hue wheel around the strip into the GRB buffer (led_effects)
+#
+# Each kernel exists as plain Python (below), @micropython.native and
+# @micropython.viper, all with identical output; kernels_benchmark.py checks
+# that and times them. The fastest available is picked at import. CPython
+# and firmware without the native emitters get the Python versions.
+#
+# Viper functions take at most 4 arguments, so the per-tick inputs are packed
+# into arrays instead of being passed one by one.
+
+AXIS_PARAMS = 5  # params per axis: start, delta_hi, delta_lo, carry_hi, carry_lo
+
+
+def sample_axes_python(params, weights, out, prev):
+    """
+    out[k] = duty of axis k at the Q16 weights; the old out[k] goes to prev[k]
+    params: array('i'), AXIS_PARAMS per axis (split deltas, see trajectory.py)
+    weights: array('i', [axis count, eased weight, carry weight])
+    """
+    count = weights[0]
+    weight = weights[1]
+    carry = weights[2]
+    i = 0
+    for k in range(count):
+        prev[k] = out[k]
+        value = params[i] + ((params[i + 1] * weight) >> 9) + ((params[i + 2] * weight) >> 16)
+        if carry:
+            value += ((params[i + 3] * carry) >> 9) + ((params[i + 4] * carry) >> 16)
+        out[k] = value
+        i += AXIS_PARAMS
+
+
+def render_rainbow_python(buf, wheel, hue_base, offset):
+    """
+    Copy the wheel color of hue (hue_base[i] + offset) & 255 into LED i of buf
+    buf, wheel: GRB memoryviews (wheel: 256 colors); hue_base: bytes per LED
+    """
+    pos = 0
+    for base in hue_base:
+        src = ((base + offset) & 255) * 3
+        buf[pos:pos + 3] = wheel[src:src + 3]
+        pos += 3
+
+
+IMPLEMENTATIONS = {'python': (sample_axes_python, render_rainbow_python)}
+try:
+    import kernels_native
+    IMPLEMENTATIONS['native'] = (kernels_native.sample_axes_native,
+                                 kernels_native.render_rainbow_native)
+    IMPLEMENTATIONS['viper'] = (kernels_native.sample_axes_viper,
+                                kernels_native.render_rainbow_viper)
+except (ImportError, SyntaxError):
+    pass  # No micropython module (CPython) or no native emitter in this firmware
+
+for EMITTER in ('viper', 'native', 'python'):
+    if EMITTER in IMPLEMENTATIONS:
+        break
+sample_axes, render_rainbow = IMPLEMENTATIONS[EMITTER]
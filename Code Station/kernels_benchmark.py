@@ -0,0 +1,132 @@
+# Equivalence check and per-call time of the hot-loop kernels (kernels.py)
+# in every implementation available: Python, @micropython.native and
+# @micropython.viper. Runs on the Pico (utime) and on a PC (time). On a PC
+# the sim runs the native and viper source as Python with wrapping pointer
+# stores, so the check covers their logic but only the Pico times matter.
+
+try:
+    from utime import ticks_us, ticks_diff
+except ImportError:
+    import time
+    import sim_hardware
+    sim_hardware.install()  # Fake micropython module: the emitter kernels load too
+
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+from array import array
+from kernels import IMPLEMENTATIONS, EMITTER
+from trajectory import MoveKernel, MAX_DELTA_NS, carry_weight
+from easing import Q16_ONE
+from led_effects import WHEEL_GRB
+
+NUM_LEDS = 24
+AXES = 3
+TICKS = 400  # 4 s move at 10 ms per tick (coordinated_move)
+MOVES = ((1000000, 2000000, 0), (2000000, 1000000, 0), (1500000, 1500000, 0),
+         (1000000, 1000000 + MAX_DELTA_NS, 0), (1000000 + MAX_DELTA_NS, 1000000, 0),
+         (1200000, 1800000, 300000), (1800000, 1200000, -300000), (1500000, 1400000, MAX_DELTA_NS))
+
+
+# ==================== INPUTS ====================
+def _loaded_kernel(moves):
+    kernel = MoveKernel(len(moves))
+    for start_ns, target_ns, carry_ns in moves:
+        kernel.add(None, start_ns, target_ns, carry_ns)  # Kernels never touch the PWM
+    return kernel
+
+
+def _run_axes(sample, kernel, ticks=TICKS, blend=TICKS // 4):
+    """Every tick of a move through sample(); returns the duties as one array"""
+    count = kernel.count
+    duties = array('i', [0] * ((ticks + 1) * count))
+    weights = kernel.weights
+    out = kernel.out
+    for step in range(ticks + 1):
+        weights[1] = step * Q16_ONE // ticks
+        weights[2] = carry_weight(step, blend)
+        sample(kernel.params, weights, out, kernel.prev)
+        for k in range(count):
+            duties[step * count + k] = out[k]
+    return duties
+
+
+def _rainbow_frames(render, num_leds=NUM_LEDS):
+    """All 256 rotations of the rainbow, concatenated"""
+    buf = bytearray(num_leds * 3)
+    mv = memoryview(buf)
+    wheel = memoryview(WHEEL_GRB)
+    hue_base = bytes([i * 256 // num_leds for i in range(num_leds)])
+    frames = bytearray()
+    for offset in range(256):
+        render(mv, wheel, hue_base, offset)
+        frames.extend(buf)
+    return bytes(frames)
+
+
+# ==================== EQUIVALENCE ====================
+def check_equivalence():
+    """Every implementation gives the Python kernels' output exactly"""
+    sample_py, render_py = IMPLEMENTATIONS['python']
+    expected_axes = _run_axes(sample_py, _loaded_kernel(MOVES))
+    expected_leds = [_rainbow_frames(render_py, n) for n in (1, 7, NUM_LEDS)]
+    ok = True
+    for name, (sample, render) in IMPLEMENTATIONS.items():
+        same_axes = _run_axes(sample, _loaded_kernel(MOVES)) == expected_axes
+        same_leds = [_rainbow_frames(render, n) for n in (1, 7, NUM_LEDS)] == expected_leds
+        print("%s %-7s sample_axes %s  render_rainbow %s" % (
+            '✅' if same_axes and same_leds else '❌', name,
+            'same' if same_axes else 'DIFFERS', 'same' if same_leds else 'DIFFERS'))
+        ok = ok and same_axes and same_leds
+    return ok
+
+
+# ==================== BENCHMARK ====================
+def time_axes(sample, ticks=TICKS):
+    kernel = _loaded_kernel(MOVES[:AXES])
+    params = kernel.params
+    weights = kernel.weights
+    out = kernel.out
+    prev = kernel.prev
+    start = ticks_us()
+    for step in range(ticks + 1):
+        weights[1] = step * Q16_ONE // ticks
+        sample(params, weights, out, prev)
+    return ticks_diff(ticks_us(), start) / (ticks + 1)
+
+
+def time_rainbow(render, frames=256):
+    buf = memoryview(bytearray(NUM_LEDS * 3))
+    wheel = memoryview(WHEEL_GRB)
+    hue_base = bytes([i * 256 // NUM_LEDS for i in range(NUM_LEDS)])
+    start = ticks_us()
+    for offset in range(frames):
+        render(buf, wheel, hue_base, offset)
+    return ticks_diff(ticks_us(), start) / frames
+
+
+def run(rounds=5):
+    print("=" * 60)
+    print("⚙️  HOT-LOOP KERNELS (in use: %s)" % EMITTER)
+    print("=" * 60)
+    ok = check_equivalence()
+    print("-" * 60)
+    print("%-8s %16s %8s %18s %8s" % ('kernel', 'sample_axes us', '', 'render_rainbow us', ''))
+    results = {}
+    for name, (sample, render) in IMPLEMENTATIONS.items():
+        results[name] = (min(time_axes(sample) for _ in range(rounds)),
+                         min(time_rainbow(render) for _ in range(rounds)))
+    base_axes, base_leds = results['python']
+    for name, (axes, leds) in results.items():
+        print("%-8s %16.1f %7.1fx %18.1f %7.1fx" % (
+            name, axes, base_axes / axes if axes else 0, leds, base_leds / leds if leds else 0))
+    print("(%d axes per tick, %d LEDs per frame)" % (AXES, NUM_LEDS))
+    print("=" * 60)
+    return ok, results
+
+
+if __name__ == "__main__":
+    run()
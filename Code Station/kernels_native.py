@@ -0,0 +1,78 @@
+import micropython
+
+# ==================== EMITTER KERNELS ====================
+# Native-code versions of the kernels in kernels.py; import that module
+# instead of this one. Importing this fails on CPython (no micropython
+# module) and on firmware built without the native emitters, and kernels.py
+# then keeps the Python versions.
+#
+#   native  the Python source compiled to machine code: same semantics,
+#           no bytecode dispatch
+#   viper   machine-word ints and raw pointer loads/stores (ptr8/ptr32):
+#           no small-int boxing or buffer-protocol calls in the loop.
+#           Viper ints are 32-bit; the split deltas keep every product
+#           below 2**30, as in the Python version.
+#
+# Precompiled as .mpy these need mpy-cross -march (build_mpy.py sets it).
+
+
+# ---------- native ----------
+@micropython.native
+def sample_axes_native(params, weights, out, prev):
+    count = weights[0]
+    weight = weights[1]
+    carry = weights[2]
+    i = 0
+    for k in range(count):
+        prev[k] = out[k]
+        value = params[i] + ((params[i + 1] * weight) >> 9) + ((params[i + 2] * weight) >> 16)
+        if carry:
+            value += ((params[i + 3] * carry) >> 9) + ((params[i + 4] * carry) >> 16)
+        out[k] = value
+        i += 5
+
+
+@micropython.native
+def render_rainbow_native(buf, wheel, hue_base, offset):
+    pos = 0
+    for base in hue_base:
+        src = ((base + offset) & 255) * 3
+        buf[pos] = wheel[src]
+        buf[pos + 1] = wheel[src + 1]
+        buf[pos + 2] = wheel[src + 2]
+        pos += 3
+
+
+# ---------- viper ----------
+@micropython.viper
+def sample_axes_viper(params, weights, out, prev):
+    p = ptr32(params)
+    w = ptr32(weights)
+    o = ptr32(out)
+    q = ptr32(prev)
+    count = w[0]
+    weight = w[1]
+    carry = w[2]
+    i = 0
+    for k in range(count):
+        q[k] = o[k]
+        value = p[i] + ((p[i + 1] * weight) >> 9) + ((p[i + 2] * weight) >> 16)
+        if carry:
+            value += ((p[i + 3] * carry) >> 9) + ((p[i + 4] * carry) >> 16)
+        o[k] = value
+        i += 5
+
+
+@micropython.viper
+def render_rainbow_viper(buf, wheel, hue_base, offset: int):
+    dst = ptr8(buf)
+    src = ptr8(wheel)
+    base = ptr8(hue_base)
+    n = int(len(hue_base))
+    pos = 0
+    for i in range(n):
+        hue = ((base[i] + offset) & 255) * 3
+        dst[pos] = src[hue]
+        dst[pos + 1] = src[hue + 1]
+        dst[pos + 2] = src[hue + 2]
+        pos += 3
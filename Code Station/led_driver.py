@@ -0,0 +1,168 @@
+import utime
+
+try:
+    import rp2
+except ImportError:
+    rp2 = None
+
+# ==================== FRAMEBUFFER LED DRIVER ====================
+# Pixels live in a preallocated GRB bytearray (the same layout the WS2812
+# wants on the wire). Drawing only touches that buffer; show() copies it into
+# a second "front" buffer and hands that to the PIO state machine through DMA,
+# then returns straight away. If the previous frame is still on the wire the
+# new one is marked pending and sent by poll()/flush() - show() never waits.
+#
+# Boards/firmware without rp2.DMA fall back to the blocking neopixel driver.
+
+BYTES_PER_LED = 3
+WS2812_BYTE_US = 10      # 8 bits x 1.25 us
+WS2812_LATCH_US = 300    # Low time that ends a frame (WS2812B needs >280 us)
+DREQ_PIO0_TX0 = 0
+PIO0_TXF0 = 0x50200010   # TX FIFO of PIO0 state machine 0 (next SMs are +4)
+
+
+def _ws2812_program():
+    # The assembler names (out, jmp, side...) only exist inside rp2.asm_pio
+    @rp2.asm_pio(sideset_init=rp2.PIO.OUT_LOW, out_shiftdir=rp2.PIO.SHIFT_LEFT,
+                 autopull=True, pull_thresh=8)
+    def ws2812():
+        T1 = 2
+        T2 = 5
+        T3 = 3
+        wrap_target()
+        label("bitloop")
+        out(x, 1)               .side(0)    [T3 - 1]
+        jmp(not_x, "do_zero")   .side(1)    [T1 - 1]
+        jmp("bitloop")          .side(1)    [T2 - 1]
+        label("do_zero")
+        nop()                   .side(0)    [T2 - 1]
+        wrap()
+    return ws2812
+
+
+class PioDmaWriter:
+    """Streams a GRB buffer to WS2812 LEDs with PIO + DMA, without blocking"""
+    def __init__(self, pin, sm_id=0):
+        # 8-bit DMA writes are replicated across the 32-bit FIFO word, and
+        # with pull_thresh=8 the PIO shifts out exactly the top byte
+        self.sm = rp2.StateMachine(sm_id, _ws2812_program(), freq=8000000, sideset_base=pin)
+        self.sm.active(1)
+        self.txf = PIO0_TXF0 + sm_id * 4
+        self.dma = rp2.DMA()
+        self.ctrl = self.dma.pack_ctrl(size=0, inc_write=False, treq_sel=DREQ_PIO0_TX0 + sm_id)
+        self._ready_at = utime.ticks_us()
+
+    def busy(self):
+        return self.dma.active() or utime.ticks_diff(self._ready_at, utime.ticks_us()) > 0
+
+    def start(self, buf):
+        self.dma.config(read=buf, write=self.txf, count=len(buf), ctrl=self.ctrl, trigger=True)
+        self._ready_at = utime.ticks_add(utime.ticks_us(),
+                                         len(buf) * WS2812_BYTE_US + WS2812_LATCH_US)
+
+
+class BlockingWriter:
+    """Fallback: the stock neopixel driver (bit-banged, blocks during the write)"""
+    def __init__(self, pin, num_leds):
+        from neopixel import NeoPixel
+        self.np = NeoPixel(pin, num_leds)
+
+    def busy(self):
+        return False
+
+    def start(self, buf):
+        self.np.buf[:] = buf
+        self.np.write()
+
+
+class LedStrip:
+    def __init__(self, pin, num_leds, writer=None):
+        self.num_leds = num_leds
+        self.buf = bytearray(num_leds * BYTES_PER_LED)    # Drawing buffer (GRB)
+        self._buf_mv = memoryview(self.buf)
+        self.front = bytearray(num_leds * BYTES_PER_LED)  # Buffer on the wire
+        self._front_mv = memoryview(self.front)
+        self.pending = False
+        self.frames_sent = 0
+        self.frames_deferred = 0
+        if writer is None:
+            if rp2 is not None and hasattr(rp2, 'DMA'):
+                writer = PioDmaWriter(pin)
+            else:
+                writer = BlockingWriter(pin, num_leds)
+        self.writer = writer
+
+    # ---------- drawing ----------
+    def set_pixel(self, i, color):
+        """Set one LED from an (r, g, b) tuple"""
+        offset = i * BYTES_PER_LED
+        buf = self.buf
+        buf[offset] = color[1]
+        buf[offset + 1] = color[0]
+        buf[offset + 2] = color[2]
+
+    def fill(self, color, first=0, last=None):
+        """Set LEDs first..last-1 (default: all) to one color"""
+        if last is None:
+            last = self.num_leds
+        if last <= first:
+            return
+        mv = self._buf_mv
+        start = first * BYTES_PER_LED
+        end = last * BYTES_PER_LED
+        mv[start] = color[1]
+        mv[start + 1] = color[0]
+        mv[start + 2] = color[2]
+        # Double the filled span with in-buffer copies: log2(n) slice moves
+        filled = BYTES_PER_LED
+        while start + filled < end:
+            count = min(filled, end - start - filled)
+            mv[start + filled:start + filled + count] = mv[start:start + count]
+            filled += count
+
+    def gradient(self, start_color, end_color, first=0, last=None):
+        """Linear blend from start_color to end_color across LEDs first..last-1"""
+        if last is None:
+            last = self.num_leds
+        span = last - first - 1
+        if span <= 0:
+            self.fill(start_color, first, last)
+            return
+        r0, g0, b0 = start_color
+        dr = end_color[0] - r0
+        dg = end_color[1] - g0
+        db = end_color[2] - b0
+        buf = self.buf
+        offset = first * BYTES_PER_LED
+        for i in range(span + 1):
+            buf[offset] = g0 + dg * i // span
+            buf[offset + 1] = r0 + dr * i // span
+            buf[offset + 2] = b0 + db * i // span
+            offset += BYTES_PER_LED
+
+    def clear(self):
+        self.fill((0, 0, 0))
+
+    # ---------- output ----------
+    def show(self):
+        """Queue the drawing buffer for output; never waits for the LEDs"""
+        if self.writer.busy():
+            self.pending = True
+            self.frames_deferred += 1
+            return False
+        self._front_mv[:] = self.buf
+        self.writer.start(self.front)
+        self.pending = False
+        self.frames_sent += 1
+        return True
+
+    def poll(self):
+        """Send a deferred frame once the previous one has finished"""
+        if self.pending and not self.writer.busy():
+            self.show()
+
+    def flush(self):
+        """Block until the latest frame has been sent (use outside motion loops)"""
+        while self.pending:
+            utime.sleep_us(50)
+            self.poll()
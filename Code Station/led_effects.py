@@ -0,0 +1,105 @@
+from led_driver import BYTES_PER_LED
+import kernels
+
+# ==================== LED EFFECT RENDERER ====================
+# Palettes are computed once: a 256-entry hue wheel and a gamma table, both
+# stored as bytes in the strip's GRB wire order, plus brightness ramps built
+# on first use. Effects then render whole frames into the strip's drawing
+# buffer with memoryview slice copies instead of per-pixel tuple writes.
+# Rendered rainbow and gray frames are cached, so a repeating animation costs
+# a single buffer copy per frame after its first cycle; the first cycle is
+# rendered by kernels.render_rainbow (native code on the Pico).
+
+GAMMA_EXPONENT = 2.2
+FRAME_CACHE_SIZE = 32
+_GRAY_KEY = 256  # Cache keys: 0..255 rainbow offset, 256 + level for gray
+
+
+def wheel(hue):
+    """(r, g, b) for a hue 0..255: red → green → blue → red"""
+    hue &= 255
+    if hue < 85:
+        return (hue * 3, 255 - hue * 3, 0)
+    if hue < 170:
+        hue -= 85
+        return (255 - hue * 3, 0, hue * 3)
+    hue -= 170
+    return (0, hue * 3, 255 - hue * 3)
+
+
+def _build_wheel():
+    out = bytearray(256 * BYTES_PER_LED)
+    for hue in range(256):
+        r, g, b = wheel(hue)
+        out[hue * BYTES_PER_LED] = g
+        out[hue * BYTES_PER_LED + 1] = r
+        out[hue * BYTES_PER_LED + 2] = b
+    return bytes(out)
+
+
+WHEEL_GRB = _build_wheel()
+GAMMA = bytes([int(pow(i / 255, GAMMA_EXPONENT) * 255 + 0.5) for i in range(256)])
+
+_ramps = {}
+
+
+def ramp(start, end, steps, gamma=False):
+    """Brightness levels for step 0..steps of a start → end fade (cached)"""
+    key = (start, end, steps, gamma)
+    levels = _ramps.get(key)
+    if levels is None:
+        values = [start + (end - start) * step // steps for step in range(steps + 1)]
+        if gamma:
+            values = [GAMMA[v] for v in values]
+        levels = bytes(values)
+        _ramps[key] = levels
+    return levels
+
+
+class EffectRenderer:
+    def __init__(self, strip, cache_size=FRAME_CACHE_SIZE):
+        self.strip = strip
+        self.num_leds = strip.num_leds
+        self.frame_bytes = strip.num_leds * BYTES_PER_LED
+        self._mv = memoryview(strip.buf)
+        self._black = bytes(self.frame_bytes)
+        self._wheel_mv = memoryview(WHEEL_GRB)
+        # Hue of each LED at offset 0: the wheel spread once around the ring
+        self.hue_base = bytes([i * 256 // strip.num_leds for i in range(strip.num_leds)])
+        self.cache_size = cache_size
+        self._frames = {}
+
+    def clear(self):
+        """All LEDs off (one buffer copy)"""
+        self._mv[:] = self._black
+
+    def solid(self, color):
+        self.strip.fill(color)
+
+    def gray(self, level):
+        """All LEDs white at one brightness level"""
+        frame = self._frames.get(_GRAY_KEY + level)
+        if frame is None:
+            self.strip.fill((level, level, level))
+            self._cache(_GRAY_KEY + level, bytes(self._mv))
+        else:
+            self._mv[:] = frame
+
+    def rainbow(self, offset=0):
+        """Hue wheel around the strip, rotated by offset hue steps"""
+        offset &= 255
+        frame = self._frames.get(offset)
+        if frame is None:
+            frame = self._render_rainbow(offset)
+        self._mv[:] = frame
+
+    def _render_rainbow(self, offset):
+        mv = self._mv
+        kernels.render_rainbow(mv, self._wheel_mv, self.hue_base, offset)
+        frame = bytes(mv)
+        self._cache(offset, frame)
+        return frame
+
+    def _cache(self, key, frame):
+        if len(self._frames) < self.cache_size:
+            self._frames[key] = frame
@@ -0,0 +1,108 @@
+# Per-frame render time of the old per-pixel LED loops vs led_effects.
+# Runs on the Pico (utime) and on a PC (time). Only drawing is timed: frames
+# go to a writer that discards them, so the LED wire time is not included.
+
+try:
+    from utime import ticks_us, ticks_diff
+except ImportError:
+    import time
+    import sim_hardware
+    sim_hardware.install()  # led_driver needs utime; timing stays on the host clock
+
+    def ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def ticks_diff(a, b):
+        return a - b
+
+from led_driver import LedStrip
+from led_effects import EffectRenderer, ramp
+
+NUM_LEDS = 24
+FRAMES = 200
+
+
+class _DiscardWriter:
+    def busy(self):
+        return False
+
+    def start(self, buf):
+        pass
+
+
+# ==================== OLD PER-PIXEL LOOPS ====================
+def old_rainbow(strip, frame):
+    cycle = frame % 2
+    for i in range(NUM_LEDS):
+        hue = ((i * 256 // NUM_LEDS) + (cycle * 20)) & 255
+        if hue < 85:
+            strip.set_pixel(i, (hue * 3, 255 - hue * 3, 0))
+        elif hue < 170:
+            hue -= 85
+            strip.set_pixel(i, (255 - hue * 3, 0, hue * 3))
+        else:
+            hue -= 170
+            strip.set_pixel(i, (0, hue * 3, 255 - hue * 3))
+
+
+def old_brightness(strip, frame):
+    step = frame % 21
+    brightness = 10 + (150 - 10) * step // 20
+    for i in range(NUM_LEDS):
+        strip.set_pixel(i, (brightness, brightness, brightness))
+
+
+def old_clear(strip, frame):
+    for i in range(NUM_LEDS):
+        strip.set_pixel(i, (0, 0, 0))
+
+
+# ==================== RENDERER ====================
+def new_rainbow(effects, frame):
+    effects.rainbow((frame % 2) * 20)
+
+
+def new_brightness(effects, frame):
+    effects.gray(ramp(10, 150, 20)[frame % 21])
+
+
+def new_clear(effects, frame):
+    effects.clear()
+
+
+CASES = (
+    ('rainbow', old_rainbow, new_rainbow),
+    ('brightness', old_brightness, new_brightness),
+    ('clear', old_clear, new_clear),
+)
+
+
+# ==================== BENCHMARK ====================
+def time_frames(render, target, frames=FRAMES):
+    strip = target.strip if hasattr(target, 'strip') else target
+    start = ticks_us()
+    for frame in range(frames):
+        render(target, frame)
+        strip.show()
+    return ticks_diff(ticks_us(), start) / frames
+
+
+def run(rounds=5):
+    strip = LedStrip(None, NUM_LEDS, writer=_DiscardWriter())
+    effects = EffectRenderer(strip)
+    print("=" * 56)
+    print("⏱️  LED RENDER TIME PER FRAME (%d LEDs)" % NUM_LEDS)
+    print("=" * 56)
+    results = {}
+    for name, old, new in CASES:
+        before = min(time_frames(old, strip) for _ in range(rounds))
+        after = min(time_frames(new, effects) for _ in range(rounds))
+        results[name] = (before, after)
+        print("%-12s per-pixel %7.1f us  frame %7.1f us  (%.1fx)" % (
+            name, before, after, before / after if after else 0))
+    print("=" * 56)
+    return results
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,133 @@
+import utime
+
+# ==================== DEFERRED LOGGING ====================
+# print() over USB-CDC can block for milliseconds. While a frame loop is
+# running, log calls only store the format string and its arguments in a
+# preallocated ring of message slots; FrameScheduler drains the ring in the
+# idle slack before each frame deadline, one message at a time and only if
+# the estimated write cost still fits. Formatting happens at drain time too.
+#
+# Outside frame loops (nothing due within one frame), messages are written
+# straight away after any backlog, so idle-time output reads like print().
+#
+#     import log
+#     log.info("🔄 %s-axis: %d° → %d°", axis, start, target)
+#
+# When the ring is full the oldest message is overwritten and counted in
+# dropped; the next drain reports how many were lost.
+
+DEBUG = 10
+INFO = 20
+WARN = 30
+ERROR = 40
+
+SLOTS = 32
+DRAIN_MARGIN_US = 1000       # Slack kept free before the frame deadline
+INITIAL_COST_US = 2000       # Write-time estimate until measured
+
+
+class Logger:
+    def __init__(self, slots=SLOTS, level=INFO):
+        self.level = level
+        self.slots = slots
+        self.formats = [None] * slots
+        self.args = [None] * slots
+        self.head = 0             # Oldest queued message
+        self.count = 0
+        self.dropped = 0
+        self.written = 0
+        self.cost_us = INITIAL_COST_US  # Running estimate of one write
+        self.busy_until = utime.ticks_us()
+
+    # ---------- frame loop interface (FrameScheduler) ----------
+    def frame_due(self, deadline, interval_us):
+        """A frame loop expects to run again at deadline: defer output until then"""
+        self.busy_until = utime.ticks_add(deadline, interval_us)
+
+    def frames_done(self):
+        """The frame loop finished: write everything still queued"""
+        self.busy_until = utime.ticks_us()
+        self.flush()
+
+    def in_frames(self):
+        return utime.ticks_diff(self.busy_until, utime.ticks_us()) > 0
+
+    def drain_until(self, deadline):
+        """Write queued messages while each still fits before deadline"""
+        while self.count:
+            left = utime.ticks_diff(deadline, utime.ticks_us())
+            if left < self.cost_us + DRAIN_MARGIN_US:
+                return
+            self._write_oldest()
+
+    def flush(self):
+        """Write every queued message now (blocking)"""
+        while self.count:
+            self._write_oldest()
+
+    # ---------- logging ----------
+    def log(self, level, fmt, args=()):
+        if level < self.level:
+            return
+        if not self.in_frames():
+            self.flush()
+            self._write(fmt, args)
+            return
+        slot = (self.head + self.count) % self.slots
+        if self.count == self.slots:
+            self.head = (self.head + 1) % self.slots  # Overwrite the oldest
+            self.dropped += 1
+        else:
+            self.count += 1
+        self.formats[slot] = fmt
+        self.args[slot] = args
+
+    def _write_oldest(self):
+        slot = self.head
+        fmt = self.formats[slot]
+        args = self.args[slot]
+        self.formats[slot] = None
+        self.args[slot] = None
+        self.head = (slot + 1) % self.slots
+        self.count -= 1
+        if self.dropped:
+            dropped = self.dropped
+            self.dropped = 0
+            self._write("⚠️  log: %d messages dropped", (dropped,))
+        self._write(fmt, args)
+
+    def _write(self, fmt, args):
+        start = utime.ticks_us()
+        print(fmt % args if args else fmt)
+        cost = utime.ticks_diff(utime.ticks_us(), start)
+        # Smoothed, but jump straight up to a slow write so drains stay safe
+        self.cost_us = cost if cost > self.cost_us else (self.cost_us * 7 + cost) // 8
+        self.written += 1
+
+
+# ==================== MODULE-LEVEL LOGGER ====================
+default = Logger()
+
+
+def set_level(level):
+    default.level = level
+
+
+def debug(fmt, *args):
+    default.log(DEBUG, fmt, args)
+
+
+def info(fmt, *args):
+    default.log(INFO, fmt, args)
+
+
+def warn(fmt, *args):
+    default.log(WARN, fmt, args)
+
+
+def error(fmt, *args):
+    default.log(ERROR, fmt, args)
+
+
+def flush():
+    default.flush()
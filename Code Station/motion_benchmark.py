@@ -0,0 +1,174 @@
+# Motion benchmark suite: runs every movement strategy on the simulated
+# hardware (sim_hardware.py) and measures the PWM stream it produces.
+#
+#   python3 motion_benchmark.py [results.json] [cpu_scale]
+#
+# cpu_scale charges real compute time to the virtual clock (x cpu_scale) so
+# sleep-after-work loops drift like they do on the Pico. Results are written
+# as JSON so runs before and after a change can be diffed.
+
+import json
+import sys
+import time
+
+import sim_hardware
+
+DEFAULT_CPU_SCALE = 20.0   # Rough PC → RP2040 interpreter slowdown
+PWM_PERIOD_NS = 20000000   # 50 Hz
+
+
+# ==================== STRATEGIES ====================
+# Each runner performs the same 0° → 180° style sweep and returns
+# (pin, nominal_interval_us, nominal_duration_s)
+def run_super_smooth_move(duration):
+    ns = sim_hardware.load_definitions('x-axis_MOVEMENT.py')
+    ns['current_position'] = ns['MIN']
+    sim_hardware.active().start_measuring()
+    ns['super_smooth_move'](ns['MAX'], duration=duration)
+    return 14, 15000, duration
+
+
+def run_set_servo_ultra_smooth(duration):
+    ns = sim_hardware.load_definitions('XYZ movement with deepseek.py', {'time': 'utime'})
+    ns['servo_y'].duty_u16(ns['angle_to_duty'](0))
+    sim_hardware.active().start_measuring()
+    ns['set_servo_ultra_smooth'](ns['servo_y'], 0, 180, duration)
+    return 15, int(duration * 1000000 / 150), duration
+
+
+def run_smooth_move_variable(duration):
+    ns = sim_hardware.load_definitions('X_axis_Hardware-based-smoothing.py')
+    sim_hardware.active().start_measuring()
+    ns['smooth_move_variable'](ns['MIN'], ns['MAX'], duration=duration)
+    return 14, int(duration * 1000000 / 80), duration
+
+
+def _advanced_controller():
+    from pia.motion import AdvancedMultiServoController
+    robot = AdvancedMultiServoController()
+    robot.current_positions['y'] = robot._degree_to_ns('y', 0)
+    return robot
+
+
+def _frame_interval_us(robot, clock):
+    """Frame period the move ran at: the timer drive's while it runs, else clock's"""
+    return robot._move_clock(clock).interval_us
+
+
+def run_smooth_move_servo(duration):
+    robot = _advanced_controller()
+    sim_hardware.active().start_measuring()
+    robot._smooth_move_servo('y', 180, duration)
+    return 15, _frame_interval_us(robot, robot.servo_clock), duration
+
+
+def run_coordinated_move(duration):
+    robot = _advanced_controller()
+    sim_hardware.active().start_measuring()
+    robot.coordinated_move({'y': 180}, duration)
+    return 15, _frame_interval_us(robot, robot.coordinated_clock), duration
+
+
+STRATEGIES = {
+    'super_smooth_move': run_super_smooth_move,
+    'set_servo_ultra_smooth': run_set_servo_ultra_smooth,
+    'smooth_move_variable': run_smooth_move_variable,
+    '_smooth_move_servo': run_smooth_move_servo,
+    'coordinated_move': run_coordinated_move,
+}
+
+
+# ==================== METRICS ====================
+def percentile(values, pct):
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def _to_ns(kind, value):
+    return value * PWM_PERIOD_NS // 65535 if kind == 'u16' else value
+
+
+def measure(name, runner, duration=3.0, cpu_scale=DEFAULT_CPU_SCALE):
+    """Run one strategy on a fresh simulation and compute its metrics"""
+    sim = sim_hardware.install(cpu_scale=cpu_scale, record_busy=True)
+    # Silence the strategy's own prints so they don't count as frame work
+    real_stdout = sys.stdout
+    sys.stdout = _NullWriter()
+    try:
+        pin, nominal_us, nominal_s = runner(duration)
+    finally:
+        sys.stdout = real_stdout
+
+    writes = [(t, _to_ns(kind, v)) for t, p, kind, v in sim.trace.pwm_writes if p == pin]
+    busy = sim.clock.busy_us
+    times = [t for t, v in writes]
+    values = [v for t, v in writes]
+    intervals = [b - a for a, b in zip(times, times[1:])]
+    jitter = [abs(i - nominal_us) for i in intervals]
+    steps = [abs(b - a) for a, b in zip(values, values[1:])]
+    elapsed_us = times[-1] - times[0] if len(times) > 1 else 0
+
+    return {
+        'strategy': name,
+        'frames': len(writes),
+        'frames_per_s': round(len(writes) / (elapsed_us / 1000000), 1) if elapsed_us else 0,
+        'nominal_interval_us': nominal_us,
+        'compute_us_per_tick': {
+            'avg': round(sum(busy) / len(busy), 1) if busy else 0,
+            'p99': round(percentile(busy, 99), 1),
+            'max': round(max(busy), 1) if busy else 0,
+        },
+        'jitter_us': {
+            'p50': percentile(jitter, 50),
+            'p90': percentile(jitter, 90),
+            'p99': percentile(jitter, 99),
+            'max': max(jitter) if jitter else 0,
+        },
+        'duration_error_ms': round((elapsed_us - nominal_s * 1000000) / 1000, 1),
+        'max_step_ns': max(steps) if steps else 0,
+    }
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def run(path='motion_benchmark.json', duration=3.0, cpu_scale=DEFAULT_CPU_SCALE):
+    started = time.perf_counter()
+    results = [measure(name, runner, duration, cpu_scale) for name, runner in STRATEGIES.items()]
+    sim_hardware.uninstall()
+
+    print("=" * 92)
+    print(f"📈 MOTION BENCHMARK ({duration}s sweep, cpu_scale {cpu_scale})")
+    print("=" * 92)
+    print(f"{'strategy':<24}{'fps':>7}{'cpu/tick us':>13}{'jitter p50':>12}"
+          f"{'p99':>9}{'dur err ms':>12}{'max step ns':>14}")
+    for r in results:
+        print(f"{r['strategy']:<24}{r['frames_per_s']:>7}{r['compute_us_per_tick']['avg']:>13}"
+              f"{r['jitter_us']['p50']:>12}{r['jitter_us']['p99']:>9}"
+              f"{r['duration_error_ms']:>12}{r['max_step_ns']:>14}")
+    print("=" * 92)
+
+    report = {
+        'duration_s': duration,
+        'cpu_scale': cpu_scale,
+        'host_seconds': round(time.perf_counter() - started, 3),
+        'results': results,
+    }
+    if path:
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📝 Results written to {path}")
+    return report
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else 'motion_benchmark.json',
+        cpu_scale=float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CPU_SCALE)
@@ -0,0 +1,120 @@
+from scheduler import FrameScheduler
+import log
+
+# ==================== COOPERATIVE MOTION ENGINE ====================
+# Every servo trajectory and LED animation is a generator task. All tasks are
+# advanced by one shared frame clock, so lights and motion run together
+# instead of blocking each other.
+#
+# A task is written as:
+#
+#     def task():
+#         ...setup...
+#         n = yield            # n = frames elapsed since the task started
+#         while n < total:
+#             ...do one frame of work...
+#             n = yield
+#         ...final frame...
+#
+# Frames dropped by the scheduler are skipped over, so tasks always work
+# from elapsed frames rather than counting their own iterations. The clock
+# can be swapped for a servo_timer.TimerDrive (same interface).
+
+
+class MotionEngine:
+    def __init__(self, frame_ms=20):
+        self.clock = FrameScheduler(frame_ms)
+        self.frame_ms = frame_ms
+        self.tasks = []  # [generator, start_frame]
+        self.frame = 0
+        self.running = False
+        self.frame_hooks = []  # Called after every frame (e.g. LED output polling)
+
+    def frames_for(self, duration_s):
+        """Number of engine frames spanned by duration_s"""
+        return self.clock.frames_for(duration_s)
+
+    def interval_ms(self):
+        """Engine frame period in ms (a timer-driven clock rounds it to whole ticks)"""
+        return self.clock.interval_us // 1000
+
+    def spawn(self, task):
+        """Add a task; it gets its first frame on the next engine step"""
+        try:
+            next(task)  # Run the setup code up to the first yield
+        except StopIteration:
+            return False
+        self.tasks.append([task, None])
+        return True
+
+    def step(self, frame):
+        """Advance every task by one frame, dropping the finished ones"""
+        tasks = self.tasks
+        i = 0
+        while i < len(tasks):
+            entry = tasks[i]
+            if entry[1] is None:
+                entry[1] = frame
+            try:
+                entry[0].send(frame - entry[1])
+                i += 1
+            except StopIteration:
+                tasks.pop(i)
+
+    def run(self, *tasks):
+        """Spawn tasks and run frames until every task has finished"""
+        for task in tasks:
+            self.spawn(task)
+        if self.running:
+            return True  # Already inside run(): the outer loop drives them
+        if not self.tasks:
+            return True
+
+        self.running = True
+        try:
+            for frame in self.clock.frames():
+                self.frame = frame
+                self.step(frame)
+                for hook in self.frame_hooks:
+                    hook()
+                if not self.tasks:
+                    break
+        finally:
+            self.running = False
+            completed = not self.tasks
+            if self.tasks:
+                self.cancel_all()  # Interrupted: don't resume stale tasks later
+            self.clock.end(completed)  # A timer-driven clock plays its queue out
+            log.default.frames_done()  # Write what tasks logged during the run
+        return True
+
+    def cancel_all(self):
+        """Drop every pending task (e.g. on Ctrl+C)"""
+        for entry in self.tasks:
+            entry[0].close()
+        self.tasks = []
+
+
+# ==================== TASK HELPERS ====================
+def pause(frames):
+    """Task that just waits for a number of frames"""
+    n = yield
+    while n < frames:
+        n = yield
+
+
+def chain(*tasks):
+    """Run tasks one after another as a single task"""
+    n = yield
+    for task in tasks:
+        try:
+            next(task)
+        except StopIteration:
+            continue
+        base = n
+        while True:
+            try:
+                task.send(n - base)
+            except StopIteration:
+                break  # Next task starts on this same frame
+            n = yield
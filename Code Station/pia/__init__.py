@@ -0,0 +1,15 @@
+# ==================== PIA CONTROLLER PACKAGE ====================
+# The controller classes, split out of the Final_code scripts so they can be
+# cross-compiled to .mpy or frozen into the firmware (build_mpy.py) instead
+# of being parsed and compiled on the Pico at every boot.
+#
+#   pia.config        MultiServoConfig, ServoConfig, LED wiring
+#   pia.motion        AdvancedMultiServoController (Final_code_xyz_movement.py)
+#   pia.leds          CompleteRobotController, lazy LED strip
+#                     (Final_code_Movement+LEDs.py)
+#   pia.app           main loops and import_report()
+#   pia.motion_tests  quick test functions for the multi-servo controller
+#
+# Calibration, easing, scheduling and the other building blocks stay
+# top-level modules (calibration.py, easing.py, ...), shared with the
+# standalone scripts.
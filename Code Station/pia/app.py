@@ -0,0 +1,185 @@
+import utime
+import log
+from soft_start import save_pose, report_boot
+from pia.config import ServoConfig
+
+# Each loop imports its controller module on first call, so a launcher only
+# loads the controller it runs.
+
+# ==================== MULTI-SERVO MAIN LOOP ====================
+def run_multi_servo():
+    """Main loop of Final_code_xyz_movement.py"""
+    from pia.motion import AdvancedMultiServoController
+    # Initialize multi-servo controller
+    robot = AdvancedMultiServoController()
+    
+    log.info("\n" + "="*60)
+    log.info("🤖 PIA-THE-ROBOT MULTI-SERVO CONTROLLER")
+    log.info("="*60)
+    log.info("Features:")
+    log.info("• Individual servo control")
+    log.info("• Predefined sequences for Y, X, Z axes") 
+    log.info("• Coordinated multi-servo movements")
+    log.info("• Smooth return from ANY position (no jerks!)")
+    log.info("• Continuous operation with safe interrupt")
+    log.info("="*60)
+    
+    try:
+        # Run continuous sequences
+        sequence_count = 0
+        
+        while True:
+            if robot.emergency:
+                log.warn("\n🚨 EMERGENCY BUTTON - returning home")
+                robot.emergency_return()
+                utime.sleep(2.0)
+                continue
+            
+            sequence_count += 1
+            if sequence_count == 1:
+                report_boot()  # The first gesture starts now
+            log.info("\n🎬 ROBOT SEQUENCE #%d", sequence_count)
+            log.info("-" * 40)
+            
+            # Run full sequence
+            robot.full_robot_sequence(duration=4.0)
+            
+            # Print status every few sequences
+            if sequence_count % 3 == 0:
+                robot.print_status()
+            
+            utime.sleep(2.0)  # Pause between full sequences
+            
+    except KeyboardInterrupt:
+        log.warn("\n\n⚠️  USER INTERRUPT DETECTED")
+        robot.print_status()
+        log.info("\n🔄 Smoothly returning to initial positions...")
+        robot.emergency_return(duration=5.0)
+        
+    except Exception as e:
+        log.error("\n\n❌ UNEXPECTED ERROR: %s", e)
+        log.info("🔄 Emergency return to initial positions...")
+        robot.emergency_return(duration=5.0)
+        
+    finally:
+        log.info("\n" + "="*60)
+        log.info("🏁 PROGRAM COMPLETED")
+        robot.print_status()
+        save_pose(robot.current_positions)  # Next boot starts from here without a jump
+        robot.stop_timer_drive()
+        log.info("🔌 Safe to power off")
+        log.info("="*60)
+
+# ==================== LED ROBOT MAIN LOOP ====================
+def run_led_robot():
+    """Main loop of Final_code_Movement+LEDs.py"""
+    from pia.leds import CompleteRobotController
+    robot = CompleteRobotController()
+    
+    if ServoConfig.REMOTE_CONTROL:
+        robot.serve_commands()  # Host drives the robot (pia_client.py)
+        save_pose(robot.current_positions)
+        robot.stop_timer_drive()
+        return
+    
+    log.info("\n" + "="*60)
+    log.info("🌈 PIA-THE-ROBOT WITH LED SEQUENCE")
+    log.info("="*60)
+    log.info("Sequence:")
+    log.info("1. Brightness increase (10→255)")
+    log.info("2. Rainbow effect") 
+    log.info("3. Return to initial positions")
+    log.info("4. Y-axis movement 🔴 RED")
+    log.info("5. X-axis movement 🟢 GREEN")  
+    log.info("6. Z-axis movement 🔵 BLUE")
+    log.info("7. Brightness decrease (255→10)")
+    log.info("Press Ctrl+C to stop")
+    log.info("="*60)
+    
+    try:
+        report_boot()  # The first gesture starts now
+        while True:
+            # Start with LED sequence and return to initial
+            robot.return_to_initial_with_leds()
+            utime.sleep(1)
+            
+            # Run the main robot sequence
+            robot.full_robot_sequence()
+            utime.sleep(2)
+            
+            log.info("\n🔄 Restarting sequence in 3 seconds...")
+            utime.sleep(3)
+            
+    except KeyboardInterrupt:
+        log.warn("\n\n⚠️  Stopping robot...")
+        robot.led_clear()
+        
+    finally:
+        save_pose(robot.current_positions)  # Next boot starts from here without a jump
+        robot.stop_timer_drive()
+        log.info("\n🔌 Robot safely shut down")
+
+# ==================== IMPORT COST REPORT ====================
+# Modules behind the launchers, cheapest first. Imported from .py the Pico
+# parses and compiles them into RAM at boot; from .mpy or frozen bytecode
+# (build_mpy.py) it only loads them, so compare a run before and after.
+LIBRARY_MODULES = ('log', 'easing', 'scheduler', 'calibration', 'sequence', 'kernels', 'trajectory',
+                   'pwm_output', 'servo_timer', 'profiler', 'planner', 'spline', 'power', 'soft_start',
+                   'clip_format', 'clip_player', 'motion_engine', 'serial_protocol', 'tracking',
+                   'led_driver', 'led_effects', 'pia.config', 'pia.motion', 'pia.leds')
+
+
+def import_report(names=LIBRARY_MODULES):
+    """
+    Import each module and log the time and heap it took
+    Only modules not loaded yet are measured: one already imported (by
+    pia.app itself, or before a soft reset) is shared by everything holding
+    it, so it is listed as skipped rather than loaded a second time.
+    Returns {name: (us, bytes)}
+    """
+    import gc
+    import sys
+    try:
+        mem_alloc = gc.mem_alloc
+        tracing = False
+    except AttributeError:
+        # CPython (the PC sim): heap bytes as traced by tracemalloc
+        import tracemalloc
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        mem_alloc = lambda: tracemalloc.get_traced_memory()[0]
+    results = {}
+    skipped = []
+    try:
+        for name in names:
+            if name in sys.modules:
+                skipped.append(name)
+                continue
+            gc.collect()
+            gc.disable()  # Count what the import allocates, not what a collection frees
+            before = mem_alloc()
+            started = utime.ticks_us()
+            try:
+                __import__(name)
+            except ImportError as e:
+                log.warn("⚠️  %s: %s", name, e)
+                continue
+            finally:
+                elapsed = utime.ticks_diff(utime.ticks_us(), started)
+                gc.enable()
+            results[name] = (elapsed, mem_alloc() - before)
+    finally:
+        if tracing:
+            tracemalloc.stop()
+    total_us = 0
+    total_bytes = 0
+    log.info("📦 IMPORT COST")
+    for name, (us, used) in results.items():
+        log.info("   %-16s %6d us %7d bytes", name, us, used)
+        total_us += us
+        total_bytes += used
+    log.info("   %-16s %6d us %7d bytes", 'total', total_us, total_bytes)
+    if skipped:
+        log.info("   already imported, not measured: %s", ', '.join(skipped))
+    return results
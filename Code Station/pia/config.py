@@ -0,0 +1,92 @@
+from power import SERVO_BUDGET_MA
+
+# ==================== MULTI-SERVO CONFIGURATION ====================
+class MultiServoConfig:
+    # Calibration profile per servo (see calibration.PROFILE_SPECS)
+    # 'final' = 1 ms at 0°, 2 ms at 180°
+    SERVO_PROFILES = {
+        'y': 'final',
+        'x': 'final',
+        'z': 'final'
+    }
+    
+    # Servo pin assignments
+    SERVO_PINS = {
+        'y': 15,  # Y-axis servo
+        'x': 14,  # X-axis servo  
+        'z': 13   # Z-axis servo
+    }
+    
+    # Initial positions (in degrees)
+    INITIAL_POSITIONS = {
+        'y': 90,  # Y starts at 90°
+        'x': 80,  # X starts at 80°
+        'z': 90   # Z starts at 90°
+    }
+    
+    # Easing curve used by moves given a fixed duration (see easing.CURVES)
+    EASING_CURVE = 'cosine'
+    
+    # Limits for planned moves (duration=None): (max °/s, max °/s²) per axis
+    # and the planner profile shape ('s_curve' or 'trapezoid')
+    AXIS_LIMITS = {
+        'y': (90, 180),
+        'x': (120, 240),
+        'z': (90, 180)
+    }
+    MOTION_PROFILE = 's_curve'
+    
+    # Frame periods (milliseconds) for single-servo and coordinated moves
+    SERVO_FRAME_MS = 20
+    COORDINATED_FRAME_MS = 10
+    
+    # Keyframe sequences (degrees) per axis and the order they are listed in
+    SEQUENCES = {
+        'y': [90, 75, 130, 90],
+        'x': [80, 60, 130, 80],
+        'z': [90, 60, 130, 90]
+    }
+    SEQUENCE_ORDER = ('y', 'x', 'z')
+    
+    # Preemption: any move stops at its next frame when preempted (Ctrl+C, or
+    # the emergency button below), and the next move leaves with the velocity
+    # the servos had, blending it out over BLEND_S seconds
+    EMERGENCY_PIN = None  # e.g. 16: push button to GND starts an emergency return
+    BLEND_S = 0.4
+    
+    # Estimated servo current allowed at once (see power.py); timelines are
+    # staggered and coordinated moves stretched to stay under it (None = off)
+    POWER_BUDGET_MA = SERVO_BUDGET_MA
+    
+    # Servo updates from a machine.Timer callback at this rate (servo_timer.py):
+    # moves only queue precomputed frames, so blocking foreground work cannot
+    # stall the servos. A preempted move still plays its next two queued
+    # frames (50..100; None = write from the frame loops)
+    TIMER_HZ = 100
+
+# ==================== LED ROBOT CONFIGURATION ====================
+class ServoConfig:
+    SERVO_PROFILES = {'y': 'final', 'x': 'final', 'z': 'final'}  # see calibration.py
+    SERVO_PINS = {'y': 15, 'x': 14, 'z': 13}
+    INITIAL_POSITIONS = {'y': 90, 'x': 80, 'z': 90}
+    EASING_CURVE = 'cosine'
+    SERVO_FRAME_MS = 20
+    SEQUENCES = {'y': [90, 80, 120, 90], 'x': [80, 65, 110, 80], 'z': [90, 70, 120, 90]}
+    SEQUENCE_COLORS = {'y': (255, 0, 0), 'x': (0, 255, 0), 'z': (0, 0, 255)}
+    SEQUENCE_ORDER = ('y', 'x', 'z')
+    # Precompiled full sequence (python3 clip_compiler.py full_sequence.clip.json)
+    CLIP_PATH = 'full_sequence.clip'
+    # Remote control over USB serial (serial_protocol.py, host: pia_client.py)
+    REMOTE_CONTROL = False       # True: run_led_robot() follows host commands instead of the demo loop
+    REMOTE_FRAME_MS = 10         # Poll/track at 100 Hz while in remote mode
+    TRACK_MAX_DEG_PER_S = 360    # Slew limit while following pose targets
+    TRACK_DELAY_MS = 40          # Jitter buffer for streamed TRACK samples
+    # Servo updates from a machine.Timer (servo_timer.py, see MultiServoConfig);
+    # engine frames queue at most TIMER_LEAD_MS ahead so the LEDs, shown as
+    # frames are produced, stay in step with the servos (None = engine writes)
+    TIMER_HZ = 100
+    TIMER_LEAD_MS = 40
+
+# ==================== NEO-PIXEL WIRING ====================
+NEOPIXEL_PIN = 12
+NUM_LEDS = 24
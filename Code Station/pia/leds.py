@@ -0,0 +1,559 @@
+from machine import Pin, PWM
+import utime
+import struct
+import log
+from easing import get_table, interpolate
+from motion_engine import MotionEngine, chain, pause
+from sequence import compile_sequences
+from calibration import get_profile
+from clip_player import ClipPlayer
+from pwm_output import PwmOutput
+from profiler import Profiler, EASING, CONVERT, PWM as PWM_PHASE, LED, SLACK
+from serial_protocol import (PacketReader, UsbSerialPort, encode, encode_into, OVERHEAD,
+                             CMD_SET_POSE, CMD_TRACK, CMD_PLAY_CLIP, CMD_SET_LEDS, CMD_QUERY,
+                             CMD_EXIT, RSP_STATE, RSP_ERROR, POSE_AXES, POSE_FORMAT, POSE_SIZE,
+                             TRACK_FORMAT, TRACK_SIZE, STATE_FORMAT, STATE_SIZE, ERROR_FORMAT,
+                             FLAG_CLIP, FLAG_AT_TARGET, FLAG_TRACKING, ERR_UNKNOWN_CMD,
+                             ERR_BAD_LENGTH, ERR_CLIP_OPEN, ERR_CLIP_START)
+from tracking import TargetTracker
+from soft_start import soft_start
+from pia.config import ServoConfig, NEOPIXEL_PIN, NUM_LEDS
+
+# ==================== NEO-PIXEL SETUP ====================
+# The LED driver and effects are imported on first use (load_leds()), so boot
+# and remote sessions that never light the LEDs skip the PIO/DMA setup
+leds = None     # led_driver.LedStrip: framebuffer, PIO+DMA output
+effects = None  # led_effects.EffectRenderer: whole-frame palette rendering
+
+def load_leds():
+    """Create the LED strip and effect renderer the first time they are needed"""
+    global leds, effects
+    if leds is None:
+        from led_driver import LedStrip
+        from led_effects import EffectRenderer
+        leds = LedStrip(Pin(NEOPIXEL_PIN), NUM_LEDS)
+        effects = EffectRenderer(leds)
+    return leds
+
+# ==================== COMPLETE ROBOT CONTROLLER ====================
+class CompleteRobotController:
+    def __init__(self):
+        # Initialize servos
+        pwms = {}
+        self.calibration = {}
+        self.current_positions = {}
+        self.easing = get_table(ServoConfig.EASING_CURVE)
+        self.engine = MotionEngine(ServoConfig.SERVO_FRAME_MS)
+        self.frame_clock = self.engine.clock  # The engine's clock while no timer drive runs
+        self.drive = None  # servo_timer.TimerDrive, see start_timer_drive()
+        self.profiler = Profiler()  # Per-phase frame timings, see print_profile()
+        
+        for axis, pin in ServoConfig.SERVO_PINS.items():
+            self.calibration[axis] = get_profile(ServoConfig.SERVO_PROFILES[axis])
+            pwms[axis] = PWM(Pin(pin))
+            pwms[axis].freq(50)
+        
+        # Tasks write to channels; the engine flushes changed values once per frame
+        self.output = PwmOutput(pwms)
+        self.servos = self.output.channels
+        self.engine.frame_hooks.append(self._frame_output)
+        
+        for axis in ServoConfig.SERVO_PINS:
+            initial_ns = self._degree_to_ns(axis, ServoConfig.INITIAL_POSITIONS[axis])
+            self.current_positions[axis] = initial_ns
+        # Channels come up one by one, ready as soon as the servos can be in place
+        soft_start(self.output, self.current_positions, self.calibration,
+                   ServoConfig.SERVO_FRAME_MS)
+        if ServoConfig.TIMER_HZ:
+            self.start_timer_drive(ServoConfig.TIMER_HZ)
+        
+        # Precompiled full sequence, if one was copied to the board
+        self.clip = None
+        try:
+            self.clip = ClipPlayer(ServoConfig.CLIP_PATH)
+            log.info("🎞️  Loaded clip %s (%.1fs)", ServoConfig.CLIP_PATH, self.clip.duration())
+        except (OSError, ValueError):
+            pass  # No clip: sequences are computed at runtime
+        
+        # LEDs power up dark; the strip is only set up once an effect needs it
+        log.info("🤖 Robot Initialized!")
+    
+    def start_timer_drive(self, hz=100):
+        """Let a machine.Timer write the servos; engine frames then only queue them (servo_timer.py)"""
+        from servo_timer import TimerDrive
+        self.stop_timer_drive()
+        # The LEDs show as frames are queued: keep the servos close behind them
+        self.drive = TimerDrive(self.output, hz, max_lead_ms=ServoConfig.TIMER_LEAD_MS)
+        self.drive.set_interval(ServoConfig.SERVO_FRAME_MS)
+        self.drive.start()
+        self.engine.clock = self.drive
+        log.info("⏲️  Servo updates from a %d Hz timer", hz)
+    
+    def stop_timer_drive(self):
+        """Go back to writing the servos from the engine's frames"""
+        if self.drive is not None:
+            self.drive.stop()
+            self.drive = None
+            self.engine.clock = self.frame_clock
+    
+    def _degree_to_ns(self, axis, degrees):
+        return self.calibration[axis].to_ns(degrees)
+    
+    def _ns_to_degree(self, axis, ns):
+        return self.calibration[axis].to_degrees(ns)
+    
+    def _frame_output(self):
+        """Engine frame hook: flush servo PWM and any deferred LED frame"""
+        prof = self.profiler
+        prof.record(SLACK, self.engine.clock.slack_us)
+        t = prof.now()
+        self.output.flush()
+        t = prof.end(PWM_PHASE, t)
+        if leds is not None:
+            leds.poll()
+        prof.end(LED, t)
+    
+    def _show_leds(self):
+        """Hand the LED framebuffer to the driver (timed as the led phase)"""
+        t = self.profiler.now()
+        leds.show()
+        self.profiler.end(LED, t)
+    
+    def print_profile(self):
+        """Dump per-phase frame timings (min/avg/max/p99)"""
+        self.profiler.dump("Frame phases")
+    
+    def _run(self, *tasks):
+        """Run engine tasks to completion, then let the last LED frame out"""
+        nested = self.engine.running
+        self.engine.run(*tasks)
+        if not nested and leds is not None:
+            leds.flush()
+    
+    # ==================== NEO-PIXEL EFFECTS ====================
+    # Public led_* methods are thin wrappers that run one engine task to
+    # completion; the _*_task generators can also be spawned alongside servo
+    # tasks so lights and motion share frames.
+    def led_clear(self):
+        """Turn all LEDs off"""
+        load_leds()
+        effects.clear()
+        self._show_leds()
+    
+    def _brightness_task(self, start, end, duration, clear_after=False):
+        """Fade all LEDs from start to end brightness in 20 steps"""
+        from led_effects import ramp
+        load_leds()
+        steps = 20
+        levels = ramp(start, end, steps)
+        total = self.engine.frames_for(duration)
+        last_step = -1
+        n = yield
+        while True:
+            step = min(n, total) * steps // total
+            if step != last_step:
+                effects.gray(levels[step])
+                self._show_leds()
+                last_step = step
+            if n >= total:
+                break
+            n = yield
+        if clear_after:
+            self.led_clear()
+    
+    def _rainbow_task(self, cycles=2, cycle_duration=0.3):
+        """Rainbow cycles, each shifted by 20 hue steps"""
+        load_leds()
+        cycle_frames = self.engine.frames_for(cycle_duration)
+        last_cycle = -1
+        n = yield
+        while n < cycles * cycle_frames:
+            cycle = n // cycle_frames
+            if cycle != last_cycle:
+                effects.rainbow(cycle * 20)
+                self._show_leds()
+                last_cycle = cycle
+            n = yield
+        self.led_clear()
+    
+    def led_brightness_increase(self, duration=1.5):
+        """Quickly increase brightness from 10 to 255"""
+        log.info("💡 Brightness increasing quickly...")
+        self._run(self._brightness_task(10, 150, duration))
+    
+    def led_brightness_decrease(self, duration=1.5):
+        """Gradually decrease brightness from 255 to 10"""
+        log.info("💡 Brightness decreasing...")
+        self._run(self._brightness_task(150, 10, duration, clear_after=True))
+    
+    def led_rainbow_effect(self):
+        """Quick rainbow effect before movement"""
+        log.info("🌈 Rainbow effect!")
+        self._run(self._rainbow_task())
+    
+    def led_solid_color(self, color, duration=0):
+        """Set all LEDs to one solid color"""
+        load_leds().fill(color)
+        self._show_leds()
+        if duration > 0:
+            self._run(pause(self.engine.frames_for(duration)))
+    
+    # ==================== SERVO MOVEMENT ====================
+    def _servo_task(self, axis, target_degrees, duration=4.0):
+        """Engine task moving one servo smoothly to target_degrees"""
+        start_ns = self.current_positions[axis]
+        target_ns = self._degree_to_ns(axis, target_degrees)
+        
+        if start_ns == target_ns:
+            return
+        
+        log.info("🔄 %s-axis: %s° → %s°", axis.upper(), self._ns_to_degree(axis, start_ns), target_degrees)
+        
+        total_updates = self.engine.frames_for(duration)
+        servo = self.servos[axis]
+        prof = self.profiler
+        n = yield
+        while n < total_updates:
+            t = prof.now()
+            ease_w = self.easing.sample(n, total_updates)
+            t = prof.end(EASING, t)
+            servo.duty_ns(interpolate(start_ns, target_ns, ease_w))
+            prof.end(CONVERT, t)
+            n = yield
+        
+        servo.duty_ns(target_ns)
+        self.current_positions[axis] = target_ns
+    
+    def _smooth_move_servo(self, axis, target_degrees, duration=4.0):
+        """Move servo smoothly"""
+        self._run(self._servo_task(axis, target_degrees, duration))
+        return True
+    
+    def return_to_initial_with_leds(self):
+        """Return to initial positions with LED sequence"""
+        log.info("\n" + "="*50)
+        log.info("🏠 RETURNING TO INITIAL POSITIONS")
+        log.info("="*50)
+        
+        # Brightness increase then rainbow, while every servo heads home at once
+        tasks = [chain(self._brightness_task(10, 150, 1.5), self._rainbow_task())]
+        for axis, initial_deg in ServoConfig.INITIAL_POSITIONS.items():
+            current_deg = self._ns_to_degree(axis, self.current_positions[axis])
+            if current_deg != initial_deg:
+                log.info("Moving %s-axis to initial position...", axis.upper())
+                tasks.append(self._servo_task(axis, initial_deg, duration=3.0))
+        self._run(*tasks)
+        
+        log.info("✅ All servos at initial positions")
+    
+    def _axis_sequence_task(self, axis, sequence, color):
+        """Move one axis through sequence with its LED color on"""
+        self.led_solid_color(color)
+        pause_frames = self.engine.frames_for(0.3)
+        moves = []
+        for target in sequence:
+            moves.append(self._servo_task(axis, target, duration=3.0))
+            moves.append(pause(pause_frames))
+        yield from chain(*moves)
+        self.led_clear()
+    
+    def y_axis_sequence(self):
+        """Y-axis movement with RED LEDs"""
+        log.info("\n🎯 Y-AXIS SEQUENCE (RED LEDs)")
+        self._run(self._axis_sequence_task('y', ServoConfig.SEQUENCES['y'],
+                                               ServoConfig.SEQUENCE_COLORS['y']))
+    
+    def x_axis_sequence(self):
+        """X-axis movement with GREEN LEDs"""
+        log.info("\n🎯 X-AXIS SEQUENCE (GREEN LEDs)")
+        self._run(self._axis_sequence_task('x', ServoConfig.SEQUENCES['x'],
+                                               ServoConfig.SEQUENCE_COLORS['x']))
+    
+    def z_axis_sequence(self):
+        """Z-axis movement with BLUE LEDs"""
+        log.info("\n🎯 Z-AXIS SEQUENCE (BLUE LEDs)")
+        self._run(self._axis_sequence_task('z', ServoConfig.SEQUENCES['z'],
+                                               ServoConfig.SEQUENCE_COLORS['z']))
+    
+    def _timeline_task(self, timeline, finale=None, finale_duration=0):
+        """
+        Engine task playing a compiled multi-axis timeline
+        LEDs show the mix of the colors of every axis currently in its track;
+        finale is an LED task started finale_duration before the end
+        """
+        spans = [timeline.track_span(axis) for axis in timeline.order]
+        finale_at = timeline.total_frames - self.engine.frames_for(finale_duration)
+        positions = {}
+        prof = self.profiler
+        lit_mask = -1
+        timeline.rewind()
+        n = yield
+        while True:
+            t = prof.now()
+            timeline.sample_into(n, self.easing, positions)
+            prof.end(EASING, t)
+            for axis, current_ns in positions.items():
+                self.servos[axis].duty_ns(current_ns)
+            
+            if finale is not None and n >= finale_at:
+                self.engine.spawn(finale)  # Finale owns the LEDs from here on
+                finale = None
+                lit_mask = None
+            if lit_mask is not None:
+                active = 0
+                for bit, span in enumerate(spans):
+                    if span[0] <= n < span[1]:
+                        active |= 1 << bit
+                if active != lit_mask:
+                    self.led_solid_color(self._mix_axis_colors(timeline.order, active))
+                    lit_mask = active
+            
+            if n >= timeline.total_frames:
+                break
+            n = yield
+        
+        for axis, target_ns in timeline.final_positions().items():
+            self.current_positions[axis] = target_ns
+    
+    def _mix_axis_colors(self, order, mask):
+        """Per-channel max of the colors of the axes set in mask"""
+        r = g = b = 0
+        for bit, axis in enumerate(order):
+            if mask & (1 << bit):
+                color = ServoConfig.SEQUENCE_COLORS[axis]
+                r = max(r, color[0])
+                g = max(g, color[1])
+                b = max(b, color[2])
+        return (r, g, b)
+    
+    def _clip_strip(self, clip):
+        """The LED strip for a clip with LED frames, None for a servo-only clip"""
+        return load_leds() if clip.led_frames else None
+    
+    def play_clip(self, clip):
+        """Stream a compiled motion clip (servos and LEDs) from flash"""
+        log.info("🎞️  Playing clip %s", clip.path)
+        engine = self.engine
+        engine.clock.set_interval(clip.frame_ms)
+        try:
+            # Frames still map onto the clip if the clock can't run at its period
+            self._run(clip.task(self.servos, self._clip_strip(clip), frame_ms=engine.interval_ms()))
+        finally:
+            engine.clock.set_interval(ServoConfig.SERVO_FRAME_MS)
+        for axis, ns in clip.final_positions().items():
+            self.current_positions[axis] = ns
+        self.engine.clock.print_report("Clip frames")
+        self.output.print_report("Servo PWM")
+    
+    def full_robot_sequence(self, overlap=1.0, use_clip=True):
+        """
+        Complete robot sequence with LED effects
+        Y, X and Z keyframes run as one merged timeline: overlap=0.0 keeps the
+        strict Y → X → Z order, 1.0 moves all axes together
+        When the precompiled clip is loaded and starts where the servos are, it
+        is streamed instead (it was compiled with its own overlap setting)
+        """
+        log.info("\n" + "="*50)
+        log.info("🤖 FULL ROBOT SEQUENCE STARTING")
+        log.info("="*50)
+        
+        if use_clip and self.clip is not None and self.clip.starts_at(self.current_positions):
+            self.play_clip(self.clip)
+            log.info("✅ Full sequence completed!")
+            return
+        
+        timeline = compile_sequences(
+            ServoConfig.SEQUENCES, self.current_positions, self._degree_to_ns,
+            order=ServoConfig.SEQUENCE_ORDER, frame_ms=ServoConfig.SERVO_FRAME_MS,
+            segment_duration=3.0, hold=0.3, overlap=overlap)
+        
+        # Axis colors while moving; the final brightness decrease overlaps
+        # the end of the motion instead of waiting for it
+        fade = self._brightness_task(150, 10, 2.0, clear_after=True)
+        self._run(self._timeline_task(timeline, finale=fade, finale_duration=2.0))
+        
+        self.engine.clock.print_report("Engine frames")
+        self.output.print_report("Servo PWM")
+        self.print_profile()
+        log.info("✅ Full sequence completed!")
+    
+    # ==================== REMOTE CONTROL ====================
+    def serve_commands(self, port=None, frames=None):
+        """
+        Follow host commands (serial_protocol.py) until CMD_EXIT
+        port: byte port with read_byte()/write(); default the USB serial
+        frames: stop after this many frames (None = until CMD_EXIT)
+        """
+        usb = port is None
+        if usb:
+            port = UsbSerialPort()
+        self.remote_port = port
+        self.reader = PacketReader()
+        self.reply = bytearray(STATE_SIZE + OVERHEAD)
+        self.state = bytearray(STATE_SIZE)
+        self.track_targets = dict(self.current_positions)
+        self.tracker = TargetTracker(POSE_AXES, delay_us=ServoConfig.TRACK_DELAY_MS * 1000)
+        self.tracker.reset(self.track_targets)
+        self.latency = Profiler(('arrival→pwm',))
+        self.latency_us = 0
+        self.latency_writes = 0 if self.drive is None else self.drive.stamped[0]
+        self.pose_seq = 0
+        self.remote_clip = None
+        self.remote_active = True
+    
+        log.info("📡 Remote control: waiting for commands")
+        log.flush()
+        level = log.default.level
+        log.set_level(log.WARN)  # The host reads this same serial line
+        self.engine.clock.set_interval(ServoConfig.REMOTE_FRAME_MS)
+        if self.drive is not None:
+            self.drive.set_lead(ServoConfig.REMOTE_FRAME_MS)  # Each target out on the next tick
+        self.engine.frame_hooks.append(self._record_latency)  # Runs after the PWM flush
+        if usb:
+            port.claim()  # Ctrl+C no longer interrupts; CMD_EXIT leaves
+        try:
+            self._run(self._remote_task(frames))
+        finally:
+            if usb:
+                port.release()
+            self.engine.frame_hooks.remove(self._record_latency)
+            self.engine.clock.set_interval(ServoConfig.SERVO_FRAME_MS)
+            if self.drive is not None:
+                self.drive.set_lead(ServoConfig.TIMER_LEAD_MS)
+            log.set_level(level)
+        log.info("📡 Remote control ended (%d packets, %d errors)",
+                 self.reader.packets, self.reader.errors)
+        self.latency.dump("Tracking latency")
+    
+    def _remote_task(self, frames=None):
+        """Engine task: handle packets, sample the tracker, slew each axis toward its target"""
+        frame_s = ServoConfig.REMOTE_FRAME_MS / 1000
+        max_step = {}
+        for axis in POSE_AXES:
+            table = self.calibration[axis].ns_table
+            span_ns = table[180] - table[0]
+            max_step[axis] = max(1, int(span_ns * ServoConfig.TRACK_MAX_DEG_PER_S * frame_s) // 180)
+        reader = self.reader
+        port = self.remote_port
+        positions = self.current_positions
+        targets = self.track_targets
+        tracker = self.tracker
+        drive = self.drive
+        n = yield
+        while self.remote_active and (frames is None or n < frames):
+            while reader.poll(port):
+                self._handle_packet(reader.cmd, reader.payload, reader.length)
+            if tracker.count:
+                # The reference for when this frame reaches the servos
+                now = utime.ticks_us() if drive is None else drive.write_time_us()
+                tracker.sample(now, targets)
+                if tracker.fresh and drive is not None:
+                    drive.stamp_us = tracker.fresh_arrival  # Timed by the IRQ as it writes the frame
+            if self.remote_clip is None:
+                for axis in POSE_AXES:
+                    current = positions[axis]
+                    delta = targets[axis] - current
+                    if delta:
+                        step = max_step[axis]
+                        current += step if delta > step else (-step if delta < -step else delta)
+                        positions[axis] = current
+                        self.servos[axis].duty_ns(current)
+            n = yield
+        if self.remote_clip is not None:
+            self.engine.cancel_all()  # Leaving mid-clip: stop it where it is
+    
+    def _handle_packet(self, cmd, payload, length):
+        if cmd == CMD_SET_POSE:
+            if length != POSE_SIZE:
+                return self._send_error(cmd, ERR_BAD_LENGTH)
+            seq, mask, y, x, z = struct.unpack_from(POSE_FORMAT, payload)
+            self.pose_seq = seq
+            for bit, value in enumerate((y, x, z)):
+                if mask & (1 << bit):
+                    axis = POSE_AXES[bit]
+                    self.track_targets[axis] = self.calibration[axis].centi_to_ns(value)
+            self.tracker.reset(self.track_targets)  # Direct poses replace streamed ones
+        elif cmd == CMD_TRACK:
+            if length != TRACK_SIZE:
+                return self._send_error(cmd, ERR_BAD_LENGTH)
+            arrival = utime.ticks_us()
+            seq, host_us, mask, y, x, z = struct.unpack_from(TRACK_FORMAT, payload)
+            self.pose_seq = seq
+            cal = self.calibration
+            self.tracker.push(host_us, arrival, mask, (cal['y'].centi_to_ns(y),
+                                                      cal['x'].centi_to_ns(x),
+                                                      cal['z'].centi_to_ns(z)))
+        elif cmd == CMD_QUERY:
+            self._send_state()
+        elif cmd == CMD_SET_LEDS:
+            load_leds()
+            if length == 3:
+                leds.fill((payload[0], payload[1], payload[2]))
+            elif length == len(leds.buf):
+                leds.buf[:] = memoryview(payload)[:length]
+            else:
+                return self._send_error(cmd, ERR_BAD_LENGTH)
+            self._show_leds()
+        elif cmd == CMD_PLAY_CLIP:
+            self._remote_play_clip(bytes(payload[:length]).decode())
+        elif cmd == CMD_EXIT:
+            self.remote_active = False
+        else:
+            self._send_error(cmd, ERR_UNKNOWN_CMD)
+    
+    def _remote_play_clip(self, path):
+        clip = self.clip if self.clip is not None and self.clip.path == path else None
+        if clip is None:
+            try:
+                clip = ClipPlayer(path)
+            except (OSError, ValueError):
+                return self._send_error(CMD_PLAY_CLIP, ERR_CLIP_OPEN)
+        if self.remote_clip is not None or not clip.starts_at(self.current_positions):
+            return self._send_error(CMD_PLAY_CLIP, ERR_CLIP_START)
+        # Hold the clip's last pose afterwards unless the host sends a new one
+        self.track_targets.update(clip.final_positions())
+        self.engine.spawn(self._remote_clip_task(clip))
+    
+    def _remote_clip_task(self, clip):
+        self.remote_clip = clip
+        try:
+            yield from clip.task(self.servos, self._clip_strip(clip), frame_ms=ServoConfig.REMOTE_FRAME_MS)
+            for axis, ns in clip.final_positions().items():
+                self.current_positions[axis] = ns
+        finally:
+            self.remote_clip = None
+    
+    def _send_state(self):
+        flags = FLAG_CLIP if self.remote_clip is not None else 0
+        if self.track_targets == self.current_positions:
+            flags |= FLAG_AT_TARGET
+        if self.tracker.count:
+            flags |= FLAG_TRACKING
+        cal = self.calibration
+        positions = self.current_positions
+        struct.pack_into(STATE_FORMAT, self.state, 0, self.pose_seq,
+                         cal['y'].ns_to_centi(positions['y']),
+                         cal['x'].ns_to_centi(positions['x']),
+                         cal['z'].ns_to_centi(positions['z']),
+                         self.engine.frame, self.reader.packets & 0xFFFF,
+                         self.reader.errors & 0xFFFF, flags, min(0xFFFF, self.latency_us))
+        size = encode_into(self.reply, RSP_STATE, self.state, STATE_SIZE)
+        self.remote_port.write(memoryview(self.reply)[:size])
+    
+    def _record_latency(self):
+        """Frame hook: time from a TRACK sample's arrival to the PWM write that applied it"""
+        tracker = self.tracker
+        drive = self.drive
+        if drive is None:
+            if tracker.fresh:
+                self.latency_us = utime.ticks_diff(utime.ticks_us(), tracker.fresh_arrival)
+                self.latency.record(0, self.latency_us)
+        elif drive.stamped[0] != self.latency_writes:
+            # Measured by the timer IRQ when it wrote the stamped frame
+            self.latency_writes = drive.stamped[0]
+            self.latency_us = drive.stamped[1]
+            self.latency.record(0, self.latency_us)
+        tracker.fresh = False
+    
+    def _send_error(self, cmd, code):
+        self.remote_port.write(encode(RSP_ERROR, struct.pack(ERROR_FORMAT, cmd, code)))
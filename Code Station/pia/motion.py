@@ -0,0 +1,647 @@
+from machine import Pin, PWM
+import utime
+import log
+from easing import get_table
+from scheduler import FrameScheduler
+from sequence import compile_sequences
+from calibration import get_profile
+from trajectory import MoveKernel, carry_weight
+from clip_player import ClipPlayer
+from pwm_output import PwmOutput
+from profiler import Profiler, EASING, CONVERT, PWM as PWM_PHASE, SLACK
+from planner import plan_move, min_duration
+from spline import fit_path
+from power import PowerBudget
+from soft_start import soft_start
+from pia.config import MultiServoConfig
+
+# ==================== ADVANCED MULTI-SERVO CONTROLLER ====================
+class AdvancedMultiServoController:
+    def __init__(self):
+        pwms = {}
+        self.calibration = {}
+        self.current_positions = {}
+        self.velocities = {}      # ns/s; non-zero only after an interrupted move
+        self.is_moving = False
+        self.preempt = False      # Stop the running move at its next frame
+        self.emergency = False    # Refuse new moves until emergency_return()
+        self._kernel_axes = []
+        self.easing = get_table(MultiServoConfig.EASING_CURVE)
+        self.kernel = MoveKernel(len(MultiServoConfig.SERVO_PINS))
+        self.servo_clock = FrameScheduler(MultiServoConfig.SERVO_FRAME_MS)
+        self.coordinated_clock = FrameScheduler(MultiServoConfig.COORDINATED_FRAME_MS)
+        self.profiler = Profiler()  # Per-phase frame timings, see print_profile()
+        self.power = None
+        if MultiServoConfig.POWER_BUDGET_MA:
+            self.power = PowerBudget(MultiServoConfig.POWER_BUDGET_MA, len(MultiServoConfig.SERVO_PINS))
+        self.ns_per_deg = {}
+        self.drive = None         # servo_timer.TimerDrive while the timer writes the servos
+        
+        # Initialize all servos
+        for axis, pin in MultiServoConfig.SERVO_PINS.items():
+            self.calibration[axis] = get_profile(MultiServoConfig.SERVO_PROFILES[axis])
+            profile = self.calibration[axis]
+            self.ns_per_deg[axis] = (profile.max_ns - profile.min_ns) / profile.span_deg
+            pwms[axis] = PWM(Pin(pin))
+            pwms[axis].freq(50)
+        
+        # Moves write to channels; output.flush() sends changed values once per frame
+        self.output = PwmOutput(pwms)
+        self.servos = self.output.channels
+        
+        for axis in MultiServoConfig.SERVO_PINS:
+            # Convert degree to nanoseconds and set initial position
+            initial_deg = MultiServoConfig.INITIAL_POSITIONS[axis]
+            initial_ns = self._degree_to_ns(axis, initial_deg)
+            self.current_positions[axis] = initial_ns
+            self.velocities[axis] = 0
+        
+        # Channels come up one by one, ready as soon as the servos can be in place
+        soft_start(self.output, self.current_positions, self.calibration,
+                   MultiServoConfig.SERVO_FRAME_MS)
+        if MultiServoConfig.TIMER_HZ:
+            self.start_timer_drive(MultiServoConfig.TIMER_HZ)
+        
+        if MultiServoConfig.EMERGENCY_PIN is not None:
+            self.emergency_pin = Pin(MultiServoConfig.EMERGENCY_PIN, Pin.IN, Pin.PULL_UP)
+            self.emergency_pin.irq(handler=self._emergency_irq, trigger=Pin.IRQ_FALLING)
+        
+        log.info("🤖 Multi-Servo Controller Initialized")
+        self.print_status()
+    
+    def _degree_to_ns(self, axis, degrees):
+        """Convert degrees to PWM nanoseconds (calibrated table lookup)"""
+        return self.calibration[axis].to_ns(degrees)
+    
+    def _ns_to_degree(self, axis, ns):
+        """Convert PWM nanoseconds to degrees"""
+        return self.calibration[axis].to_degrees(ns)
+    
+    # ==================== TIMER DRIVE ====================
+    def start_timer_drive(self, hz=100):
+        """Let a machine.Timer write the servos; moves then only queue frames (servo_timer.py)"""
+        from servo_timer import TimerDrive
+        self.stop_timer_drive()
+        self.drive = TimerDrive(self.output, hz)
+        self.drive.start()
+        log.info("⏲️  Servo updates from a %d Hz timer", hz)
+    
+    def stop_timer_drive(self):
+        """Go back to writing the servos from the frame loops"""
+        if self.drive is not None:
+            self.drive.stop()
+            self.drive = None
+    
+    def _move_clock(self, clock, frame_ms=None):
+        """
+        Clock for a frame loop: the timer drive while it runs, else clock
+        frame_ms: frame period of the loop (None: the clock's own)
+        """
+        if self.drive is None:
+            if frame_ms is not None:
+                clock.set_interval(frame_ms)
+            return clock
+        self.drive.set_interval(frame_ms)  # None: one frame per tick
+        return self.drive
+    
+    def _finish_frames(self, clock, completed, axes):
+        """
+        End a frame loop on clock (finally: also on Ctrl+C)
+        Returns True when the timer queue was cut short: where axes stop is
+        then recorded here, the caller records it otherwise
+        """
+        if clock is not self.drive:
+            self.output.flush()  # A frame staged when the loop was left
+        clock.end(completed)  # Play the queue out, or cut it to a short bridge
+        if completed or clock is not self.drive:
+            return False
+        # The next move blends from where the bridge frames leave the servos
+        output = self.output
+        for axis in axes:
+            slot = output.axes.index(axis)
+            self._stopped_at(axis, clock.frame[slot], clock.previous[slot], 1, clock)
+        return True
+    
+    # ==================== PREEMPTION ====================
+    def request_preempt(self):
+        """Stop the running move at its next frame (safe to call from an IRQ)"""
+        self.preempt = True
+    
+    def _emergency_irq(self, pin):
+        # Flag stores only: nothing is allocated inside the interrupt
+        self.emergency = True
+        self.preempt = True
+    
+    def _can_start(self):
+        """False (with a warning) while a move runs or an emergency is pending"""
+        if self.emergency:
+            log.warn("🚨 Emergency pending - call emergency_return()")
+            return False
+        if self.is_moving:
+            log.warn("⚠️  Another movement in progress")
+            return False
+        return True
+    
+    def _moving_axes(self):
+        """Axes still carrying velocity from an interrupted move"""
+        return [axis for axis, velocity in self.velocities.items() if velocity]
+    
+    def _stopped_at(self, axis, ns, previous_ns, gap, clock):
+        """Record where an interrupted loop left axis and how fast it was going"""
+        self.current_positions[axis] = ns
+        self.velocities[axis] = (ns - previous_ns) * 1000000 // (gap * clock.interval_us) if gap else 0
+    
+    def _come_to_rest(self):
+        """Blend out velocity left by an interrupted move before starting a new kind of motion"""
+        if not self._moving_axes():
+            return True
+        clock = self._move_clock(self.coordinated_clock)
+        easing, total_updates, blend = self._prepare_kernel({}, clock, 0)
+        return self._run_kernel(clock, total_updates, easing, blend)
+    
+    def emergency_return(self, duration=None):
+        """Go home now, blending out of whatever motion was interrupted"""
+        self.emergency = False
+        self.preempt = False
+        return self.safe_return_from_anywhere(duration)
+    
+    def _move_timing(self, moves, clock, duration):
+        """
+        (easing table, frames) for moves {axis: (start_ns, target_ns)}
+        A fixed duration uses the configured easing curve; duration=None plans
+        the time-optimal profile within MultiServoConfig.AXIS_LIMITS
+        """
+        if duration is not None:
+            return self._within_budget(moves, clock, self.easing, clock.frames_for(duration))
+        
+        axes = []
+        for axis, (start_ns, target_ns) in moves.items():
+            distance = abs(self._ns_to_degree(axis, target_ns) - self._ns_to_degree(axis, start_ns))
+            vmax, amax = MultiServoConfig.AXIS_LIMITS[axis]
+            axes.append((distance, vmax, amax))
+        plan = plan_move(axes, MultiServoConfig.MOTION_PROFILE)
+        if plan is None:
+            return self.easing, 1  # Under one degree: just settle on the target
+        log.info("📐 Planned %s move: %.2fs", MultiServoConfig.MOTION_PROFILE, plan.duration)
+        return self._within_budget(moves, clock, plan.table(), plan.frames(clock.interval_us / 1000))
+    
+    def _within_budget(self, moves, clock, easing, total_updates):
+        """(easing, frames) with the move stretched until its estimated current fits the power budget"""
+        if self.power is None:
+            return easing, total_updates
+        distances = [(target_ns - start_ns) / self.ns_per_deg[axis]
+                     for axis, (start_ns, target_ns) in moves.items()]
+        frames = self.power.fit_frames(distances, total_updates, clock.interval_us / 1000000, easing)
+        if frames > total_updates:
+            log.info("🔋 Stretched to %.2fs to stay within %d mA",
+                     frames * clock.interval_us / 1000000, self.power.budget_ma)
+        return easing, frames
+    
+    def _smooth_move_servo(self, axis, target_degrees, duration=None):
+        """
+        Move a single servo smoothly from its current position to target
+        duration=None plans the fastest move within the axis limits
+        """
+        if axis not in self.servos:
+            log.error("❌ Servo %s not found", axis)
+            return False
+        if not self._can_start():
+            return False
+        
+        start_ns = self.current_positions[axis]
+        target_ns = self._degree_to_ns(axis, target_degrees)
+        
+        if start_ns == target_ns and not self._moving_axes():
+            return True  # Already at target
+        
+        log.info("🔄 %s-axis: %s° → %s°", axis.upper(), self._ns_to_degree(axis, start_ns), target_degrees)
+        
+        # 20ms frames on absolute deadlines, so work done per frame never adds up
+        clock = self._move_clock(self.servo_clock)
+        easing, total_updates, blend = self._prepare_kernel({axis: target_ns}, clock, duration)
+        return self._run_kernel(clock, total_updates, easing, blend)
+    
+    def _prepare_kernel(self, targets, clock, duration):
+        """
+        Load moves to targets {axis: ns} into self.kernel
+        Axes still moving from an interrupted move keep their velocity and
+        blend it out over BLEND_S (axes without a target hold where they are).
+        Returns (easing table, frames, blend frames)
+        """
+        moves = {}
+        for axis, target_ns in targets.items():
+            moves[axis] = (self.current_positions[axis], target_ns)
+        for axis in self._moving_axes():
+            if axis not in moves:
+                moves[axis] = (self.current_positions[axis], self.current_positions[axis])
+        easing, total_updates = self._move_timing(moves, clock, duration)
+        
+        blend = 0
+        if self._moving_axes():
+            blend = clock.frames_for(MultiServoConfig.BLEND_S)
+            total_updates = max(total_updates, blend)
+            blend = min(blend, total_updates)
+        blend_s = blend * clock.interval_us / 1000000
+        
+        self.kernel.clear()
+        self._kernel_axes = []
+        for axis, (start_ns, target_ns) in moves.items():
+            # The carry peaks at 4/27 of itself: keep that overshoot inside the end stops
+            profile = self.calibration[axis]
+            carry = int(self.velocities[axis] * blend_s)
+            carry = max((profile.min_ns - start_ns) * 27 // 4, min((profile.max_ns - start_ns) * 27 // 4, carry))
+            self.kernel.add(self.servos[axis], start_ns, target_ns, carry)
+            self._kernel_axes.append(axis)
+            self.velocities[axis] = 0
+        return easing, total_updates, blend
+    
+    def _run_kernel(self, clock, total_updates, easing=None, blend=0):
+        """
+        Frame loop for the axes loaded in self.kernel: table easing plus
+        integer-only interpolation, so frames allocate nothing on the heap
+        Stops at the next frame when preempted (returns False); positions and
+        velocities are recorded however the loop ends, even on Ctrl+C
+        clock may be the timer drive: frames are then queued for its IRQ
+        """
+        kernel = self.kernel
+        output = self.output
+        prof = self.profiler
+        if easing is None:
+            easing = self.easing
+        lead = 1 if blend else 0  # Already moving: don't hold the start for a frame
+        self.is_moving = True
+        self.preempt = False
+        completed = False
+        last = 0
+        gap = 0
+        try:
+            for i in clock.frames(total_updates):
+                if self.preempt:
+                    break
+                prof.record(SLACK, clock.slack_us)
+                t = prof.now()
+                step = i + lead
+                weight = easing.sample(step, total_updates)
+                t = prof.end(EASING, t)
+                kernel.write(weight, carry_weight(step, blend) if blend else 0)
+                t = prof.end(CONVERT, t)
+                output.flush()
+                prof.end(PWM_PHASE, t)
+                gap = i - last
+                last = i
+            else:
+                kernel.finish()
+                output.flush()  # The exact targets
+                completed = True
+        finally:
+            if not self._finish_frames(clock, completed, self._kernel_axes):
+                for k, axis in enumerate(self._kernel_axes):
+                    self._stopped_at(axis, kernel.out[k], kernel.prev[k], 0 if completed else gap, clock)
+            self.is_moving = False
+            self.preempt = False
+            log.default.frames_done()  # The frame loop may have been left early
+        return completed
+    
+    def move_servo(self, axis, target_degrees, duration=None):
+        """Move a single servo smoothly (duration=None: planned from AXIS_LIMITS)"""
+        return self._smooth_move_servo(axis, target_degrees, duration)
+    
+    def move_servo_sequence(self, axis, sequence_degrees, durations=None, blend=True):
+        """
+        Move a servo through a sequence of positions
+        sequence_degrees: list of target degrees [pos1, pos2, pos3...]
+        durations: optional list of durations for each movement
+                   (None, or a None entry, plans that move from AXIS_LIMITS)
+        blend: True = one continuous spline through the keyframes,
+               False = stop and pause 0.5s at every keyframe
+        """
+        if not sequence_degrees:
+            return False
+        
+        if blend:
+            return self._blended_sequence(axis, sequence_degrees, durations)
+        
+        if durations is None:
+            durations = [None] * len(sequence_degrees)
+        
+        log.info("🎬 %s-axis sequence: %s", axis.upper(), sequence_degrees)
+        
+        for i, target_deg in enumerate(sequence_degrees):
+            duration = durations[i] if i < len(durations) else None
+            if not self._smooth_move_servo(axis, target_deg, duration):
+                return False
+            utime.sleep(0.5)  # Pause between sequence points
+        
+        return True
+    
+    def _blended_sequence(self, axis, sequence_degrees, durations=None):
+        """Fit one spline through the keyframes and play it"""
+        if axis not in self.servos:
+            log.error("❌ Servo %s not found", axis)
+            return False
+        if not self._can_start():
+            return False
+        for other in self._moving_axes():
+            if other != axis and not self._come_to_rest():
+                return False
+        
+        path = self._fit_sequence(axis, sequence_degrees, durations)
+        if path is None:
+            return self._come_to_rest()  # Every keyframe is where the servo already is
+        log.info("🎬 %s-axis blended sequence: %s (%.1fs)", axis.upper(), sequence_degrees, path.duration())
+        return self.play_path(axis, path)
+    
+    def _fit_sequence(self, axis, sequence_degrees, durations=None):
+        """
+        Spline path (spline.KeyframePath) from the current position through
+        the keyframes, or None when the servo is already on all of them
+        Planned segments keep the path within the axis speed limit
+        """
+        points = [self.current_positions[axis]]
+        segment_durations = []
+        limits = []
+        vmax, amax = MultiServoConfig.AXIS_LIMITS[axis]
+        for i, target_deg in enumerate(sequence_degrees):
+            target_ns = self._degree_to_ns(axis, target_deg)
+            if target_ns == points[-1]:
+                continue  # Already there - no segment
+            duration = durations[i] if durations and i < len(durations) else None
+            limit = None
+            if duration is None:
+                distance = abs(target_deg - self._ns_to_degree(axis, points[-1]))
+                duration = min_duration(distance, vmax, amax, MultiServoConfig.MOTION_PROFILE)[0]
+                limit = vmax * self.ns_per_deg[axis]
+            points.append(target_ns)
+            segment_durations.append(duration)
+            limits.append(limit)
+        
+        if len(points) < 2:
+            return None
+        
+        profile = self.calibration[axis]
+        # Sampled at the timer rate while the timer drive runs
+        frame_ms = MultiServoConfig.SERVO_FRAME_MS if self.drive is None else self.drive.tick_us / 1000
+        # Leave with the velocity an interrupted move left behind
+        return fit_path(points, segment_durations, frame_ms,
+                        min_ns=profile.min_ns, max_ns=profile.max_ns,
+                        start_velocity=self.velocities[axis], max_velocity=limits)
+    
+    def play_path(self, axis, path):
+        """Play a sampled spline path (spline.KeyframePath) on one servo (preemptible)"""
+        servo = self.servos[axis]
+        duty = path.duty
+        output = self.output
+        prof = self.profiler
+        clock = self._move_clock(self.servo_clock, path.frame_ms)
+        self.is_moving = True
+        self.preempt = False
+        completed = False
+        last = 0
+        gap = 0
+        try:
+            for i in clock.frames(path.frames):
+                if self.preempt:
+                    break
+                prof.record(SLACK, clock.slack_us)
+                t = prof.now()
+                servo.duty_ns(duty[i])
+                output.flush()
+                prof.end(PWM_PHASE, t)
+                gap = i - last
+                last = i
+            else:
+                completed = True
+        finally:
+            cut_short = self._finish_frames(clock, completed, (axis,))
+            if completed:
+                self._stopped_at(axis, path.final_ns, path.final_ns, 0, clock)
+            elif not cut_short:
+                self._stopped_at(axis, duty[last], duty[last - gap], gap, clock)
+            self.servo_clock.set_interval(MultiServoConfig.SERVO_FRAME_MS)
+            self.is_moving = False
+            self.preempt = False
+            log.default.frames_done()  # The frame loop may have been left early
+        return completed
+    
+    def play_clip(self, path):
+        """
+        Stream a compiled motion clip (clip_compiler.py) from flash
+        Frames are read in fixed-size chunks, so RAM use stays flat however
+        long the clip is
+        """
+        if not self._can_start() or not self._come_to_rest():
+            return False
+        
+        clip = ClipPlayer(path)
+        log.info("🎞️  Playing clip %s (%.1fs)", path, clip.duration())
+        clock = self._move_clock(self.coordinated_clock, clip.frame_ms)
+        task = clip.task(self.servos, output=self.output)
+        next(task)
+        self.is_moving = True
+        self.preempt = False
+        completed = False
+        last = 0
+        gap = 0
+        try:
+            for frame in clock.frames(clip.num_frames - 1):
+                if self.preempt:
+                    break
+                gap = frame - last
+                last = frame
+                task.send(frame)
+        except StopIteration:
+            completed = True
+        finally:
+            cut_short = self._finish_frames(clock, completed, clip.axes)
+            if completed:
+                for axis, ns in clip.final_positions().items():
+                    self._stopped_at(axis, ns, ns, 0, clock)
+            elif not cut_short:
+                clip.read_frame(last - gap)
+                previous = [clip.duty_ns(k) for k in range(clip.num_axes)]
+                clip.read_frame(last)
+                for k, axis in enumerate(clip.axes):
+                    self._stopped_at(axis, clip.duty_ns(k), previous[k], gap, clock)
+            self.coordinated_clock.set_interval(MultiServoConfig.COORDINATED_FRAME_MS)
+            clip.close()
+            self.is_moving = False
+            self.preempt = False
+            log.default.frames_done()  # The frame loop may have been left early
+        return completed
+    
+    def coordinated_move(self, movements, duration=None):
+        """
+        Move multiple servos simultaneously
+        movements: dict like {'y': 90, 'x': 80, 'z': 90}
+        duration=None plans the fastest move all axes can make together
+        """
+        if not self._can_start():
+            return False
+        
+        log.info("🤝 Coordinated multi-servo movement")
+        
+        # Calculate targets and load start/delta per axis into the kernel
+        target_positions = {}
+        for axis, target_deg in movements.items():
+            if axis in self.servos:
+                target_positions[axis] = self._degree_to_ns(axis, target_deg)
+        
+        # Move all servos simultaneously (positions are updated as frames go out)
+        clock = self._move_clock(self.coordinated_clock)
+        easing, total_updates, blend = self._prepare_kernel(target_positions, clock, duration)
+        if not self._run_kernel(clock, total_updates, easing, blend):
+            log.warn("⏸️  Coordinated movement preempted")
+            return False
+        
+        log.info("✅ Coordinated movement completed")
+        return True
+    
+    def y_axis_sequence(self, duration=None):
+        """Y-axis: 90° → 85° → 120° → 90°"""
+        sequence = MultiServoConfig.SEQUENCES['y']
+        log.info("\n🎯 Y-AXIS SEQUENCE: 90° → 85° → 120° → 90°")
+        return self.move_servo_sequence('y', sequence, [duration] * len(sequence))
+    
+    def z_axis_sequence(self, duration=None):
+        """Z-axis: 90° → 85° → 120° → 90°"""  
+        sequence = MultiServoConfig.SEQUENCES['z']
+        log.info("\n🎯 Z-AXIS SEQUENCE: 90° → 85° → 120° → 90°")
+        return self.move_servo_sequence('z', sequence, [duration] * len(sequence))
+    
+    def x_axis_sequence(self, duration=None):
+        """X-axis: 80° → 65° → 110° → 80°"""
+        sequence = MultiServoConfig.SEQUENCES['x']
+        log.info("\n🎯 X-AXIS SEQUENCE: 80° → 65° → 110° → 80°")
+        return self.move_servo_sequence('x', sequence, [duration] * len(sequence))
+    
+    def play_timeline(self, timeline):
+        """
+        Play a compiled multi-axis timeline in a single coordinated loop
+        """
+        if not self._can_start() or not self._come_to_rest():
+            return False
+        
+        positions = {}
+        timeline.rewind()
+        
+        prof = self.profiler
+        clock = self._move_clock(self.coordinated_clock, timeline.frame_ms)
+        self.is_moving = True
+        self.preempt = False
+        completed = False
+        last = 0
+        gap = 0
+        try:
+            for frame in clock.frames(timeline.total_frames):
+                if self.preempt:
+                    break
+                prof.record(SLACK, clock.slack_us)
+                t = prof.now()
+                timeline.sample_into(frame, self.easing, positions)
+                t = prof.end(EASING, t)
+                for axis, current_ns in positions.items():
+                    self.servos[axis].duty_ns(current_ns)
+                self.output.flush()
+                prof.end(PWM_PHASE, t)
+                gap = frame - last
+                last = frame
+            else:
+                completed = True
+        finally:
+            cut_short = self._finish_frames(clock, completed, positions)
+            if completed:
+                for axis, target_ns in timeline.final_positions().items():
+                    self._stopped_at(axis, target_ns, target_ns, 0, clock)
+            elif positions and not cut_short:
+                # Cursors only run forward: rewind to sample the frame before
+                previous = {}
+                timeline.rewind()
+                timeline.sample_into(last - gap, self.easing, previous)
+                for axis, ns in positions.items():
+                    self._stopped_at(axis, ns, previous[axis], gap, clock)
+            self.is_moving = False
+            self.preempt = False
+            log.default.frames_done()  # The frame loop may have been left early
+        return completed
+    
+    def play_sequences(self, tracks, duration=4.0, overlap=1.0, hold=0.5):
+        """
+        Move several axes through their keyframe lists as one timeline
+        tracks: dict like {'y': [90, 75, 130, 90], 'x': [80, 60, 130, 80]}
+        overlap: 0.0 = strict one-axis-after-another, 1.0 = all together
+        """
+        timeline = compile_sequences(
+            tracks, self.current_positions, self._degree_to_ns,
+            order=MultiServoConfig.SEQUENCE_ORDER,
+            frame_ms=MultiServoConfig.COORDINATED_FRAME_MS,
+            segment_duration=duration, hold=hold, overlap=overlap)
+        if self.power is not None:
+            added = self.power.stagger(timeline, self.easing, self.ns_per_deg)
+            if added:
+                log.info("🔋 Staggered by %.2fs to stay within %d mA",
+                         added * timeline.frame_ms / 1000, self.power.budget_ma)
+        seconds = timeline.total_frames * timeline.frame_ms / 1000
+        log.info("🎼 Timeline: %d axes, %.1fs (overlap %s)", len(timeline.order), seconds, overlap)
+        return self.play_timeline(timeline)
+    
+    def full_robot_sequence(self, duration=4.0, overlap=1.0):
+        """
+        Complete robot sequence: Y, X and Z keyframes merged into one timeline
+        overlap=0.0 keeps the old strict Y → X → Z order, 1.0 runs them together
+        """
+        log.info("\n" + "="*50)
+        log.info("🤖 FULL ROBOT SEQUENCE")
+        log.info("="*50)
+        
+        if not self.play_sequences(MultiServoConfig.SEQUENCES, duration, overlap):
+            return False
+        
+        log.info("✅ Full robot sequence completed")
+        return True
+    
+    def safe_return_from_anywhere(self, duration=5.0):
+        """
+        Smoothly return all servos to initial positions from ANY current position
+        This is the key feature you wanted - no jerks!
+        """
+        log.info("\n" + "="*50)
+        log.info("🏠 SMOOTH RETURN FROM CURRENT POSITIONS")
+        log.info("="*50)
+        
+        target_positions = {}
+        for axis, initial_deg in MultiServoConfig.INITIAL_POSITIONS.items():
+            current_deg = self._ns_to_degree(axis, self.current_positions[axis])
+            target_positions[axis] = initial_deg
+            log.info("📊 %s-axis: %s° → %s°", axis.upper(), current_deg, initial_deg)
+        
+        return self.coordinated_move(target_positions, duration)
+    
+    def get_current_angles(self):
+        """Get current angles of all servos in degrees"""
+        angles = {}
+        for axis in self.servos.keys():
+            angles[axis] = self._ns_to_degree(axis, self.current_positions[axis])
+        return angles
+    
+    def print_status(self):
+        """Print current status of all servos"""
+        log.info("\n" + "="*40)
+        log.info("🤖 MULTI-SERVO STATUS")
+        log.info("="*40)
+        angles = self.get_current_angles()
+        for axis, angle in angles.items():
+            log.info("📍 %s-axis: %s°", axis.upper(), angle)
+        if self.drive is None:
+            self.servo_clock.print_report("Servo frames")
+            self.coordinated_clock.print_report("Coordinated frames")
+        else:
+            self.drive.print_report()  # Every loop ran on the timer
+        self.output.print_report("Servo PWM")
+        if self.power is not None:
+            self.power.print_report()
+        self.print_profile()
+        log.info("="*40)
+    
+    def print_profile(self):
+        """Dump per-phase frame timings (min/avg/max/p99)"""
+        self.profiler.dump("Frame phases")
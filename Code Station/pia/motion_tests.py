@@ -0,0 +1,473 @@
+from array import array
+import utime
+import log
+from calibration import get_profile
+from trajectory import per_tick_allocation, heap_in_use, without_sim_trace
+from clip_player import ClipPlayer
+from clip_format import pack_header, record_size, NO_LED_CHANGE
+from planner import plan_move
+from soft_start import save_pose, forget_pose, BOOT_TARGET_MS
+from pia.config import MultiServoConfig
+from pia.motion import AdvancedMultiServoController
+from servo_timer import BRIDGE_FRAMES
+
+# Run one from the REPL, e.g.
+#   >>> from pia.motion_tests import test_preempt
+#   >>> test_preempt()
+
+# ==================== QUICK TEST FUNCTIONS ====================
+def test_individual_servos():
+    """Test each servo individually"""
+    robot = AdvancedMultiServoController()
+    
+    log.info("🧪 TESTING INDIVIDUAL SERVOS")
+    
+    # Test Y-axis
+    log.info("\n🎯 Testing Y-axis...")
+    robot.y_axis_sequence(duration=3.0)
+    utime.sleep(0.5)
+    
+    # Test X-axis  
+    log.info("\n🎯 Testing X-axis...")
+    robot.x_axis_sequence(duration=3.0)
+    utime.sleep(0.5)
+    
+    # Test Z-axis
+    log.info("\n🎯 Testing Z-axis...")
+    robot.z_axis_sequence(duration=3.0)
+    utime.sleep(0.5)
+    
+    # Return to initial positions
+    robot.safe_return_from_anywhere()
+
+def test_emergency_return():
+    """Test the emergency return feature from random positions"""
+    robot = AdvancedMultiServoController()
+    
+    log.info("🚨 TESTING EMERGENCY RETURN FROM RANDOM POSITIONS")
+    
+    # Move servos to random positions
+    robot.move_servo('y', 45, duration=2.0)
+    robot.move_servo('x', 110, duration=2.0) 
+    robot.move_servo('z', 135, duration=2.0)
+    
+    robot.print_status()
+    utime.sleep(0.5)
+    
+    # Now smoothly return to initial positions
+    robot.safe_return_from_anywhere(duration=4.0)
+    robot.print_status()
+
+def test_boot_time():
+    """Soft start finishes inside the boot target, from a saved pose and from an unknown one"""
+    log.info("🧪 TESTING SOFT-START TIME")
+    ok = True
+    for saved in (True, False):
+        if saved:
+            # Stopped 10° away from the start positions last time
+            save_pose({axis: get_profile(MultiServoConfig.SERVO_PROFILES[axis]).to_ns(deg + 10)
+                       for axis, deg in MultiServoConfig.INITIAL_POSITIONS.items()})
+        else:
+            forget_pose()
+        started = utime.ticks_ms()
+        robot = AdvancedMultiServoController()
+        ready = utime.ticks_diff(utime.ticks_ms(), started)
+        within = ready < BOOT_TARGET_MS
+        ok = ok and within
+        log.info("%s %s: controller ready in %d ms", '✅' if within else '❌',
+                 "saved pose" if saved else "unknown pose", ready)
+    return ok
+
+def test_allocation_free():
+    """Check that the coordinated_move frame loop allocates nothing per frame"""
+    robot = AdvancedMultiServoController()
+    
+    log.info("🧪 TESTING HOT-LOOP HEAP ALLOCATION")
+    
+    def run(ticks):
+        robot.kernel.clear()
+        for axis in robot.servos:
+            robot.kernel.add(robot.servos[axis], robot._degree_to_ns(axis, 45),
+                             robot._degree_to_ns(axis, 135))
+        robot._run_kernel(robot.coordinated_clock, ticks)
+    
+    # The frame loop itself, writing the PWM: with the timer drive's sink
+    # attached, IRQ writes would land in the count as well
+    hz = robot.drive.hz if robot.drive is not None else None
+    robot.stop_timer_drive()
+    try:
+        per_tick = per_tick_allocation(run)
+    finally:
+        if hz:
+            robot.start_timer_drive(hz)
+    log.info("📦 Heap bytes allocated per frame: %d", per_tick)
+    log.info("✅ Allocation-free" if per_tick == 0 else "❌ Frame loop allocates")
+    return per_tick == 0
+
+def test_preempt(after_s=1.2):
+    """Preempt a move mid-way: the return leaves within a frame, with no jump in velocity"""
+    from machine import Timer
+    robot = AdvancedMultiServoController()
+    
+    log.info("🧪 TESTING PREEMPTION AND VELOCITY BLENDING")
+    robot.coordinated_move({'y': 45, 'x': 60, 'z': 45}, duration=1.0)
+    
+    # Record every Y duty written to the PWM (preallocated: may run inside the timer IRQ)
+    output = robot.output
+    slot = output.axes.index('y')
+    values = array('i', [0] * 512)
+    times = array('i', [0] * 512)
+    count = array('i', [0])
+    fired = array('i', [0])
+    
+    class RecordingPwm:
+        def __init__(self, pwm):
+            self.pwm = pwm
+        
+        def duty_ns(self, ns):
+            n = count[0]
+            if n < len(values):
+                values[n] = ns
+                times[n] = utime.ticks_us()
+                count[0] = n + 1
+            self.pwm.duty_ns(ns)
+    
+    def preempt(timer):
+        fired[0] = utime.ticks_us()
+        robot.request_preempt()
+    
+    plain_pwm = output.pwms[slot]
+    output.pwms[slot] = RecordingPwm(plain_pwm)
+    try:
+        Timer(mode=Timer.ONE_SHOT, period=int(after_s * 1000), callback=preempt)
+        preempted = not robot.coordinated_move({'y': 135, 'x': 130, 'z': 135}, duration=3.0)
+        first_return = count[0]
+        robot.safe_return_from_anywhere(duration=2.0)
+    finally:
+        output.pwms[slot] = plain_pwm
+    
+    interval = robot.coordinated_clock.interval_us if robot.drive is None else robot.drive.interval_us
+    points = [(times[n], values[n]) for n in range(count[0])]
+    profile = robot.calibration['y']
+    ns_per_deg = (profile.max_ns - profile.min_ns) / profile.span_deg
+    speeds = [(v1 - v0) * 1000000 / utime.ticks_diff(t1, t0) / ns_per_deg
+              for (t0, v0), (t1, v1) in zip(points, points[1:])]
+    before = speeds[first_return - 2]   # Last frame of the preempted move
+    after = speeds[first_return - 1]    # Into the first frame of the return
+    delay = utime.ticks_diff(times[first_return], fired[0])
+    
+    log.info("⏱️  Return started %dus after the preempt (frame %dus)", delay, interval)
+    log.info("📈 Y speed at the handover: %.1f → %.1f °/s", before, after)
+    # The timer drive plays the queue up to the next tick, then BRIDGE_FRAMES more
+    frames_late = 1 if robot.drive is None else 1 + BRIDGE_FRAMES
+    # Stopping and restarting would drop the speed to zero: allow 10%
+    ok = preempted and delay <= frames_late * interval and abs(after - before) <= abs(before) / 10
+    log.info("✅ Preempted and blended smoothly" if ok else "❌ Preemption is late or jerky")
+    return ok
+
+def test_planned_moves():
+    """Planned durations grow with distance and stay within the axis limits"""
+    log.info("🧪 TESTING PLANNED MOVE PROFILES")
+    frame_ms = MultiServoConfig.COORDINATED_FRAME_MS
+    vmax, amax = MultiServoConfig.AXIS_LIMITS['y']
+    ok = True
+    for distance in (5, 20, 70, 180):
+        plan = plan_move([(distance, vmax, amax)], MultiServoConfig.MOTION_PROFILE)
+        frames = plan.frames(frame_ms)
+        table = plan.table()
+        dt = frame_ms / 1000
+        positions = [distance * table.sample(i, frames) / 65536 for i in range(frames + 1)]
+        velocities = [(b - a) / dt for a, b in zip(positions, positions[1:])]
+        peak_v = max(abs(v) for v in velocities)
+        # Acceleration over 5-frame windows: single frames only show table rounding
+        peak_a = max(abs(velocities[i + 5] - velocities[i]) / (5 * dt)
+                     for i in range(len(velocities) - 5))
+        within = peak_v <= vmax * 1.02 and peak_a <= amax * 1.02
+        ok = ok and within
+        log.info("%s %3d°: %.2fs, peak %.0f°/s (max %s), %.0f°/s² (max %s)",
+                 '✅' if within else '❌', distance, plan.duration, peak_v, vmax, peak_a, amax)
+    return ok
+
+def test_power_short_move():
+    """A near-instant 3-axis move is stretched to fit the power budget instead of overflowing it"""
+    robot = AdvancedMultiServoController()
+    log.info("🧪 TESTING POWER BUDGET ON A VERY SHORT MOVE")
+    if robot.power is None:
+        log.warn("⚠️  POWER_BUDGET_MA is None: nothing to test")
+        return True
+    robot.power.reset_stats()
+    try:
+        moved = robot.coordinated_move({'y': 0, 'x': 180, 'z': 0}, duration=0.02)
+    except OverflowError as e:
+        log.error("❌ Budget check failed: %s", e)
+        return False
+    stats = robot.power.report()
+    ok = moved and stats['stretched_frames'] > 0 and stats['peak_ma'] <= stats['budget_ma']
+    log.info("🔋 Stretched by %d frames, peak %d of %d mA",
+             stats['stretched_frames'], stats['peak_ma'], stats['budget_ma'])
+    log.info("✅ Short move fits the budget" if ok else "❌ Short move not arbitrated")
+    return ok
+
+def test_blended_limits():
+    """Blended sequences with planned segments never step faster than the axis limit"""
+    robot = AdvancedMultiServoController()
+    log.info("🧪 TESTING BLENDED SEQUENCE SPEED LIMITS")
+    ok = True
+    for axis, sequence in (('y', [0, 180, 0]), ('y', [75, 130, 90]), ('x', [60, 130, 80]),
+                           ('z', [10, 20, 170, 160, 90])):
+        path = robot._fit_sequence(axis, sequence)
+        vmax = MultiServoConfig.AXIS_LIMITS[axis][0]
+        frame_s = path.frame_ms / 1000  # The timer rate while the drive runs
+        peak = max(abs(path.duty[i + 1] - path.duty[i]) for i in range(path.frames))
+        peak_v = peak / robot.ns_per_deg[axis] / frame_s
+        within = peak <= vmax * robot.ns_per_deg[axis] * frame_s + 1  # 1 ns of rounding
+        ok = ok and within
+        log.info("%s %s-axis %s: %.2fs, peak %.1f°/s (max %s)",
+                 '✅' if within else '❌', axis.upper(), sequence, path.duration(), peak_v, vmax)
+    return ok
+
+def _write_sweep_clip(path, seconds, frame_ms=20):
+    """Write a long clip of slow triangle sweeps, one record at a time"""
+    axes = list(MultiServoConfig.SERVO_PINS.keys())
+    pins = [MultiServoConfig.SERVO_PINS[axis] for axis in axes]
+    frames = int(seconds * 1000) // frame_ms + 1
+    period = 400  # Frames per sweep and back
+    record = bytearray(record_size(len(axes)))
+    with open(path, 'wb') as f:
+        f.write(pack_header(axes, pins, frame_ms, frames, 0, [], 5))
+        for n in range(frames):
+            phase = n % period
+            level = phase if phase < period // 2 else period - phase
+            for k in range(len(axes)):
+                duty = (1200000 + level * 3000 + k * 20000) >> 5
+                record[2 * k] = duty & 0xFF
+                record[2 * k + 1] = duty >> 8
+            record[2 * len(axes)] = 0xFF  # No LED data
+            record[2 * len(axes) + 1] = 0xFF
+            f.write(record)
+
+
+def test_clip_leds():
+    """A clip's LED frames are shown once each; NO_LED_CHANGE records leave the LEDs alone"""
+    import os
+    path = 'test_leds.clip'
+    robot = AdvancedMultiServoController()
+    log.info("🧪 TESTING CLIP LED RECORDS")
+    
+    axes = list(MultiServoConfig.SERVO_PINS.keys())
+    pins = [MultiServoConfig.SERVO_PINS[axis] for axis in axes]
+    num_leds = 2
+    led_table = [bytes((0, 255, 0)) * num_leds, bytes((255, 0, 0)) * num_leds]
+    # No-change records straight after each LED frame, and one before any
+    leds = [NO_LED_CHANGE, 0, NO_LED_CHANGE, NO_LED_CHANGE, 1, NO_LED_CHANGE, 1, 0, NO_LED_CHANGE]
+    record = bytearray(record_size(len(axes)))
+    with open(path, 'wb') as f:
+        f.write(pack_header(axes, pins, 20, len(leds), num_leds, led_table, 5))
+        for led in leds:
+            for k in range(len(axes)):
+                duty = robot.current_positions[axes[k]] >> 5
+                record[2 * k] = duty & 0xFF
+                record[2 * k + 1] = duty >> 8
+            record[2 * len(axes)] = led & 0xFF
+            record[2 * len(axes) + 1] = led >> 8
+            f.write(record)
+    
+    class RecordingStrip:
+        def __init__(self):
+            self.buf = bytearray(num_leds * 3)
+            self.shown = []
+        
+        def show(self):
+            self.shown.append(bytes(self.buf))
+        
+        def flush(self):
+            pass
+    
+    strip = RecordingStrip()
+    try:
+        clip = ClipPlayer(path)
+        clip.play(robot.servos, robot.servo_clock, strip, robot.output)
+        clip.close()
+    finally:
+        os.remove(path)
+    expected = [led_table[0], led_table[1], led_table[0]]
+    ok = strip.shown == expected
+    log.info("💡 %d LED frames shown for %d records (expected %d)", len(strip.shown), len(leds), len(expected))
+    log.info("✅ LED records played" if ok else "❌ LED frames wrong or missing")
+    return ok
+
+def test_led_clip_speed(seconds=2):
+    """The LED robot plays clips compiled at other frame periods at their own speed"""
+    import os
+    from pia.leds import CompleteRobotController
+    path = 'test_speed.clip'
+    robot = CompleteRobotController()
+    log.info("🧪 TESTING LED ROBOT CLIP SPEED")
+    ok = True
+    try:
+        for frame_ms in (10, 40):
+            _write_sweep_clip(path, seconds, frame_ms)
+            clip = ClipPlayer(path)
+            start = utime.ticks_ms()
+            robot.play_clip(clip)
+            elapsed = utime.ticks_diff(utime.ticks_ms(), start)
+            clip.close()
+            # A queued stream plays out a few frames after the last one is produced
+            within = abs(elapsed - seconds * 1000) <= seconds * 1000 // 10
+            ok = ok and within
+            log.info("%s %d ms clip of %ds played in %d ms",
+                     '✅' if within else '❌', frame_ms, seconds, elapsed)
+    finally:
+        os.remove(path)
+        robot.stop_timer_drive()
+    return ok
+
+def test_clip_memory(minutes=3):
+    """Heap use stays flat while streaming a multi-minute clip"""
+    import os
+    path = 'test_long.clip'
+    robot = AdvancedMultiServoController()
+    
+    log.info("🧪 TESTING CLIP STREAMING MEMORY (%s min clip)", minutes)
+    _write_sweep_clip(path, minutes * 60)
+    
+    try:
+        heap_in_use()  # Baseline (starts tracing on a PC)
+        clip = ClipPlayer(path)
+        # Preallocated so recording the samples doesn't grow the heap itself
+        samples = array('i', [0] * (clip.num_frames // 500 + 1))
+        task = clip.task(robot.servos, output=robot.output)
+        next(task)
+        
+        def stream():
+            count = 0
+            try:
+                for frame in robot.servo_clock.frames(clip.num_frames - 1):
+                    if frame % 500 == 0 and count < len(samples):
+                        samples[count] = heap_in_use()
+                        count += 1
+                    task.send(frame)
+            except StopIteration:
+                pass
+            log.default.frames_done()
+            return count
+        
+        count = without_sim_trace(stream)
+        clip.close()
+    finally:
+        os.remove(path)  # Also when playback fails: the clip would stay on the flash
+    
+    samples = samples[:count]
+    growth = max(samples) - min(samples)
+    as_list = clip.num_frames * len(clip.axes) * 4  # Same frames held as array('i')
+    log.info("📦 %d frames in %d chunk reads", clip.num_frames, clip.chunk_reads)
+    log.info("📦 Heap range while playing: %d bytes (in-RAM frames: %d bytes)", growth, as_list)
+    ok = growth < 1024
+    log.info("✅ RAM stays flat" if ok else "❌ Heap grows with clip length")
+    return ok
+
+def test_every_loop_on_timer():
+    """While the timer drive runs, every frame loop of both controllers writes through it"""
+    import os
+    from pia.leds import CompleteRobotController
+    path = 'test_timer.clip'
+    robot = AdvancedMultiServoController()
+    log.info("🧪 TESTING FRAME LOOPS ON THE TIMER DRIVE")
+    
+    def on_timer(label, robot, run):
+        drive = robot.drive
+        output = robot.output
+        ticks = drive.ticks
+        slots = output.writes + output.skipped
+        run()
+        ticks = drive.ticks - ticks
+        # A tick writes or skips every channel; a flush from the loop would add to one side only
+        ok = ticks > 0 and output.writes + output.skipped - slots == ticks * len(output.pwms) \
+            and output.sink is drive
+        log.info("%s %s: %d timer ticks", '✅' if ok else '❌', label, ticks)
+        return ok
+    
+    if robot.drive is None:
+        robot.start_timer_drive(MultiServoConfig.TIMER_HZ or 100)
+    _write_sweep_clip(path, 2)
+    try:
+        ok = on_timer("coordinated_move", robot, lambda: robot.coordinated_move({'y': 120}, 1.0))
+        ok = on_timer("y_axis_sequence", robot, robot.y_axis_sequence) and ok
+        ok = on_timer("full_robot_sequence", robot, robot.full_robot_sequence) and ok
+        ok = on_timer("play_clip", robot, lambda: robot.play_clip(path)) and ok
+    finally:
+        os.remove(path)
+        robot.stop_timer_drive()  # The LED robot drives the same pins
+    
+    leds_robot = CompleteRobotController()
+    if leds_robot.drive is None:
+        leds_robot.start_timer_drive()
+    try:
+        ok = on_timer("LED y_axis_sequence", leds_robot, leds_robot.y_axis_sequence) and ok
+        ok = on_timer("LED full_robot_sequence", leds_robot,
+                      lambda: leds_robot.full_robot_sequence(use_clip=False)) and ok
+    finally:
+        leds_robot.stop_timer_drive()
+    log.info("✅ All frame loops run on the timer" if ok else "❌ A frame loop bypasses the timer")
+    return ok
+
+def test_timer_drive(stall_ms=50, hz=100):
+    """Foreground stalls freeze the frame loop's servo updates but not the timer drive's"""
+    robot = AdvancedMultiServoController()
+    
+    log.info("🧪 TESTING TIMER-DRIVEN SERVO UPDATES")
+    output = robot.output
+    slot = output.axes.index('y')
+    times = array('i', [0] * 1024)
+    count = array('i', [0])
+    
+    class RecordingPwm:
+        # Runs inside the timer IRQ: array stores only
+        def __init__(self, pwm):
+            self.pwm = pwm
+        
+        def duty_ns(self, ns):
+            n = count[0]
+            if n < len(times):
+                times[n] = utime.ticks_us()
+                count[0] = n + 1
+            self.pwm.duty_ns(ns)
+    
+    plain_write = robot.kernel.write
+    frames = array('i', [0])
+    
+    def stalling_write(weight, carry=0):
+        plain_write(weight, carry)
+        frames[0] += 1
+        if frames[0] % 10 == 0:
+            utime.sleep_ms(stall_ms)  # Stands in for a blocking LED write or print
+    
+    def worst_gap(target_deg):
+        count[0] = 0
+        robot.coordinated_move({'y': target_deg}, duration=2.0)
+        n = count[0]
+        # Middle of the move: the eased ends may repeat a duty and skip writes
+        return max(utime.ticks_diff(times[i], times[i - 1]) for i in range(n // 10 + 1, n - n // 10))
+    
+    plain_pwm = output.pwms[slot]
+    output.pwms[slot] = RecordingPwm(plain_pwm)
+    robot.kernel.write = stalling_write
+    try:
+        robot.stop_timer_drive()
+        robot.coordinated_clock.set_interval(1000 // hz)
+        loop_gap = worst_gap(135)
+        robot.start_timer_drive(hz)
+        timer_gap = worst_gap(45)
+    finally:
+        robot.kernel.write = plain_write
+        output.pwms[slot] = plain_pwm
+        robot.coordinated_clock.set_interval(MultiServoConfig.COORDINATED_FRAME_MS)
+    interval = robot.drive.interval_us
+    robot.drive.print_report()
+    robot.stop_timer_drive()
+    
+    log.info("⏱️  Longest gap between Y updates with %d ms stalls: frame loop %d us, timer %d us (frame %d us)",
+             stall_ms, loop_gap, timer_gap, interval)
+    ok = timer_gap <= interval * 3 // 2
+    log.info("✅ Timer keeps the servos moving" if ok else "❌ Servo updates stall with the foreground")
+    return ok
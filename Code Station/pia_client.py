@@ -0,0 +1,422 @@
+# Host-side client for the robot's serial command protocol (runs on the PC).
+#
+#   python3 pia_client.py /dev/ttyACM0 query
+#   python3 pia_client.py /dev/ttyACM0 pose 90 80 90      # y x z degrees
+#   python3 pia_client.py /dev/ttyACM0 leds 255 0 0
+#   python3 pia_client.py /dev/ttyACM0 clip full_sequence.clip
+#   python3 pia_client.py /dev/ttyACM0 sweep [seconds] [hz]  # timestamped TRACK samples
+#   python3 pia_client.py /dev/ttyACM0 exit
+#   python3 pia_client.py --selftest                      # pty loopback, no board
+#
+# The board must be in remote mode (ServoConfig.REMOTE_CONTROL = True in
+# Final_code_Movement+LEDs.py). Uses pyserial when it is installed and a raw
+# POSIX tty otherwise. Packet format: serial_protocol.py.
+
+import math
+import os
+import select
+import struct
+import sys
+import time
+
+from serial_protocol import (PacketReader, encode, CMD_SET_POSE, CMD_TRACK, CMD_PLAY_CLIP,
+                             CMD_SET_LEDS, CMD_QUERY, CMD_EXIT, RSP_STATE, RSP_ERROR, POSE_AXES,
+                             POSE_FORMAT, TRACK_FORMAT, STATE_FORMAT, ERROR_FORMAT, FLAG_CLIP,
+                             FLAG_AT_TARGET, FLAG_TRACKING)
+
+ERROR_NAMES = {1: 'unknown command', 2: 'bad length', 3: 'clip not found', 4: 'clip does not start here'}
+
+
+# ==================== PORTS ====================
+class FdPort:
+    """Non-blocking byte port on a file descriptor (tty, pty)"""
+    def __init__(self, fd):
+        self.fd = fd
+        self._buf = b''
+        self._pos = 0
+
+    def read_byte(self):
+        if self._pos >= len(self._buf):
+            if not select.select([self.fd], [], [], 0)[0]:
+                return -1
+            self._buf = os.read(self.fd, 4096)
+            self._pos = 0
+            if not self._buf:
+                return -1
+        byte = self._buf[self._pos]
+        self._pos += 1
+        return byte
+
+    def wait(self, timeout):
+        if self._pos < len(self._buf):
+            return True
+        return bool(select.select([self.fd], [], [], timeout)[0])
+
+    def write(self, data):
+        os.write(self.fd, bytes(data))
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PySerialPort:
+    """Byte port on a pyserial Serial object"""
+    def __init__(self, serial_port):
+        self.serial = serial_port
+        self._buf = b''
+        self._pos = 0
+
+    def read_byte(self):
+        if self._pos >= len(self._buf):
+            waiting = self.serial.in_waiting
+            if not waiting:
+                return -1
+            self._buf = self.serial.read(waiting)
+            self._pos = 0
+        byte = self._buf[self._pos]
+        self._pos += 1
+        return byte
+
+    def wait(self, timeout):
+        deadline = time.monotonic() + timeout
+        while self._pos >= len(self._buf) and not self.serial.in_waiting:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.0005)
+        return True
+
+    def write(self, data):
+        self.serial.write(bytes(data))
+
+    def close(self):
+        self.serial.close()
+
+
+def open_port(device, baudrate=115200):
+    """Open device with pyserial, or as a raw POSIX tty without it"""
+    try:
+        import serial
+    except ImportError:
+        serial = None
+    if serial is not None:
+        return PySerialPort(serial.Serial(device, baudrate, timeout=0))
+    import tty
+    fd = os.open(device, os.O_RDWR | os.O_NOCTTY)
+    tty.setraw(fd)
+    return FdPort(fd)
+
+
+# ==================== CLIENT ====================
+def _pose_values(y, x, z):
+    """(axis mask, centidegree values) for degrees given per axis or None"""
+    mask = 0
+    values = []
+    for bit, degrees in enumerate((y, x, z)):
+        if degrees is None:
+            values.append(0)
+        else:
+            mask |= 1 << bit
+            values.append(max(0, min(18000, int(round(degrees * 100)))))
+    return mask, values
+
+
+class PiaClient:
+    def __init__(self, port):
+        self.port = port
+        self.reader = PacketReader()
+        self.seq = 0
+        self.errors = []  # (cmd, code) from ERROR replies
+
+    def send(self, cmd, payload=b''):
+        self.port.write(encode(cmd, payload))
+
+    def set_pose(self, y=None, x=None, z=None):
+        """Send pose targets in degrees (None = leave that axis alone); returns the seq"""
+        self.seq = (self.seq + 1) & 0xFFFF
+        mask, values = _pose_values(y, x, z)
+        self.send(CMD_SET_POSE, struct.pack(POSE_FORMAT, self.seq, mask, *values))
+        return self.seq
+
+    def track(self, y=None, x=None, z=None, t_us=None):
+        """
+        Send a timestamped tracking sample (degrees); t_us = when the target
+        was observed on this PC's clock (default: now). Returns the seq
+        """
+        if t_us is None:
+            t_us = time.monotonic_ns() // 1000
+        self.seq = (self.seq + 1) & 0xFFFF
+        mask, values = _pose_values(y, x, z)
+        self.send(CMD_TRACK, struct.pack(TRACK_FORMAT, self.seq, t_us & 0xFFFFFFFF, mask, *values))
+        return self.seq
+
+    def set_leds(self, color=None, frame=None):
+        """Fill with color (r, g, b) or show a raw GRB frame (bytes)"""
+        self.send(CMD_SET_LEDS, bytes(color) if frame is None else bytes(frame))
+
+    def play_clip(self, path):
+        self.send(CMD_PLAY_CLIP, path.encode())
+
+    def exit(self):
+        self.send(CMD_EXIT)
+
+    def receive(self, timeout=0.0):
+        """Next (cmd, payload) from the robot, or None after timeout seconds"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.reader.poll(self.port, budget=4096):
+                packet = (self.reader.cmd, bytes(self.reader.payload[:self.reader.length]))
+                if packet[0] == RSP_ERROR:
+                    self.errors.append(struct.unpack(ERROR_FORMAT, packet[1]))
+                return packet
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return None
+            self.port.wait(left)
+
+    def read_state(self, timeout=0.0):
+        """Wait for the next STATE reply and decode it (None on timeout)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            packet = self.receive(max(0.0, deadline - time.monotonic()))
+            if packet is None:
+                return None
+            if packet[0] == RSP_STATE:
+                return decode_state(packet[1])
+
+    def query(self, timeout=0.5):
+        self.send(CMD_QUERY)
+        return self.read_state(timeout)
+
+
+def decode_state(payload):
+    seq, y, x, z, frame, packets, errors, flags, latency = struct.unpack(STATE_FORMAT, payload)
+    return {
+        'seq': seq,
+        'degrees': {'y': y / 100, 'x': x / 100, 'z': z / 100},
+        'frame': frame,
+        'packets': packets,
+        'errors': errors,
+        'clip': bool(flags & FLAG_CLIP),
+        'at_target': bool(flags & FLAG_AT_TARGET),
+        'tracking': bool(flags & FLAG_TRACKING),
+        'latency_us': latency,
+    }
+
+
+def print_state(state):
+    if state is None:
+        print("⚠️  No reply from the robot")
+        return
+    angles = "  ".join(f"{axis}={state['degrees'][axis]:.2f}°" for axis in POSE_AXES)
+    print(f"🤖 {angles}  frame {state['frame']}  seq {state['seq']}  "
+          f"packets {state['packets']}  errors {state['errors']}"
+          f"  latency {state['latency_us'] / 1000:.1f}ms"
+          f"{'  [clip]' if state['clip'] else ''}{'  [tracking]' if state['tracking'] else ''}"
+          f"{'  [at target]' if state['at_target'] else ''}")
+
+
+def sweep(client, seconds=5.0, rate_hz=50.0, amplitude=30.0):
+    """Stream a sine on every axis as TRACK samples at rate_hz, then report the final state"""
+    period = 1.0 / rate_hz
+    start = time.monotonic()
+    sent = 0
+    while True:
+        t = time.monotonic() - start
+        if t >= seconds:
+            break
+        offset = amplitude * math.sin(2 * math.pi * 0.5 * t)
+        client.track(90 + offset, 80 + offset / 2, 90 - offset)
+        sent += 1
+        time.sleep(max(0.0, start + sent * period - time.monotonic()))
+    print(f"📡 Sent {sent} poses in {seconds:.1f}s ({sent / seconds:.0f} Hz)")
+    print_state(client.query())
+
+
+# ==================== PTY LOOPBACK SELF-TEST ====================
+HOST_CLOCK_OFFSET_US = 5000000  # The simulated PC clock is not the robot's
+
+
+def _second_difference(values):
+    """Largest frame-to-frame change in velocity (same units as values)"""
+    return max(abs(c - 2 * b + a) for a, b, c in zip(values, values[1:], values[2:]))
+
+
+def selftest(seconds=4.0, rate_hz=50.0, max_jitter_ms=30):
+    """
+    Run the real robot controller on simulated hardware behind a pty and
+    drive it through the client:
+      1. SET_POSE streaming at rate_hz, LEDs, queries, bad packets
+      2. the same stream with random send jitter, as direct poses
+      3. the same jittered stream as timestamped TRACK samples
+    """
+    import random
+    import tty
+    import sim_hardware
+    from calibration import get_profile
+
+    master, slave = os.openpty()
+    tty.setraw(master)
+    tty.setraw(slave)
+    sim = sim_hardware.install()
+    import pia.leds
+    from pia.config import ServoConfig
+    robot = pia.leds.CompleteRobotController()
+    client = PiaClient(FdPort(master))
+    profile = get_profile(ServoConfig.SERVO_PROFILES['y'])
+
+    frame_ms = ServoConfig.REMOTE_FRAME_MS
+    delay_us = ServoConfig.TRACK_DELAY_MS * 1000
+    period_ms = int(1000 / rate_hz)
+    send_every = max(1, period_ms // frame_ms)
+    total = int(seconds * 1000) // frame_ms
+    jitter_start = total + 20
+    track_start = jitter_start + total + 20
+    finish = track_start + total + 20
+
+    def sine(t_ms):
+        return 90 + 30 * math.sin(2 * math.pi * 0.5 * t_ms / 1000)
+
+    # Jittered schedule shared by phases 2 and 3: send frame -> [sample times]
+    rng = random.Random(1)
+    jitters = [rng.uniform(0, max_jitter_ms) for _ in range(int(seconds * rate_hz))]
+    schedules = {}
+    for start in (jitter_start, track_start):
+        for k, jitter in enumerate(jitters):
+            t_ms = start * frame_ms + k * period_ms
+            schedules.setdefault(start + math.ceil((k * period_ms + jitter) / frame_ms), []).append(t_ms)
+
+    targets = {}     # frame a pose was sent on -> target ns for y
+    followed = {}    # frame a pose was sent on -> frames until the servo was there
+    paths = {'direct': [], 'tracked': []}
+    track_errors = []
+    states = []
+    queries = []
+    checks = {}
+
+    def host():
+        """Engine frame hook standing in for the PC"""
+        n = robot.engine.frame
+        y_ns = robot.current_positions['y']
+        for sent_at, target in targets.items():
+            if sent_at not in followed and y_ns == target:
+                followed[sent_at] = n - sent_at
+        packet = client.receive()
+        while packet is not None:
+            if packet[0] == RSP_STATE:
+                states.append(decode_state(packet[1]))
+            packet = client.receive()
+
+        y_deg = profile.ns_to_centi(y_ns) / 100
+        if jitter_start + 10 <= n < track_start - 20:
+            paths['direct'].append(y_deg)
+        elif track_start + 10 <= n < finish - 20:
+            paths['tracked'].append(y_deg)
+            tracker = robot.tracker
+            drive = robot.drive
+            # The pose just queued reaches the servos at the timer's next free tick
+            written_us = sim.clock.now() if drive is None else \
+                drive.tick_at_us + drive.ring.count() * drive.tick_us
+            playout_ms = (written_us - tracker.offset - HOST_CLOCK_OFFSET_US - delay_us) / 1000
+            track_errors.append(abs(y_deg - sine(playout_ms)))
+
+        if n < total and n % send_every == 0:
+            y = sine(n * frame_ms)
+            client.set_pose(y=y, x=80, z=90)
+            targets[n] = profile.centi_to_ns(int(round(y * 100)))
+        for t_ms in schedules.get(n, ()):
+            if n < track_start:
+                client.set_pose(y=sine(t_ms), x=80, z=90)
+            else:
+                client.track(y=sine(t_ms), x=80, z=90, t_us=t_ms * 1000 + HOST_CLOCK_OFFSET_US)
+
+        if n == 50:
+            client.set_leds(color=(255, 0, 0))
+        elif n == 51:
+            checks['leds'] = bytes(pia.leds.leds.buf[:3]) == bytes((0, 255, 0))  # GRB
+            client.port.write(b'\x00garbage\xa5\x01\x09' + bytes(9) + b'\x00')  # Bad checksum
+            client.play_clip('missing.clip')
+        elif n % 100 == 0:
+            client.send(CMD_QUERY)
+            queries.append(n)
+        elif n == finish:
+            client.exit()
+
+    robot.engine.frame_hooks.append(host)
+    started = time.perf_counter()
+    robot.serve_commands(FdPort(slave))
+    real_s = time.perf_counter() - started
+    os.close(master)
+    os.close(slave)
+
+    latencies = sorted(followed.values())
+    state = states[-1] if states else None
+    stats = robot.latency.stats(0)
+    direct_jerk = _second_difference(paths['direct'])
+    tracked_jerk = _second_difference(paths['tracked'])
+    checks['poses followed'] = len(followed) == len(targets)
+    checks['latency <= 1 frame'] = bool(latencies) and latencies[-1] <= 1
+    checks['queries answered'] = len(states) == len(queries)
+    checks['bad packet counted'] = state is not None and state['errors'] == 1
+    checks['clip error reported'] = client.errors == [(CMD_PLAY_CLIP, 3)]
+    checks['tracking error < 0.5°'] = max(track_errors) < 0.5
+    checks['tracking smoother than direct'] = tracked_jerk < direct_jerk / 2
+    checks['tracking latency within delay + frame'] = (
+        stats is not None and stats[3] <= delay_us + frame_ms * 1000)
+
+    print("\n" + "="*60)
+    print("🔌 SERIAL LOOPBACK SELF-TEST")
+    print("="*60)
+    print(f"Robot time {sim.clock.now() / 1000000:.2f}s in {real_s * 1000:.0f}ms real, "
+          f"frame {frame_ms} ms, samples at {rate_hz:.0f} Hz")
+    if latencies:
+        print(f"SET_POSE → servo: {latencies[0] * frame_ms}..{latencies[-1] * frame_ms} ms")
+    print(f"Jittered stream (0..{max_jitter_ms} ms): max Δvelocity direct {direct_jerk:.2f}°/frame², "
+          f"tracked {tracked_jerk:.2f}°/frame²")
+    if stats is not None:
+        print(f"TRACK arrival → PWM: min {stats[1] / 1000:.1f} / avg {stats[2] / 1000:.1f} / "
+              f"max {stats[3] / 1000:.1f} ms (jitter buffer {delay_us // 1000} ms), "
+              f"max error {max(track_errors):.3f}°")
+    print(f"Tracker: {robot.tracker.report()}")
+    print_state(state)
+    for name, ok in checks.items():
+        print(f"  {'✅' if ok else '❌'} {name}")
+    print("="*60)
+    sim_hardware.uninstall()
+    return all(checks.values())
+
+
+# ==================== COMMAND LINE ====================
+def main(argv):
+    if len(argv) > 1 and argv[1] == '--selftest':
+        return 0 if selftest() else 1
+    if len(argv) < 3:
+        print("usage: python3 pia_client.py DEVICE query|pose|leds|clip|sweep|exit ...")
+        print("       python3 pia_client.py --selftest")
+        return 1
+    client = PiaClient(open_port(argv[1]))
+    command, args = argv[2], argv[3:]
+    if command == 'query':
+        print_state(client.query())
+    elif command == 'pose':
+        client.set_pose(*[float(a) for a in args])
+    elif command == 'leds':
+        client.set_leds(color=[int(a) for a in args])
+    elif command == 'clip':
+        client.play_clip(args[0])
+        time.sleep(0.1)
+        client.receive(0.1)
+        for cmd, code in client.errors:
+            print(f"⚠️  {ERROR_NAMES.get(code, code)}")
+    elif command == 'sweep':
+        sweep(client, *[float(a) for a in args])
+    elif command == 'exit':
+        client.exit()
+    else:
+        print(f"unknown command: {command}")
+        return 1
+    client.port.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
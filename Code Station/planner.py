@@ -0,0 +1,119 @@
+import math
+from easing import CURVES, get_table, register_curve
+
+# ==================== TRAJECTORY PLANNER ====================
+# Works out how long a move has to take from per-axis limits instead of
+# using one fixed duration: max velocity (°/s) and max acceleration (°/s²).
+#
+# Both profiles accelerate for ramp * T, optionally cruise, then decelerate
+# for ramp * T:
+#   trapezoid - constant acceleration (peak accel = mean accel of the ramp)
+#   s_curve   - cosine velocity ramp, so acceleration itself starts and ends
+#               at zero (peak accel = pi/2 x mean accel)
+# A short move never reaches max velocity and has no cruise (ramp = 0.5).
+#
+# The normalized position curve only depends on the shape and the ramp
+# fraction, so the ramp is rounded up to 1/(2 x RAMP_STEPS) and each curve is
+# registered as a regular easing table (built once, shared via get_table).
+
+RAMP_STEPS = 32
+SHAPES = {
+    'trapezoid': 1.0,
+    's_curve': math.pi / 2,
+}
+
+
+def _trapezoid(ramp):
+    peak = 1.0 / (1.0 - ramp)  # Cruise velocity for a unit move in unit time
+
+    def curve(t):
+        if t > 0.5:
+            return 1.0 - curve(1.0 - t)
+        if t < ramp:
+            return peak * t * t / (2 * ramp)
+        return peak * (t - ramp / 2)
+    return curve
+
+
+def _s_curve(ramp):
+    peak = 1.0 / (1.0 - ramp)
+
+    def curve(t):
+        if t > 0.5:
+            return 1.0 - curve(1.0 - t)
+        if t < ramp:
+            return peak / 2 * (t - ramp / math.pi * math.sin(math.pi * t / ramp))
+        return peak * (t - ramp / 2)
+    return curve
+
+
+_BUILDERS = {'trapezoid': _trapezoid, 's_curve': _s_curve}
+
+
+def profile_curve(shape, ramp_index):
+    """Easing curve name for shape with ramp = ramp_index / (2 x RAMP_STEPS)"""
+    name = "%s_%d" % (shape, ramp_index)
+    if name not in CURVES:
+        register_curve(name, _BUILDERS[shape](ramp_index / (2 * RAMP_STEPS)))
+    return name
+
+
+def min_duration(distance, vmax, amax, shape='s_curve'):
+    """(seconds, ramp fraction) of the fastest move over distance degrees"""
+    k = SHAPES[shape]
+    ramp_time = k * vmax / amax
+    if distance >= vmax * ramp_time:
+        duration = distance / vmax + ramp_time
+        return duration, ramp_time / duration
+    # Triangle: decelerate before reaching vmax
+    peak = math.sqrt(distance * amax / k)
+    return 2 * k * peak / amax, 0.5
+
+
+def duration_at(distance, vmax, amax, ramp, shape='s_curve'):
+    """Shortest duration for distance with a fixed ramp fraction"""
+    k = SHAPES[shape]
+    by_velocity = distance / (vmax * (1.0 - ramp))
+    by_accel = math.sqrt(k * distance / (amax * ramp * (1.0 - ramp)))
+    return max(by_velocity, by_accel)
+
+
+class MovePlan:
+    def __init__(self, duration, curve):
+        self.duration = duration
+        self.curve = curve
+
+    def frames(self, frame_ms):
+        """Frames covering the plan, rounded up so no limit is exceeded"""
+        frame_us = int(frame_ms * 1000)
+        return max(1, -(-int(self.duration * 1000000) // frame_us))
+
+    def table(self):
+        return get_table(self.curve)
+
+
+def plan_move(axes, shape='s_curve'):
+    """
+    Time-optimal synchronized move
+    axes: [(distance_deg, vmax, amax), ...] - every axis starts and ends
+    together on one shared profile, set by the most limiting axis
+    Returns None when nothing has to move
+    """
+    slowest = 0.0
+    ramp = 0.5
+    for distance, vmax, amax in axes:
+        if distance > 0:
+            duration, axis_ramp = min_duration(distance, vmax, amax, shape)
+            if duration > slowest:
+                slowest = duration
+                ramp = axis_ramp
+    if slowest == 0.0:
+        return None
+
+    ramp_index = max(1, min(RAMP_STEPS, math.ceil(ramp * 2 * RAMP_STEPS)))
+    ramp = ramp_index / (2 * RAMP_STEPS)
+    duration = 0.0
+    for distance, vmax, amax in axes:
+        if distance > 0:
+            duration = max(duration, duration_at(distance, vmax, amax, ramp, shape))
+    return MovePlan(duration, profile_curve(shape, ramp_index))
@@ -0,0 +1,169 @@
+from array import array
+from easing import Q16_ONE
+import log
+
+# ==================== SERVO POWER BUDGET ====================
+# On USB 5 V the servos brown the Pico out when several of them accelerate at
+# once (the old scripts slept 0.3 s "for power recovery" between axes). Here
+# each move's current is estimated frame by frame from its commanded motion
+#
+#     I = IDLE_MA + MA_PER_DEG_S * |velocity| + MA_PER_DEG_S2 * |acceleration|
+#
+# and concurrent moves are arbitrated so the sum never exceeds the budget:
+#   timelines          - segments are staggered (delayed) until they fit
+#   coordinated moves  - the shared profile is stretched until it fits
+# Nothing waits when the moves fit anyway, so no time goes to blind sleeps.
+#
+# The coefficients are rough figures for DF9GMS micro servos (~300 mA
+# no-load at full speed); measure with a USB meter and adjust.
+
+SUPPLY_MA = 500           # USB 2.0 port
+RESERVE_MA = 150          # Pico, LEDs and margin
+SERVO_BUDGET_MA = SUPPLY_MA - RESERVE_MA
+
+IDLE_MA = 15              # Per servo, holding position
+MA_PER_DEG_S = 0.5
+MA_PER_DEG_S2 = 0.1
+
+STAGGER_STEP_MS = 50      # Granularity of the delay given to a segment
+STRETCH = 9 / 8           # Duration growth per stretch attempt
+
+
+def motion_current(distance_deg, frames, frame_s, easing):
+    """
+    Estimated current above idle (mA) in frames 0..frames of a move of
+    distance_deg degrees on an easing table, from central differences of the
+    weights actually played on the frame grid
+    """
+    distance = abs(distance_deg)
+    speed_scale = MA_PER_DEG_S * distance / (2 * frame_s * Q16_ONE)
+    accel_scale = MA_PER_DEG_S2 * distance / (frame_s * frame_s * Q16_ONE)
+    profile = array('H', [0] * (frames + 1))
+    before = 0
+    here = 0
+    for i in range(frames + 1):
+        after = easing.sample(i + 1, frames)
+        ma = speed_scale * abs(after - before) + accel_scale * abs(after - 2 * here + before)
+        profile[i] = min(65535, int(ma + 0.999))  # Round up: this is a limit
+        before = here
+        here = after
+    return profile
+
+
+class PowerBudget:
+    def __init__(self, budget_ma=SERVO_BUDGET_MA, servos=3):
+        """budget_ma: supply current the servos may use together"""
+        self.budget_ma = budget_ma
+        self.servos = servos
+        self.headroom = budget_ma - servos * IDLE_MA  # Left for motion
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.staggered_frames = 0  # Delay added to timeline segments
+        self.stretched_frames = 0  # Time added to coordinated moves
+        self.peak_ma = 0           # Highest estimated draw arbitrated so far
+
+    def _record_peak(self, load):
+        peak = self.servos * IDLE_MA + (max(load) if len(load) else 0)
+        if peak > self.peak_ma:
+            self.peak_ma = peak
+        return peak
+
+    def fit_frames(self, distances, frames, frame_s, easing):
+        """
+        Frames for a synchronized move (every axis on one shared profile) whose
+        summed draw fits the budget; distances: degrees per axis
+        """
+        while True:
+            load = array('i', [0] * (frames + 1))  # Summed profiles pass 65535 on short moves
+            for distance in distances:
+                if distance:
+                    profile = motion_current(distance, frames, frame_s, easing)
+                    for i in range(frames + 1):
+                        load[i] += profile[i]
+            if max(load) <= self.headroom:
+                break
+            stretched = int(frames * STRETCH) + 1
+            self.stretched_frames += stretched - frames
+            frames = stretched
+        self._record_peak(load)
+        return frames
+
+    def _fits(self, load, start, profile):
+        headroom = self.headroom
+        end = len(load)
+        for i in range(len(profile)):
+            frame = start + i
+            if frame >= end:
+                return True
+            if load[frame] + profile[i] > headroom:
+                return False
+        return True
+
+    def timeline_load(self, timeline, easing, ns_per_deg, stagger=False):
+        """
+        Estimated draw above idle per frame of timeline (array of mA)
+        stagger=True delays segments (and everything after them on the same
+        axis) until the summed draw fits the budget
+        ns_per_deg: {axis: duty ns per degree}
+        """
+        frame_s = timeline.frame_ms / 1000
+        step = max(1, STAGGER_STEP_MS // timeline.frame_ms)
+        segments = []
+        for axis, track in timeline.tracks.items():
+            for segment in track:
+                segments.append((segment[0], axis, segment))
+        segments.sort(key=lambda entry: entry[0])
+
+        load = []
+        delays = {axis: 0 for axis in timeline.tracks}
+        ends = {axis: 0 for axis in timeline.tracks}
+        for planned, axis, segment in segments:
+            start, end, start_ns, target_ns = segment
+            frames = end - start
+            distance = (target_ns - start_ns) / ns_per_deg[axis]
+            profile = motion_current(distance, frames, frame_s, easing)
+            if stagger:
+                if max(profile) > self.headroom:
+                    # Too much on its own: stretch the segment as well
+                    frames = self.fit_frames([distance], frames, frame_s, easing)
+                    profile = motion_current(distance, frames, frame_s, easing)
+                start = max(start + delays[axis], ends[axis])
+                while not self._fits(load, start, profile):
+                    start += step
+                self.staggered_frames += start - segment[0] - delays[axis]
+                delays[axis] = start - segment[0]
+                segment[0] = start
+                segment[1] = start + frames
+                ends[axis] = start + frames
+            if len(load) < start + frames + 1:
+                load.extend([0] * (start + frames + 1 - len(load)))
+            for i in range(frames + 1):
+                load[start + i] += profile[i]
+
+        if stagger:
+            timeline.total_frames = max(track[-1][1] for track in timeline.tracks.values())
+        load = array('i', load)
+        self._record_peak(load)
+        return load
+
+    def stagger(self, timeline, easing, ns_per_deg):
+        """Delay timeline segments until the summed draw fits; returns the frames added"""
+        before = timeline.total_frames
+        self.timeline_load(timeline, easing, ns_per_deg, stagger=True)
+        return timeline.total_frames - before
+
+    def report(self):
+        """Return arbitration statistics as a dict"""
+        return {
+            'budget_ma': self.budget_ma,
+            'peak_ma': self.peak_ma,
+            'staggered_frames': self.staggered_frames,
+            'stretched_frames': self.stretched_frames,
+        }
+
+    def print_report(self, label="Power budget"):
+        stats = self.report()
+        log.info("🔋 %s: peak %d of %d mA, %d frames staggered, %d stretched",
+                 label, stats['peak_ma'], stats['budget_ma'],
+                 stats['staggered_frames'], stats['stretched_frames'])
@@ -0,0 +1,152 @@
+# Power budget benchmark: one cycle of the y/x/z keyframe sequences on the
+# simulated hardware (sim_hardware.py), three ways:
+#
+#   fixed delays  - one axis after another with the old 0.3 s "power
+#                   recovery" sleeps (XYZ movement with deepseek.py)
+#   all at once   - every axis together, no power arbitration
+#   power budget  - every axis together, staggered by power.PowerBudget
+#
+#   python3 power_benchmark.py [results.json]
+#
+# The current is estimated from the PWM trace itself (same model as
+# power.py), so the peak shows what actually went out, not what was planned.
+
+import json
+import sys
+
+import sim_hardware
+
+sim_hardware.install()  # power.py logs through the (fake) utime clock
+from power import IDLE_MA, MA_PER_DEG_S, MA_PER_DEG_S2, SERVO_BUDGET_MA
+
+TRACKS = {                 # Keyframes of XYZ movement with deepseek.py
+    'y': [80, 120, 90],
+    'x': [65, 110, 80],
+    'z': [70, 110, 90],
+}
+HOLD_S = 1.0               # Pause after every keyframe
+RECOVERY_S = 0.3           # Blind power recovery delay between axes
+SEGMENT_SECONDS = (3.0, 0.4)
+
+
+# ==================== VARIANTS ====================
+def run_fixed_delays(robot, utime, segment_s):
+    robot.power = None
+    for i, axis in enumerate(('y', 'x', 'z')):
+        if i:
+            utime.sleep(RECOVERY_S)
+        robot.play_sequences({axis: TRACKS[axis]}, segment_s, overlap=0.0, hold=HOLD_S)
+        utime.sleep(HOLD_S)
+
+
+def run_all_at_once(robot, utime, segment_s):
+    robot.power = None
+    robot.play_sequences(TRACKS, segment_s, overlap=1.0, hold=HOLD_S)
+    utime.sleep(HOLD_S)
+
+
+def run_power_budget(robot, utime, segment_s):
+    robot.play_sequences(TRACKS, segment_s, overlap=1.0, hold=HOLD_S)
+    utime.sleep(HOLD_S)
+
+
+VARIANTS = {
+    'fixed delays': run_fixed_delays,
+    'all at once': run_all_at_once,
+    'power budget': run_power_budget,
+}
+
+
+# ==================== MEASUREMENT ====================
+def trace_current(sim, pins, frame_us):
+    """Estimated total servo current (mA) per frame, from the recorded duty writes"""
+    writes = sim.trace.pwm_writes
+    start = min(t for t, pin, kind, value in writes)
+    end = max(t for t, pin, kind, value in writes)
+    frames = (end - start) // frame_us + 3
+    dt = frame_us / 1000000
+    total = [len(pins) * IDLE_MA] * frames
+    for pin, ns_per_deg in pins.items():
+        # Step-hold the writes onto the frame grid (unchanged values are skipped)
+        grid = [None] * frames
+        for t, p, kind, value in writes:
+            if p == pin:
+                grid[(t - start) // frame_us] = value
+        held = sim.pwms[pin].duty_ns() if grid[0] is None else grid[0]
+        for i in range(frames):
+            if grid[i] is None:
+                grid[i] = held
+            held = grid[i]
+        degrees = [value / ns_per_deg for value in grid]
+        for i in range(1, frames - 1):
+            speed = (degrees[i + 1] - degrees[i - 1]) / (2 * dt)
+            accel = (degrees[i + 1] - 2 * degrees[i] + degrees[i - 1]) / (dt * dt)
+            total[i] += MA_PER_DEG_S * abs(speed) + MA_PER_DEG_S2 * abs(accel)
+    return total
+
+
+def measure(variant, runner, segment_s):
+    sim = sim_hardware.install()
+    real_stdout = sys.stdout
+    sys.stdout = _NullWriter()
+    try:
+        import utime
+        from pia.config import MultiServoConfig
+        from pia.motion import AdvancedMultiServoController
+        robot = AdvancedMultiServoController()
+        sim.start_measuring()
+        started = sim.clock.now()
+        runner(robot, utime, segment_s)
+        cycle_us = sim.clock.now() - started
+    finally:
+        sys.stdout = real_stdout
+
+    pins = {MultiServoConfig.SERVO_PINS[axis]: robot.ns_per_deg[axis] for axis in TRACKS}
+    current = trace_current(sim, pins, robot.coordinated_clock.interval_us)
+    return {
+        'segment_s': segment_s,
+        'variant': variant,
+        'cycle_s': round(cycle_us / 1000000, 2),
+        'peak_ma': int(max(current)),
+        'budget_ma': SERVO_BUDGET_MA,
+    }
+
+
+class _NullWriter:
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def run(path='power_benchmark.json'):
+    results = []
+    for segment_s in SEGMENT_SECONDS:
+        for variant, runner in VARIANTS.items():
+            results.append(measure(variant, runner, segment_s))
+    sim_hardware.uninstall()
+
+    print("=" * 72)
+    print(f"🔋 POWER BUDGET BENCHMARK (budget {SERVO_BUDGET_MA} mA)")
+    print("=" * 72)
+    print(f"{'moves':>7}  {'variant':<16}{'cycle s':>9}{'saved s':>9}{'peak mA':>9}  within")
+    baseline = {}
+    for r in results:
+        if r['variant'] == 'fixed delays':
+            baseline[r['segment_s']] = r['cycle_s']
+        r['saved_s'] = round(baseline[r['segment_s']] - r['cycle_s'], 2)
+        within = '✅' if r['peak_ma'] <= r['budget_ma'] else '❌'
+        print(f"{r['segment_s']:>6}s  {r['variant']:<16}{r['cycle_s']:>9}{r['saved_s']:>9}"
+              f"{r['peak_ma']:>9}  {within}")
+    print("=" * 72)
+
+    if path:
+        with open(path, 'w') as f:
+            json.dump({'budget_ma': SERVO_BUDGET_MA, 'results': results}, f, indent=2)
+        print(f"📝 Results written to {path}")
+    return results
+
+
+if __name__ == "__main__":
+    run(sys.argv[1] if len(sys.argv) > 1 else 'power_benchmark.json')
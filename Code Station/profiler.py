@@ -0,0 +1,88 @@
+import utime
+from array import array
+import log
+
+# ==================== HOT-PATH PROFILER ====================
+# Per-phase timings (µs) go into fixed-size ring buffers allocated up front,
+# so recording is a couple of ticks_us() calls and array stores - no heap
+# allocation, cheap enough to leave on. Phases are small int ids (index into
+# the names tuple) so the hot path never builds or hashes strings.
+#
+#     t = prof.now()
+#     weight = easing.sample(i, total)
+#     t = prof.end(EASING, t)        # records and returns the new mark
+#     ...
+#     prof.dump()                    # min/avg/max/p99 per phase
+#
+# Statistics cover the last RING_SIZE samples of each phase; the count and
+# worst-ever value cover everything since reset().
+
+RING_SIZE = 128
+
+# Standard phases used by the controllers
+EASING = 0      # Easing weight / timeline sampling
+CONVERT = 1     # Interpolation to duty_ns
+PWM = 2         # PWM output flush
+LED = 3         # LED frame hand-off
+SLACK = 4       # Idle time slept waiting for the frame deadline
+PHASE_NAMES = ('easing', 'convert', 'pwm', 'led', 'slack')
+
+
+class Profiler:
+    def __init__(self, names=PHASE_NAMES, size=RING_SIZE, enabled=True):
+        self.names = names
+        self.size = size
+        self.enabled = enabled
+        self.rings = [array('i', [0] * size) for _ in names]
+        self.positions = array('i', [0] * len(names))
+        self.counts = array('i', [0] * len(names))
+        self.worst = array('i', [0] * len(names))
+
+    def reset(self):
+        for phase in range(len(self.names)):
+            self.positions[phase] = 0
+            self.counts[phase] = 0
+            self.worst[phase] = 0
+
+    def now(self):
+        return utime.ticks_us()
+
+    def record(self, phase, us):
+        """Store one sample for phase"""
+        if not self.enabled:
+            return
+        pos = self.positions[phase]
+        self.rings[phase][pos] = us
+        pos += 1
+        self.positions[phase] = pos if pos < self.size else 0
+        self.counts[phase] += 1
+        if us > self.worst[phase]:
+            self.worst[phase] = us
+
+    def end(self, phase, since):
+        """Record the time since `since` for phase; returns the new mark"""
+        now = utime.ticks_us()
+        self.record(phase, utime.ticks_diff(now, since))
+        return now
+
+    def stats(self, phase):
+        """(samples, min, avg, max, p99, worst ever) for phase, or None"""
+        count = self.counts[phase]
+        if not count:
+            return None
+        held = min(count, self.size)
+        values = sorted(self.rings[phase][:held])
+        p99 = values[min(held - 1, held * 99 // 100)]
+        return (count, values[0], sum(values) // held, values[-1], p99, self.worst[phase])
+
+    def dump(self, label="Profile"):
+        if not sum(self.counts):
+            return
+        log.info("🔬 %s (last %d samples per phase, µs)", label, self.size)
+        log.info("   %-10s%8s%8s%8s%8s%8s%8s", 'phase', 'count', 'min', 'avg', 'max', 'p99', 'worst')
+        for phase, name in enumerate(self.names):
+            stats = self.stats(phase)
+            if stats is None:
+                continue
+            count, low, avg, high, p99, worst = stats
+            log.info("   %-10s%8d%8d%8d%8d%8d%8d", name, count, low, avg, high, p99, worst)
@@ -0,0 +1,80 @@
+from array import array
+import log
+
+# ==================== BATCHED PWM OUTPUT ====================
+# Servo code writes to PwmChannel objects, which only record the value for
+# the current frame. PwmOutput.flush() runs once at the frame boundary and
+# pushes every channel together, skipping channels whose value is the same as
+# the one already in the PWM slice (common near the ends of an ease, and for
+# axes that are holding still during a coordinated move).
+#
+# Every duty write must go through the channels: a direct PWM.duty_ns() call
+# would leave the cached value stale and a later identical write would be
+# skipped. While a sink is attached (servo_timer.TimerDrive streaming),
+# flush() hands the staged values to it instead of writing the PWM slices.
+
+NOT_SET = -1
+
+
+class PwmChannel:
+    """Stand-in for a PWM object: duty_ns() stages the value for the next flush"""
+    def __init__(self, output, slot):
+        self.output = output
+        self.slot = slot
+
+    def duty_ns(self, ns):
+        self.output.pending[self.slot] = ns
+
+
+class PwmOutput:
+    def __init__(self, pwms):
+        """pwms: dict like {'y': PWM(Pin(15)), ...}"""
+        self.axes = list(pwms.keys())
+        self.pwms = [pwms[axis] for axis in self.axes]
+        count = len(self.pwms)
+        self.channels = {axis: PwmChannel(self, k) for k, axis in enumerate(self.axes)}
+        self.pending = array('i', [NOT_SET] * count)
+        self.last = array('i', [NOT_SET] * count)   # Value currently in each PWM slice
+        self.sink = None  # Takes the frames instead of the PWM slices (see servo_timer.py)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.writes = 0
+        self.skipped = 0
+        self.flushes = 0
+
+    def flush(self):
+        """Write every staged channel whose value changed (no heap allocation)"""
+        if self.sink is not None:
+            self.sink.push()
+            return
+        pending = self.pending
+        last = self.last
+        pwms = self.pwms
+        for k in range(len(pwms)):
+            value = pending[k]
+            if value == NOT_SET:
+                continue
+            pending[k] = NOT_SET
+            if value == last[k]:
+                self.skipped += 1
+            else:
+                last[k] = value
+                pwms[k].duty_ns(value)
+                self.writes += 1
+        self.flushes += 1
+
+    def report(self):
+        """Return write statistics as a dict"""
+        total = self.writes + self.skipped
+        return {
+            'writes': self.writes,
+            'skipped': self.skipped,
+            'flushes': self.flushes,
+            'skipped_pct': (100 * self.skipped // total) if total else 0,
+        }
+
+    def print_report(self, label="PWM output"):
+        stats = self.report()
+        log.info("📤 %s: %d writes, %d skipped (%d%%) over %d frames",
+                 label, stats['writes'], stats['skipped'], stats['skipped_pct'], stats['flushes'])
@@ -0,0 +1,111 @@
+import utime
+from array import array
+import log
+
+# ==================== DEADLINE FRAME SCHEDULER ====================
+# Frames are released on absolute deadlines (start + n * interval), so the
+# time spent computing, writing PWM and printing never pushes later frames
+# back. When a frame overruns by a whole interval or more, the scheduler
+# either drops the missed frames (default) or runs them back-to-back.
+# Idle slack before a deadline is also when queued log messages get written.
+
+HISTORY_SIZE = 64  # Recent per-frame lateness samples kept for reporting
+
+
+class FrameScheduler:
+    def __init__(self, interval_ms, drop_late=True):
+        self.set_interval(interval_ms)
+        self.drop_late = drop_late
+        self.history = array('i', [0] * HISTORY_SIZE)
+        self.reset_stats()
+
+    def set_interval(self, interval_ms):
+        """Change the frame period used by the next frames() loop"""
+        self.interval_us = max(1, int(interval_ms * 1000))
+
+    def reset_stats(self):
+        """Clear the lateness statistics"""
+        self.frames_run = 0
+        self.frames_dropped = 0
+        self.late_us = 0          # Lateness of the most recent frame
+        self.slack_us = 0         # Idle time slept before the most recent frame
+        self.max_late_us = 0
+        self.total_late_us = 0
+        self._history_pos = 0
+
+    def _record(self, late_us):
+        self.late_us = late_us
+        self.frames_run += 1
+        self.total_late_us += late_us
+        if late_us > self.max_late_us:
+            self.max_late_us = late_us
+        self.history[self._history_pos] = late_us
+        self._history_pos = (self._history_pos + 1) % HISTORY_SIZE
+
+    def frames(self, total_frames=None):
+        """
+        Yield frame indices 0..total_frames, each on its own deadline
+        total_frames=None runs until the caller stops iterating
+        """
+        interval = self.interval_us
+        logger = log.default
+        start = utime.ticks_us()
+        frame = 0
+        self.slack_us = 0
+        self._record(0)
+        while True:
+            logger.frame_due(utime.ticks_add(start, (frame + 1) * interval), interval)
+            yield frame
+            if total_frames is not None and frame >= total_frames:
+                logger.frames_done()
+                return
+
+            frame += 1
+            deadline = utime.ticks_add(start, frame * interval)
+            late = utime.ticks_diff(utime.ticks_us(), deadline)
+
+            if late < 0:
+                self.slack_us = -late
+                if logger.count:
+                    logger.drain_until(deadline)
+                    late = utime.ticks_diff(utime.ticks_us(), deadline)
+                if late < 0:
+                    utime.sleep_us(-late)
+                late = utime.ticks_diff(utime.ticks_us(), deadline)
+            else:
+                self.slack_us = 0
+                if late >= interval and self.drop_late:
+                    # Skip the frames we already missed, but never the last one
+                    skipped = late // interval
+                    if total_frames is not None:
+                        skipped = min(skipped, total_frames - frame)
+                    frame += skipped
+                    self.frames_dropped += skipped
+                    deadline = utime.ticks_add(start, frame * interval)
+                    late = utime.ticks_diff(utime.ticks_us(), deadline)
+
+            self._record(late)
+
+    def end(self, completed=True):
+        """Frames are written as they are produced: nothing left to finish (see servo_timer.py)"""
+        pass
+
+    def frames_for(self, duration_s):
+        """Number of frames a move of duration_s spans at this interval"""
+        return max(1, int(duration_s * 1000000) // self.interval_us)
+
+    def report(self):
+        """Return lateness statistics as a dict"""
+        frames = self.frames_run
+        return {
+            'frames': frames,
+            'dropped': self.frames_dropped,
+            'avg_late_us': self.total_late_us // frames if frames else 0,
+            'max_late_us': self.max_late_us,
+            'last_late_us': self.late_us,
+        }
+
+    def print_report(self, label="Scheduler"):
+        stats = self.report()
+        log.info("⏱️  %s: %d frames, %d dropped, late avg %d us / max %d us",
+                 label, stats['frames'], stats['dropped'], stats['avg_late_us'], stats['max_late_us'])
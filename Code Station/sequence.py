@@ -0,0 +1,109 @@
+from easing import interpolate
+
+# ==================== MULTI-AXIS SEQUENCE COMPILER ====================
+# Per-axis keyframe lists (the y/x/z sequences) are compiled into one merged
+# timeline of segments on a shared frame grid. A single coordinated loop then
+# plays every axis at once, so the axes can overlap instead of queuing up.
+#
+# overlap controls how the axes are laid out:
+#   0.0  strict ordering - each axis starts when the previous one finished
+#   1.0  full overlap    - every axis starts on frame 0
+#   0.5  staggered       - the next axis starts halfway through the previous
+
+
+class Timeline:
+    def __init__(self, frame_ms):
+        self.frame_ms = frame_ms
+        self.tracks = {}  # axis -> list of [start_frame, end_frame, start_ns, target_ns]
+        self.order = []
+        self.total_frames = 0
+        self._cursors = {}
+
+    def add_segment(self, axis, start_frame, frames, start_ns, target_ns):
+        if axis not in self.tracks:
+            self.tracks[axis] = []
+            self.order.append(axis)
+        end_frame = start_frame + frames
+        self.tracks[axis].append([start_frame, end_frame, start_ns, target_ns])
+        if end_frame > self.total_frames:
+            self.total_frames = end_frame
+
+    def track_span(self, axis):
+        """(first_frame, last_frame) in which axis is moving"""
+        segments = self.tracks.get(axis)
+        if not segments:
+            return (0, 0)
+        return (segments[0][0], segments[-1][1])
+
+    def final_positions(self):
+        """Target ns each axis ends on"""
+        return {axis: segs[-1][3] for axis, segs in self.tracks.items() if segs}
+
+    def rewind(self):
+        """Reset playback cursors to the first segment of every track"""
+        for axis in self.order:
+            self._cursors[axis] = 0
+
+    def sample_into(self, frame, easing, out):
+        """
+        Write the eased ns for every axis at frame into out[axis]
+        Returns a bitmask of the axes (by order index) moving in this frame
+        """
+        moving = 0
+        for bit, axis in enumerate(self.order):
+            segments = self.tracks[axis]
+            idx = self._cursors.get(axis, 0)
+            while idx < len(segments) - 1 and frame >= segments[idx][1]:
+                idx += 1
+            self._cursors[axis] = idx
+            start_frame, end_frame, start_ns, target_ns = segments[idx]
+
+            if frame < start_frame:
+                # Waiting for this segment: hold where the previous one ended
+                out[axis] = segments[idx - 1][3] if idx else start_ns
+            elif frame >= end_frame:
+                out[axis] = target_ns
+            else:
+                weight = easing.sample(frame - start_frame, end_frame - start_frame)
+                out[axis] = interpolate(start_ns, target_ns, weight)
+                moving |= 1 << bit
+        return moving
+
+
+def compile_sequences(tracks, start_positions, to_ns, order=None, frame_ms=10,
+                      segment_duration=4.0, hold=0.0, overlap=1.0):
+    """
+    Build a Timeline from per-axis keyframe lists
+    tracks: {'y': [90, 75, 130, 90], ...} target degrees per axis
+    start_positions: {'y': ns, ...} where each axis is now
+    to_ns: function (axis, degrees) -> ns
+    hold: pause after each keyframe, in seconds
+    """
+    timeline = Timeline(frame_ms)
+    segment_frames = max(1, int(segment_duration * 1000) // frame_ms)
+    hold_frames = int(hold * 1000) // frame_ms
+    overlap = max(0.0, min(1.0, overlap))
+
+    axis_start = 0
+    for axis in (order or list(tracks.keys())):
+        if axis not in tracks:
+            continue
+        frame = axis_start
+        position = start_positions[axis]
+        for target_deg in tracks[axis]:
+            target_ns = to_ns(axis, target_deg)
+            if target_ns == position:
+                continue  # Already there - no time spent, like the old loop
+            timeline.add_segment(axis, frame, segment_frames, position, target_ns)
+            frame += segment_frames + hold_frames
+            position = target_ns
+
+        if axis in timeline.tracks:
+            first, last = timeline.track_span(axis)
+            # Next axis starts once this one is (1 - overlap) of the way through
+            axis_start = first + int((last - first) * (1.0 - overlap))
+            if overlap == 0.0:
+                axis_start += hold_frames
+
+    timeline.rewind()
+    return timeline
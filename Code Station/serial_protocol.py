@@ -0,0 +1,188 @@
+import struct
+
+# ==================== SERIAL COMMAND PROTOCOL ====================
+# Compact binary packets over the Pico's USB serial, shared by the robot
+# (CompleteRobotController.serve_commands) and the host client (pia_client.py).
+#
+#   sync 0xA5 | cmd u8 | length u8 | payload (length bytes) | checksum u8
+#
+# checksum = (cmd + length + sum(payload)) & 0xFF. Bytes outside a valid
+# packet (REPL text, line noise) are skipped until the next sync byte, and a
+# packet with a bad checksum is dropped and counted in PacketReader.errors.
+#
+# Host -> robot
+#   SET_POSE   seq u16, axis mask u8, y/x/z target u16 (centidegrees)
+#   TRACK      seq u16, sender time u32 (µs), axis mask u8, y/x/z u16
+#              (centidegrees); buffered and interpolated, see tracking.py
+#   PLAY_CLIP  path of a compiled clip on the board (utf-8)
+#   SET_LEDS   r, g, b (fill) or a whole GRB frame (leds x 3 bytes)
+#   QUERY      empty; answered with STATE
+#   EXIT       empty; leave remote mode
+# Robot -> host
+#   STATE      last pose seq u16, y/x/z position u16 (centidegrees),
+#              frame u32, packets u16, errors u16, flags u8,
+#              tracking latency u16 (µs, arrival to PWM write)
+#   ERROR      failed cmd u8, error code u8
+#
+# All multi-byte values are little-endian.
+
+SYNC = 0xA5
+MAX_PAYLOAD = 255
+OVERHEAD = 4  # sync + cmd + length + checksum
+
+CMD_SET_POSE = 0x01
+CMD_PLAY_CLIP = 0x02
+CMD_SET_LEDS = 0x03
+CMD_QUERY = 0x04
+CMD_EXIT = 0x05
+CMD_TRACK = 0x06
+RSP_STATE = 0x84
+RSP_ERROR = 0x8F
+
+POSE_AXES = ('y', 'x', 'z')  # Order of the axis values and mask bits
+POSE_FORMAT = '<HBHHH'
+TRACK_FORMAT = '<HIBHHH'
+STATE_FORMAT = '<HHHHIHHBH'
+ERROR_FORMAT = '<BB'
+POSE_SIZE = struct.calcsize(POSE_FORMAT)
+TRACK_SIZE = struct.calcsize(TRACK_FORMAT)
+STATE_SIZE = struct.calcsize(STATE_FORMAT)
+
+# STATE flags
+FLAG_CLIP = 0x01        # A clip is playing; poses apply after it
+FLAG_AT_TARGET = 0x02   # Every axis has reached its pose target
+FLAG_TRACKING = 0x04    # Following buffered TRACK samples
+
+# ERROR codes
+ERR_UNKNOWN_CMD = 1
+ERR_BAD_LENGTH = 2
+ERR_CLIP_OPEN = 3       # Clip missing or not a clip file
+ERR_CLIP_START = 4      # Clip does not start at the current pose
+
+# Reader states
+_WAIT_SYNC = 0
+_CMD = 1
+_LENGTH = 2
+_PAYLOAD = 3
+_CHECKSUM = 4
+
+MAX_READ = 64  # Bytes read per poll() call, so a flood cannot stall a frame
+
+
+def checksum(cmd, payload, length=None):
+    if length is None:
+        length = len(payload)
+    total = cmd + length
+    for i in range(length):
+        total += payload[i]
+    return total & 0xFF
+
+
+def encode(cmd, payload=b''):
+    """Whole packet as bytes"""
+    length = len(payload)
+    if length > MAX_PAYLOAD:
+        raise ValueError("payload too long: %d bytes" % length)
+    return bytes((SYNC, cmd, length)) + bytes(payload) + bytes((checksum(cmd, payload),))
+
+
+def encode_into(buf, cmd, payload, length):
+    """Write a packet into the preallocated bytearray buf; returns its size"""
+    buf[0] = SYNC
+    buf[1] = cmd
+    buf[2] = length
+    buf[3:3 + length] = payload[:length]
+    buf[3 + length] = checksum(cmd, payload, length)
+    return length + OVERHEAD
+
+
+class PacketReader:
+    """Non-blocking packet parser writing into one preallocated payload buffer"""
+    def __init__(self, max_payload=MAX_PAYLOAD):
+        self.payload = bytearray(max_payload)
+        self.cmd = 0
+        self.length = 0
+        self.packets = 0
+        self.errors = 0
+        self._state = _WAIT_SYNC
+        self._index = 0
+        self._sum = 0
+
+    def feed(self, byte):
+        """Consume one byte; True when it completes a valid packet"""
+        state = self._state
+        if state == _WAIT_SYNC:
+            if byte == SYNC:
+                self._state = _CMD
+        elif state == _CMD:
+            self.cmd = byte
+            self._sum = byte
+            self._state = _LENGTH
+        elif state == _LENGTH:
+            if byte > len(self.payload):
+                self.errors += 1
+                self._state = _WAIT_SYNC
+                return False
+            self.length = byte
+            self._sum += byte
+            self._index = 0
+            self._state = _PAYLOAD if byte else _CHECKSUM
+        elif state == _PAYLOAD:
+            self.payload[self._index] = byte
+            self._sum += byte
+            self._index += 1
+            if self._index == self.length:
+                self._state = _CHECKSUM
+        else:
+            self._state = _WAIT_SYNC
+            if byte == self._sum & 0xFF:
+                self.packets += 1
+                return True
+            self.errors += 1
+        return False
+
+    def poll(self, port, budget=MAX_READ):
+        """
+        Read what port has available (at most budget bytes) until a packet
+        completes; True when self.cmd / self.payload[:self.length] hold one
+        """
+        for _ in range(budget):
+            byte = port.read_byte()
+            if byte < 0:
+                return False
+            if self.feed(byte):
+                return True
+        return False
+
+
+# ==================== USB SERIAL PORT (PICO) ====================
+class UsbSerialPort:
+    """The Pico's USB serial (sys.stdin/stdout) as a non-blocking byte port"""
+    def __init__(self):
+        import sys
+        import uselect
+        self.stdin = sys.stdin.buffer
+        self.stdout = sys.stdout.buffer
+        self.poller = uselect.poll()
+        self.poller.register(sys.stdin, uselect.POLLIN)
+        self._byte = bytearray(1)
+
+    def claim(self):
+        """Take the line over: 0x03 becomes ordinary data, not Ctrl+C"""
+        import micropython
+        micropython.kbd_intr(-1)
+
+    def release(self):
+        """Give the line back to the REPL"""
+        import micropython
+        micropython.kbd_intr(3)
+
+    def read_byte(self):
+        """Next byte, or -1 when nothing is waiting"""
+        for _ in self.poller.ipoll(0):  # ipoll does not allocate
+            if self.stdin.readinto(self._byte):
+                return self._byte[0]
+        return -1
+
+    def write(self, data):
+        self.stdout.write(data)
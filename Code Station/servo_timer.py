@@ -0,0 +1,331 @@
+from array import array
+import utime
+import micropython
+from machine import Timer
+import log
+from pwm_output import NOT_SET
+
+# ==================== TIMER-DRIVEN SERVO UPDATES ====================
+# In a foreground frame loop the servos only move while the loop is
+# running: a blocking LED write or print between frames freezes them. Here
+# a machine.Timer callback writes the duties instead, at a fixed rate, and
+# the foreground only queues precomputed frames (one duty per axis) into a
+# ring buffer ahead of it:
+#
+#   foreground  MoveKernel -> PwmOutput.flush() -> TimerDrive.push() -> ring
+#   timer IRQ   ring -> changed duties -> PWM (every 1/hz s, no allocation)
+#
+# The ring has one producer (the foreground) and one consumer (the timer
+# callback). Each side owns one index and publishes with a single array
+# store, so no lock or disabled interrupts are needed. With RING_FRAMES
+# queued the servos keep moving through up to that many frames of
+# foreground stall; when the ring runs dry they hold their last duty. A new
+# stream only starts playing once PREFILL_FRAMES are queued, so a stall
+# right at its start delays the move instead of stuttering it.
+#
+# A preempted stream is cut back to its next BRIDGE_FRAMES: they keep the
+# servos moving while the foreground plans the next move, which is queued
+# right behind them and blends from their last pose and velocity.
+#
+# While the drive runs it is the output's sink: every flush() goes through
+# the ring, from frame loops and one-off writes alike, so the foreground
+# never writes a PWM slice the IRQ is also writing.
+#
+# TimerDrive offers the FrameScheduler interface (frames(), frames_for(),
+# set_interval(), end(), interval_us, slack_us), so frame loops and the
+# MotionEngine run on it unchanged. Frame periods longer than one tick
+# repeat each frame over several ticks; max_lead_ms bounds how far the
+# queue runs ahead, for loops that also drive the LEDs.
+#
+# A frame can carry a time stamp (stamp_us, e.g. when the sample it applies
+# arrived): the IRQ measures ticks_us() against it as it writes the frame,
+# so latencies end at the actual PWM write, not at the queueing.
+
+TIMER_HZ = 100
+RING_FRAMES = 64          # Power of two; 0.64 s of lead at 100 Hz
+PREFILL_FRAMES = 8
+BRIDGE_FRAMES = 2         # At least 2: the IRQ may pop while the ring is cut
+EMERGENCY_BUF = 100       # Lets an exception inside the IRQ be reported
+NO_STAMP = -1             # ticks_us() values are never negative
+
+
+class DutyRing:
+    """Lock-free single-producer/single-consumer ring of duty frames"""
+    def __init__(self, width, frames=RING_FRAMES):
+        if frames & (frames - 1):
+            raise ValueError("ring size must be a power of two")
+        self.width = width
+        self.size = frames
+        self.wrap = 2 * frames - 1  # Indices run over 2 * size: full and empty differ
+        self.data = array('i', [0] * (frames * width))
+        self.index = array('i', [0, 0])  # head: producer only, tail: consumer only
+
+    def count(self):
+        index = self.index
+        return (index[0] - index[1]) & self.wrap
+
+    def push(self, frame):
+        """Producer: copy width values in; False when full"""
+        index = self.index
+        head = index[0]
+        if ((head - index[1]) & self.wrap) >= self.size:
+            return False
+        width = self.width
+        data = self.data
+        base = (head & (self.size - 1)) * width
+        for k in range(width):
+            data[base + k] = frame[k]
+        index[0] = (head + 1) & self.wrap  # Publish only once the frame is complete
+        return True
+
+    def pop_into(self, frame):
+        """Consumer: copy the oldest frame out; False when empty (allocation-free)"""
+        index = self.index
+        tail = index[1]
+        if tail == index[0]:
+            return False
+        width = self.width
+        data = self.data
+        base = (tail & (self.size - 1)) * width
+        for k in range(width):
+            frame[k] = data[base + k]
+        index[1] = (tail + 1) & self.wrap
+        return True
+
+    def truncate(self, keep, align=1):
+        """
+        Producer: drop all but the oldest keep frames, rounded up so a whole
+        number of align-frame groups is dropped; True if any were dropped
+        """
+        index = self.index
+        head = index[0]
+        queued = (head - index[1]) & self.wrap
+        if queued <= keep:
+            return False
+        keep += (queued - keep) % align
+        # Counted back from head, so a frame popped meanwhile doesn't matter
+        index[0] = (head - (queued - keep)) & self.wrap
+        return True
+
+    def peek_into(self, back, frame):
+        """Producer: copy the frame pushed back pushes before the newest (kept after popping)"""
+        width = self.width
+        data = self.data
+        base = ((self.index[0] - 1 - back) & (self.size - 1)) * width
+        for k in range(width):
+            frame[k] = data[base + k]
+
+
+class TimerDrive:
+    def __init__(self, output, hz=TIMER_HZ, frames=RING_FRAMES, max_lead_ms=None):
+        """
+        output: pwm_output.PwmOutput whose PWM slices the timer writes
+        max_lead_ms: queue at most this far ahead of the servos (None: the whole ring)
+        """
+        self.output = output
+        self.hz = hz
+        self.tick_us = 1000000 // hz
+        width = len(output.pwms)
+        self.ring = DutyRing(width, frames)
+        self.set_lead(max_lead_ms)
+        self.set_interval(None)
+        self.frame = array('i', [0] * width)     # Producer: pose queued last
+        self.previous = array('i', [0] * width)  # Producer: pose one frame before it
+        self.popped = array('i', [0] * width)    # IRQ: entry being written
+        self.stamps = array('i', [NO_STAMP] * frames)  # Per ring slot: stamp queued with the entry
+        self.stamp_us = NO_STAMP                 # Producer: stamp for the next frame pushed
+        self.stamped = array('i', [0, 0])        # IRQ: stamped frames written, us from stamp to the last write
+        self.tick_at_us = utime.ticks_us()       # IRQ: when the timer last fired
+        self.in_stream = False                   # Producer: inside frames() .. end()
+        self.streaming = False                   # The IRQ plays queued frames
+        self.closing = False                     # Running dry ends the stream, not an underrun
+        self.slack_us = 0                        # Idle time slept before the most recent frame
+        self.lead_us = 0                         # Lead of the queue over the servos
+        self.timer = None
+        self._tick_handler = self._tick  # Bound once: binding inside the IRQ allocates
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.ticks = 0            # Ring entries written by the timer
+        self.underruns = 0        # Ticks with an empty ring while streaming
+        self.max_queued = 0
+
+    # ---------- timer side ----------
+    def start(self):
+        """Start the timer (hard IRQ where the port supports it) and take over output.flush()"""
+        micropython.alloc_emergency_exception_buf(EMERGENCY_BUF)
+        self.output.sink = self
+        try:
+            self.timer = Timer(mode=Timer.PERIODIC, freq=self.hz, callback=self._tick_handler,
+                               hard=True)
+        except TypeError:
+            # Soft callback: still independent of sleeps, but waits out blocking C calls
+            self.timer = Timer(mode=Timer.PERIODIC, freq=self.hz, callback=self._tick_handler)
+
+    def stop(self):
+        """Stop the timer; queued frames are dropped and flush() writes the PWM again"""
+        if self.timer is not None:
+            self.timer.deinit()
+            self.timer = None
+        ring = self.ring
+        ring.index[1] = ring.index[0]  # Nothing consumes the queue any more
+        self.streaming = False
+        self.output.sink = None
+
+    def _tick(self, timer):
+        # Interrupt context: array and int stores only, nothing allocated
+        self.tick_at_us = utime.ticks_us()
+        if not self.streaming:
+            return
+        ring = self.ring
+        frame = self.popped
+        slot = ring.index[1] & (ring.size - 1)
+        if not ring.pop_into(frame):
+            if self.closing:
+                self.streaming = False  # Played out the end of a preempted stream
+            else:
+                self.underruns += 1
+            return
+        output = self.output
+        last = output.last
+        pwms = output.pwms
+        for k in range(ring.width):
+            value = frame[k]
+            if value == last[k]:
+                output.skipped += 1
+            else:
+                last[k] = value
+                pwms[k].duty_ns(value)
+                output.writes += 1
+        stamp = self.stamps[slot]
+        if stamp != NO_STAMP:
+            stamped = self.stamped
+            stamped[1] = utime.ticks_diff(utime.ticks_us(), stamp)
+            stamped[0] += 1
+        self.ticks += 1
+
+    # ---------- foreground side (FrameScheduler interface) ----------
+    def set_interval(self, interval_ms):
+        """Frame period of the next frames() loop, in whole ticks (None: one tick)"""
+        tick = self.tick_us
+        self.repeat = 1 if interval_ms is None else max(1, (int(interval_ms * 1000) + tick // 2) // tick)
+        self.interval_us = self.repeat * tick
+
+    def set_lead(self, max_lead_ms):
+        """Queue at most max_lead_ms ahead of the servos (None: the whole ring)"""
+        size = self.ring.size
+        self.lead_limit = size if max_lead_ms is None else \
+            max(1, min(size, int(max_lead_ms * 1000) // self.tick_us))
+        self.prefill = min(PREFILL_FRAMES, self.lead_limit)
+
+    def write_time_us(self):
+        """ticks_us() at which the timer will write the next frame pushed"""
+        return utime.ticks_add(self.tick_at_us, (self.ring.count() + 1) * self.tick_us)
+
+    def frames_for(self, duration_s):
+        """Number of frames a move of duration_s spans at the frame period"""
+        return max(1, int(duration_s * 1000000) // self.interval_us)
+
+    def frames(self, total_frames=None):
+        """
+        Yield frame indices 0..total_frames (None: until the caller stops) as
+        fast as the ring takes them; output.flush() queues each frame and
+        end() finishes the stream
+        """
+        ring = self.ring
+        tick = self.tick_us
+        self.closing = False  # Queue right behind the bridge of a preempted stream
+        if not self.streaming:
+            last = self.output.last  # Idle: the servos hold the duties written last
+            for k in range(len(last)):
+                self.frame[k] = last[k]
+                self.previous[k] = last[k]
+        self.in_stream = True
+        limit = self.lead_limit
+        frame = 0
+        while True:
+            slack = 0
+            if ring.count() >= limit:
+                idle_from = utime.ticks_us()
+                while ring.count() >= limit:
+                    utime.sleep_us(tick)  # One entry frees per tick
+                slack = utime.ticks_diff(utime.ticks_us(), idle_from)
+            self.slack_us = slack
+            queued = ring.count()
+            if queued > self.max_queued:
+                self.max_queued = queued
+            self.lead_us = queued * tick
+            yield frame
+            if total_frames is not None and frame >= total_frames:
+                return
+            frame += 1
+
+    def push(self):
+        """Queue the staged channel values as the next frame (called by PwmOutput.flush)"""
+        output = self.output
+        pending = output.pending
+        frame = self.frame
+        previous = self.previous
+        for k in range(len(frame)):
+            previous[k] = frame[k]
+            value = pending[k]
+            if value != NOT_SET:
+                frame[k] = value
+                pending[k] = NOT_SET
+        ring = self.ring
+        stamps = self.stamps
+        stamp = self.stamp_us
+        self.stamp_us = NO_STAMP
+        for _ in range(self.repeat):
+            while ring.count() >= ring.size:
+                utime.sleep_us(self.tick_us)
+            # The slot is free now: its stamp is set before push() publishes it
+            stamps[ring.index[0] & (ring.size - 1)] = stamp
+            stamp = NO_STAMP  # Repeats of the frame are not measured again
+            ring.push(frame)
+        if not self.in_stream:
+            self.closing = True  # A write outside any loop: play it now, then idle
+            self.streaming = True
+        elif not self.streaming and ring.count() >= self.prefill:
+            self.streaming = True  # From here on an empty ring is an underrun
+        output.flushes += 1
+
+    def end(self, completed=True):
+        """
+        Finish a stream: wait until the servos have played it out (completed),
+        or cut it to BRIDGE_FRAMES and return at once; frame and previous then
+        hold the last two poses the servos will reach
+        """
+        self.in_stream = False
+        pending = self.output.pending
+        for k in range(len(pending)):
+            pending[k] = NOT_SET  # A frame staged but never queued (stopped mid-frame)
+        self.slack_us = 0
+        self.lead_us = 0
+        ring = self.ring
+        if completed:
+            self.streaming = True  # Shorter than the prefill: play it anyway
+            while ring.count():
+                utime.sleep_us(self.tick_us // 4)
+            self.streaming = False
+            return
+        repeat = self.repeat
+        if ring.truncate(BRIDGE_FRAMES * repeat, repeat):
+            ring.peek_into(0, self.frame)
+            ring.peek_into(repeat, self.previous)
+        self.closing = True
+        self.streaming = True
+
+    def report(self):
+        """Return timer statistics as a dict"""
+        return {
+            'hz': self.hz,
+            'ticks': self.ticks,
+            'underruns': self.underruns,
+            'max_lead_ms': self.max_queued * self.tick_us // 1000,
+        }
+
+    def print_report(self, label="Timer drive"):
+        stats = self.report()
+        log.info("⏲️  %s: %d Hz, %d frames, %d underruns, lead up to %d ms",
+                 label, stats['hz'], stats['ticks'], stats['underruns'], stats['max_lead_ms'])
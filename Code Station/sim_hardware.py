@@ -0,0 +1,585 @@
+# Host-side (CPython) stand-in for the Pico hardware modules.
+#
+#   import sim_hardware
+#   sim = sim_hardware.install()          # fake machine / utime / neopixel / rp2 / micropython
+#   from pia.motion import AdvancedMultiServoController   # now runs on a PC
+#
+# utime runs on a virtual clock, so sleeps return instantly and a full robot
+# sequence finishes in milliseconds. Every PWM write and NeoPixel frame is
+# recorded with its virtual timestamp in sim.trace. @micropython.native and
+# @micropython.viper functions run as plain Python, with viper's ptr8/ptr16/
+# ptr32 casts wrapping stores to their width as on the Pico.
+
+import ast
+import builtins
+import importlib.util
+import json
+import os
+import sys
+import time
+import types
+
+TICKS_PERIOD = 1 << 30  # MicroPython ticks wrap at 2**30
+WS2812_BYTE_US = 10     # 8 bits x 1.25 us on the LED data line
+PIO0_TXF0 = 0x50200010  # RP2040 PIO0 TX FIFO 0
+PIO_BLOCK_STRIDE = 0x100000
+
+
+# ==================== VIRTUAL CLOCK ====================
+class VirtualClock:
+    def __init__(self, cpu_scale=0.0, record_busy=False):
+        """
+        cpu_scale: 0.0 = computation is free (pure virtual time)
+                   >0  = real CPU time spent between clock reads is added to
+                         virtual time, scaled (e.g. 20.0 to mimic a slower MCU)
+        record_busy: keep the real (scaled) compute time between sleeps in busy_us
+        """
+        self.now_us = 0
+        self.cpu_scale = cpu_scale
+        self.slept_us = 0
+        self.busy_us = [] if record_busy else None
+        self.events = []  # (t_us, fn) waiting for virtual time to reach t_us
+        self._in_event = False
+        self._real_mark = time.perf_counter()
+        self._busy_mark = self._real_mark
+
+    def _sync(self):
+        if self.cpu_scale:
+            real = time.perf_counter()
+            self.now_us += int((real - self._real_mark) * 1000000 * self.cpu_scale)
+            self._real_mark = real
+
+    def now(self):
+        """Current virtual time in microseconds (never wraps)"""
+        self._sync()
+        if self.cpu_scale and not self._in_event:
+            # Compute time passed: events due meanwhile interrupt it here
+            # (a handler reading the clock is not interrupted itself)
+            self._run_events(self.now_us)
+        return self.now_us
+
+    def at(self, t_us, fn):
+        """Call fn() when virtual time reaches t_us, even mid-sleep (like an interrupt)"""
+        self.events.append((t_us, fn))
+        self.events.sort(key=lambda event: event[0])
+
+    def _run_events(self, until):
+        while self.events and self.events[0][0] <= until:
+            t_us, fn = self.events.pop(0)
+            self.now_us = max(self.now_us, t_us)
+            nested = self._in_event
+            self._in_event = True
+            try:
+                fn()
+            finally:
+                self._in_event = nested
+
+    def busy(self, us):
+        """The CPU is blocked for us (e.g. a bit-banged transfer), not sleeping"""
+        self._sync()
+        end = self.now_us + int(us)
+        self._run_events(end)
+        self.now_us = max(self.now_us, end)
+
+    def advance(self, us):
+        self._sync()
+        if self.busy_us is not None:
+            busy = (time.perf_counter() - self._busy_mark) * 1000000
+            self.busy_us.append(busy * (self.cpu_scale or 1.0))
+        if us > 0:
+            end = self.now_us + int(us)
+            self._run_events(end)
+            self.slept_us += int(us)
+            self.now_us = max(self.now_us, end)
+        self._real_mark = self._busy_mark = time.perf_counter()
+
+
+# ==================== TRACE ====================
+class HardwareTrace:
+    def __init__(self):
+        self.enabled = True    # False = keep hardware state only, record nothing
+        self.pwm_writes = []   # (t_us, pin, 'ns' | 'u16', value)
+        self.led_frames = []   # (t_us, pin, bytes in GRB order)
+
+    def clear(self):
+        self.pwm_writes = []
+        self.led_frames = []
+
+    def pin_writes(self, pin):
+        """[(t_us, value)] for one PWM pin"""
+        return [(t, v) for t, p, kind, v in self.pwm_writes if p == pin]
+
+    def summary(self):
+        pins = {}
+        for t, pin, kind, value in self.pwm_writes:
+            entry = pins.setdefault(pin, {'writes': 0, 'first_us': t, 'last_us': t,
+                                          'min': value, 'max': value})
+            entry['writes'] += 1
+            entry['last_us'] = t
+            entry['min'] = min(entry['min'], value)
+            entry['max'] = max(entry['max'], value)
+        return {'pwm': pins, 'led_frames': len(self.led_frames)}
+
+    def save(self, path):
+        """Write the full trace as JSON"""
+        with open(path, 'w') as f:
+            json.dump({
+                'pwm_writes': self.pwm_writes,
+                'led_frames': [(t, pin, data.hex()) for t, pin, data in self.led_frames],
+            }, f)
+
+
+# ==================== SIMULATION ====================
+class Simulation:
+    def __init__(self, cpu_scale=0.0, record_busy=False):
+        self.clock = VirtualClock(cpu_scale, record_busy)
+        self.trace = HardwareTrace()
+        self.pwms = {}
+        self.pins = {}       # Pin id -> Pin with an irq() handler
+        self.fifo_pins = {}  # PIO TX FIFO address -> sideset pin
+
+    def trigger_pin(self, pin_id, at_us):
+        """Fire the irq() handler of pin pin_id at virtual time at_us"""
+        pin = self.pins[pin_id]
+        self.clock.at(at_us, lambda: pin._handler(pin))
+
+    def start_measuring(self):
+        """Forget everything recorded so far (trace and busy samples)"""
+        self.trace.clear()
+        if self.clock.busy_us is not None:
+            self.clock.busy_us = []
+            self.clock._busy_mark = time.perf_counter()
+
+
+# The fake modules are built once and always talk to the active Simulation,
+# so code imported under an earlier install() follows a fresh one.
+_active = None
+
+
+def _sim():
+    if _active is None:
+        raise RuntimeError("sim_hardware.install() has not been called")
+    return _active
+
+
+# ---------- utime ----------
+def _make_utime():
+    mod = types.ModuleType('utime')
+
+    def ticks_us():
+        return _sim().clock.now() % TICKS_PERIOD
+
+    def ticks_ms():
+        return (_sim().clock.now() // 1000) % TICKS_PERIOD
+
+    def ticks_add(ticks, delta):
+        return (ticks + delta) % TICKS_PERIOD
+
+    def ticks_diff(ticks1, ticks2):
+        diff = (ticks1 - ticks2) % TICKS_PERIOD
+        if diff >= TICKS_PERIOD // 2:
+            diff -= TICKS_PERIOD
+        return diff
+
+    mod.ticks_us = ticks_us
+    mod.ticks_ms = ticks_ms
+    mod.ticks_cpu = ticks_us
+    mod.ticks_add = ticks_add
+    mod.ticks_diff = ticks_diff
+    mod.sleep = lambda s: _sim().clock.advance(s * 1000000)
+    mod.sleep_ms = lambda ms: _sim().clock.advance(ms * 1000)
+    mod.sleep_us = lambda us: _sim().clock.advance(us)
+    mod.time = lambda: _sim().clock.now() // 1000000
+    mod.time_ns = lambda: _sim().clock.now() * 1000
+    return mod
+
+
+# ---------- machine ----------
+def _make_machine():
+    mod = types.ModuleType('machine')
+
+    class Pin:
+        IN = 0
+        OUT = 1
+        PULL_UP = 1
+        PULL_DOWN = 2
+        IRQ_FALLING = 4
+        IRQ_RISING = 8
+
+        def __init__(self, id, mode=-1, pull=-1, value=None):
+            self.id = id
+            self._value = value or 0
+            self._handler = None
+
+        def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, hard=False):
+            self._handler = handler
+            _sim().pins[self.id] = self
+
+        def value(self, v=None):
+            if v is None:
+                return self._value
+            self._value = 1 if v else 0
+
+        def on(self):
+            self._value = 1
+
+        def off(self):
+            self._value = 0
+
+        def toggle(self):
+            self._value ^= 1
+
+        def __repr__(self):
+            return "Pin(%s)" % self.id
+
+    class PWM:
+        def __init__(self, pin, freq=None, duty_u16=None, duty_ns=None):
+            self.pin = pin.id if isinstance(pin, Pin) else pin
+            self._freq = freq or 0
+            self._duty_ns = 0
+            self._sim = _sim()
+            self._sim.pwms[self.pin] = self
+            if duty_ns is not None:
+                self.duty_ns(duty_ns)
+            elif duty_u16 is not None:
+                self.duty_u16(duty_u16)
+
+        def _period_ns(self):
+            return 1000000000 // self._freq if self._freq else 20000000
+
+        def freq(self, value=None):
+            if value is None:
+                return self._freq
+            self._freq = value
+
+        def duty_ns(self, value=None):
+            if value is None:
+                return self._duty_ns
+            self._duty_ns = int(value)
+            if self._sim.trace.enabled:
+                self._sim.trace.pwm_writes.append((self._sim.clock.now(), self.pin, 'ns', int(value)))
+
+        def duty_u16(self, value=None):
+            if value is None:
+                return self._duty_ns * 65535 // self._period_ns()
+            self._duty_ns = int(value) * self._period_ns() // 65535
+            if self._sim.trace.enabled:
+                self._sim.trace.pwm_writes.append((self._sim.clock.now(), self.pin, 'u16', int(value)))
+
+        def deinit(self):
+            self._freq = 0
+
+    class Timer:
+        ONE_SHOT = 0
+        PERIODIC = 1
+
+        def __init__(self, id=-1, mode=PERIODIC, period=-1, callback=None, freq=-1, hard=False):
+            self._armed = 0  # Bumped by init()/deinit() so stale events are ignored
+            if callback is not None:
+                self.init(mode=mode, period=period, callback=callback, freq=freq, hard=hard)
+
+        def init(self, mode=PERIODIC, period=-1, callback=None, freq=-1, hard=False):
+            self._armed += 1
+            self._mode = mode
+            self._period_us = 1000000 // freq if freq > 0 else int(period * 1000)
+            self._callback = callback
+            self._schedule(_sim().clock.now() + self._period_us, self._armed)
+
+        def _schedule(self, t_us, armed):
+            _sim().clock.at(t_us, lambda: self._fire(t_us, armed))
+
+        def _fire(self, t_us, armed):
+            if armed != self._armed:
+                return
+            if self._mode == Timer.PERIODIC:
+                self._schedule(t_us + self._period_us, armed)
+            self._callback(self)
+
+        def deinit(self):
+            self._armed += 1
+
+    mod.Pin = Pin
+    mod.PWM = PWM
+    mod.Timer = Timer
+    mod.freq = lambda *args: 125000000
+    mod.reset = lambda: None
+    return mod
+
+
+# ---------- neopixel ----------
+def _make_neopixel():
+    mod = types.ModuleType('neopixel')
+
+    class NeoPixel:
+        ORDER = (1, 0, 2, 3)  # RGB(W) tuple -> GRB(W) bytes, as on the Pico
+
+        def __init__(self, pin, n, bpp=3, timing=1):
+            self.pin = pin.id if hasattr(pin, 'id') else pin
+            self.n = n
+            self.bpp = bpp
+            self.buf = bytearray(n * bpp)
+            self._sim = _sim()
+
+        def __len__(self):
+            return self.n
+
+        def __setitem__(self, i, v):
+            offset = i * self.bpp
+            for c in range(self.bpp):
+                # MicroPython bytearrays keep the low byte instead of raising
+                self.buf[offset + self.ORDER[c]] = v[c] & 0xFF
+
+        def __getitem__(self, i):
+            offset = i * self.bpp
+            return tuple(self.buf[offset + self.ORDER[c]] for c in range(self.bpp))
+
+        def fill(self, v):
+            for i in range(self.n):
+                self[i] = v
+
+        def write(self):
+            if self._sim.trace.enabled:
+                self._sim.trace.led_frames.append((self._sim.clock.now(), self.pin, bytes(self.buf)))
+            # The bit-banged write blocks the CPU for the whole transfer
+            self._sim.clock.busy(len(self.buf) * WS2812_BYTE_US)
+
+    mod.NeoPixel = NeoPixel
+    return mod
+
+
+# ---------- rp2 (PIO + DMA) ----------
+def _make_rp2():
+    mod = types.ModuleType('rp2')
+
+    class PIO:
+        OUT_LOW = 0
+        OUT_HIGH = 1
+        IN_LOW = 0
+        IN_HIGH = 1
+        SHIFT_LEFT = 0
+        SHIFT_RIGHT = 1
+
+    def asm_pio(**options):
+        # Programs are never assembled on the host; keep the options only
+        def decorator(fn):
+            return ('pio_program', fn.__name__, options)
+        return decorator
+
+    class StateMachine:
+        def __init__(self, id, program=None, freq=-1, sideset_base=None, **kwargs):
+            self.id = id
+            self.program = program
+            self.pin = getattr(sideset_base, 'id', sideset_base)
+            self._active = 0
+            # DMA may target the TX FIFO by address; remember which pin it drives
+            _sim().fifo_pins[PIO0_TXF0 + (id % 4) * 4 + (id // 4) * PIO_BLOCK_STRIDE] = self.pin
+
+        def active(self, value=None):
+            if value is None:
+                return self._active
+            self._active = 1 if value else 0
+
+        def put(self, value, shift=0):
+            pass
+
+    class DMA:
+        def __init__(self):
+            self._sim = _sim()
+            self._busy_until = 0
+
+        def pack_ctrl(self, **fields):
+            return fields
+
+        def config(self, read=None, write=None, count=None, ctrl=None, trigger=False):
+            if trigger:
+                sim = self._sim
+                now = sim.clock.now()
+                pin = getattr(write, 'pin', sim.fifo_pins.get(write, write))
+                if sim.trace.enabled:
+                    sim.trace.led_frames.append((now, pin, bytes(read[:count])))
+                # Runs in the background: the CPU is free straight away
+                self._busy_until = now + count * WS2812_BYTE_US
+
+        def active(self, value=None):
+            return self._sim.clock.now() < self._busy_until
+
+        def close(self):
+            pass
+
+    mod.PIO = PIO
+    mod.asm_pio = asm_pio
+    mod.StateMachine = StateMachine
+    mod.DMA = DMA
+    return mod
+
+
+# ---------- micropython ----------
+class _Pointer:
+    """Viper ptr8/ptr16/ptr32 cast: indexes a buffer, stores wrap to the width"""
+    def __init__(self, buf, bits, signed):
+        self.buf = buf
+        self.mask = (1 << bits) - 1
+        self.sign = 1 << (bits - 1) if signed else 0
+
+    def __getitem__(self, i):
+        return self.buf[i]
+
+    def __setitem__(self, i, value):
+        value &= self.mask
+        if value & self.sign:
+            value -= self.mask + 1
+        self.buf[i] = value
+
+
+def _pointer_cast(bits):
+    def cast(buf):
+        # array('i') holds signed words; bytes and 'B'/'H' arrays unsigned ones
+        code = getattr(buf, 'typecode', None) or getattr(buf, 'format', 'B')
+        return _Pointer(buf, bits, code in 'bhilq')
+    return cast
+
+
+VIPER_CASTS = {'ptr8': _pointer_cast(8), 'ptr16': _pointer_cast(16), 'ptr32': _pointer_cast(32)}
+
+
+def _make_micropython():
+    mod = types.ModuleType('micropython')
+    # Code emitters: the decorated function runs as ordinary bytecode
+    mod.native = lambda fn: fn
+    mod.viper = lambda fn: fn
+    mod.const = lambda value: value
+    mod.kbd_intr = lambda char: None
+    mod.alloc_emergency_exception_buf = lambda size: None
+    return mod
+
+
+_modules = {}
+
+
+def install(cpu_scale=0.0, record_busy=False):
+    """Register the fake hardware modules in sys.modules and start a fresh Simulation"""
+    global _active
+    _active = Simulation(cpu_scale, record_busy)
+    if not _modules:
+        _modules['machine'] = _make_machine()
+        _modules['utime'] = _make_utime()
+        _modules['neopixel'] = _make_neopixel()
+        _modules['rp2'] = _make_rp2()
+        _modules['micropython'] = _make_micropython()
+    sys.modules.update(_modules)
+    for name, cast in VIPER_CASTS.items():
+        setattr(builtins, name, cast)  # Only the viper compiler knows these names
+    # The controllers keep per-run state at module level (pia.leds.leds):
+    # re-import the package against the new Simulation
+    for name in [name for name in sys.modules if name == 'pia' or name.startswith('pia.')]:
+        del sys.modules[name]
+    return _active
+
+
+def active():
+    """The Simulation the fake modules currently talk to"""
+    return _sim()
+
+
+def uninstall():
+    """Remove the fake modules from sys.modules"""
+    global _active
+    for name in _modules:
+        if sys.modules.get(name) is _modules[name]:
+            del sys.modules[name]
+    for name, cast in VIPER_CASTS.items():
+        if getattr(builtins, name, None) is cast:
+            delattr(builtins, name)
+    _active = None
+
+
+def load_script(path, name=None):
+    """Import a Code Station script by file path (handles names like 'a+b.py')"""
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    name = name or os.path.splitext(os.path.basename(path))[0].replace('+', '_').replace(' ', '_')
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_definitions(path, module_aliases=None):
+    """
+    Load a loop-style script without running its endless main loop
+    Top-level while loops (and try blocks wrapping one) are skipped; the rest
+    (setup, constants, functions) runs. module_aliases maps imports such as
+    {'time': 'utime'} so scripts using the CPython-named module sleep on
+    virtual time too. Returns the script's globals as a dict.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+
+    def is_main_loop(node):
+        if isinstance(node, ast.While):
+            return True
+        return isinstance(node, ast.Try) and any(isinstance(n, ast.While) for n in node.body)
+
+    aliases = module_aliases or {}
+    body = []
+    for node in tree.body:
+        if is_main_loop(node):
+            continue
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name in aliases:
+                    alias.asname = alias.asname or alias.name
+                    alias.name = aliases[alias.name]
+        body.append(node)
+    tree.body = body
+
+    namespace = {'__name__': os.path.splitext(os.path.basename(path))[0], '__file__': path}
+    exec(compile(tree, path, 'exec'), namespace)
+    return namespace
+
+
+# ==================== DEMO RUN ====================
+def run_full_sequences(trace_path=None):
+    """Run both final controllers through a full sequence on virtual time"""
+    sim = install()
+    results = {}
+
+    started = time.perf_counter()
+    from pia.motion import AdvancedMultiServoController
+    robot = AdvancedMultiServoController()
+    robot.full_robot_sequence(duration=4.0)
+    robot.safe_return_from_anywhere(duration=5.0)
+    results['AdvancedMultiServoController'] = (sim.clock.now(), time.perf_counter() - started)
+
+    led_sim = install()
+    started = time.perf_counter()
+    from pia.leds import CompleteRobotController
+    robot = CompleteRobotController()
+    robot.return_to_initial_with_leds()
+    robot.full_robot_sequence()
+    results['CompleteRobotController'] = (led_sim.clock.now(), time.perf_counter() - started)
+
+    print("\n" + "="*60)
+    print("🖥️  SIMULATED RUN")
+    print("="*60)
+    for name, (virtual_us, real_s) in results.items():
+        print(f"{name}: {virtual_us / 1000000:.2f}s robot time in {real_s * 1000:.0f}ms")
+    for label, s in (('xyz', sim), ('leds', led_sim)):
+        summary = s.trace.summary()
+        for pin, entry in sorted(summary['pwm'].items()):
+            print(f"  [{label}] pin {pin}: {entry['writes']} writes, "
+                  f"{entry['min']}..{entry['max']} ns")
+        print(f"  [{label}] LED frames: {summary['led_frames']}")
+    print("="*60)
+
+    if trace_path:
+        led_sim.trace.save(trace_path)
+        print(f"📝 Trace written to {trace_path}")
+    uninstall()
+    return sim, led_sim
+
+
+if __name__ == "__main__":
+    run_full_sequences(sys.argv[1] if len(sys.argv) > 1 else None)
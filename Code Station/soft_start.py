@@ -0,0 +1,119 @@
+import os
+import utime
+import log
+from easing import get_table, interpolate
+from scheduler import FrameScheduler
+
+# ==================== STAGED SERVO SOFT START ====================
+# Replaces the multi-second "let servos stabilize" sleeps at boot. PWM
+# channels are brought up one at a time, and the robot is ready as soon as
+# the servos can have reached their start positions:
+#
+#   pose saved    - the last clean shutdown stored where the servos stopped
+#                   (POSE_FILE). Each channel starts pulsing at that pose, so
+#                   nothing jumps, then all of them ease to their start
+#                   positions over RAMP_MS.
+#   pose unknown  - first boot, or power was cut mid-move. A channel's first
+#                   pulse makes its servo jump, so the next channel is only
+#                   enabled once the worst-case jump can have finished at
+#                   SERVO_DEG_S: one servo draws stall current at a time.
+#
+# The pose file is removed at boot, so after a power cut the pose is unknown
+# again instead of stale. ms_since_boot() (ticks_ms() counts from reset) at
+# the first gesture is the boot-to-first-motion time.
+
+POSE_FILE = 'pose.txt'
+RAMP_MS = 200             # Ease from the saved pose to the start positions
+SERVO_DEG_S = 600         # DF9GMS no-load speed (0.1 s / 60° at 4.8 V)
+JUMP_MARGIN_MS = 20
+BOOT_TARGET_MS = 1000
+
+
+def load_pose():
+    """{axis: ns} saved by the last clean shutdown, or None"""
+    pose = {}
+    try:
+        with open(POSE_FILE) as f:
+            for line in f:
+                axis, ns = line.split()
+                pose[axis] = int(ns)
+    except (OSError, ValueError):
+        return None
+    return pose
+
+
+def save_pose(positions):
+    """Remember where the servos stopped, for the next soft start"""
+    try:
+        with open(POSE_FILE, 'w') as f:
+            for axis, ns in positions.items():
+                f.write("%s %d\n" % (axis, ns))
+    except OSError:
+        log.warn("⚠️  Could not save the servo pose")
+
+
+def forget_pose():
+    try:
+        os.remove(POSE_FILE)
+    except OSError:
+        pass
+
+
+def jump_ms(profile, target_ns):
+    """Worst-case time for a servo at an unknown position to reach target_ns"""
+    span_ns = profile.max_ns - profile.min_ns
+    worst_ns = max(target_ns - profile.min_ns, profile.max_ns - target_ns)
+    return worst_ns * profile.span_deg * 1000 // (span_ns * SERVO_DEG_S) + JUMP_MARGIN_MS
+
+
+def soft_start(output, targets, profiles, frame_ms=20):
+    """
+    Bring the servo channels of output (pwm_output.PwmOutput) up one by one
+    and leave them at targets {axis: ns}; profiles: {axis: ServoProfile}
+    Returns the time it took in ms
+    """
+    started = utime.ticks_ms()
+    pose = load_pose()
+    forget_pose()  # From here on a power cut leaves the pose unknown
+    channels = output.channels
+    if pose is not None and all(axis in pose for axis in output.axes):
+        for axis in output.axes:
+            channels[axis].duty_ns(pose[axis])  # Where it already is: no jump
+            output.flush()
+        _ramp(output, pose, targets, frame_ms)
+        how = "saved pose"
+    else:
+        for axis in output.axes:
+            channels[axis].duty_ns(targets[axis])
+            output.flush()
+            utime.sleep_ms(jump_ms(profiles[axis], targets[axis]))
+        how = "staged jumps"
+    elapsed = utime.ticks_diff(utime.ticks_ms(), started)
+    log.info("🔌 Servos ready in %d ms (%s)", elapsed, how)
+    return elapsed
+
+
+def _ramp(output, start, targets, frame_ms):
+    """Ease every channel from start to targets over RAMP_MS"""
+    if all(start[axis] == targets[axis] for axis in output.axes):
+        return
+    easing = get_table('cosine')
+    channels = output.channels
+    total = max(1, RAMP_MS // frame_ms)
+    for i in FrameScheduler(frame_ms).frames(total):
+        weight = easing.sample(i, total)
+        for axis in output.axes:
+            channels[axis].duty_ns(interpolate(start[axis], targets[axis], weight))
+        output.flush()
+
+
+def ms_since_boot():
+    return utime.ticks_ms()
+
+
+def report_boot(label="Boot to first motion"):
+    """Log the time since reset against BOOT_TARGET_MS; returns it in ms"""
+    elapsed = ms_since_boot()
+    log.info("%s %s: %d ms (target < %d ms)", '✅' if elapsed < BOOT_TARGET_MS else '⚠️ ',
+             label, elapsed, BOOT_TARGET_MS)
+    return elapsed
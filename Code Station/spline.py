@@ -0,0 +1,136 @@
+from array import array
+
+# ==================== KEYFRAME SPLINE PATHS ====================
+# A keyframe list is turned into one continuous cubic Hermite path instead of
+# separate rest-to-rest moves. Tangents are Catmull-Rom style (slope between
+# the neighbouring keyframes, scaled by their timing), so the servo keeps its
+# velocity through every waypoint. The path ends at rest, and starts at rest
+# unless given the velocity of a move it takes over from.
+#
+# monotone=True limits the tangents (Fritsch-Carlson) so the path never
+# overshoots a keyframe: turning points are reached exactly and with zero
+# velocity, as a 1-axis reversal has to be anyway.
+#
+# A Hermite segment peaks faster than a planned move of the same duration
+# (1.5x its average speed even from rest to rest), so with max_velocity the
+# segments that would exceed it are stretched until none does.
+#
+# The path is evaluated once, in floats, into an array of duty_ns values on
+# the frame grid; playback is then one array load per frame.
+
+MAX_STRETCH_ROUNDS = 12
+STRETCH_MARGIN = 1.001  # Past the exact ratio, so the rounds settle
+
+
+def _tangents(times, points, monotone):
+    """Velocity (ns/s) at each keyframe; ends at rest"""
+    count = len(points)
+    tangents = [0.0] * count
+    for i in range(1, count - 1):
+        before = (points[i] - points[i - 1]) / (times[i] - times[i - 1])
+        after = (points[i + 1] - points[i]) / (times[i + 1] - times[i])
+        tangent = (points[i + 1] - points[i - 1]) / (times[i + 1] - times[i - 1])
+        if monotone:
+            if before * after <= 0:
+                tangent = 0.0  # Turning point (or flat): stop exactly on it
+            else:
+                limit = 3 * min(abs(before), abs(after))
+                if abs(tangent) > limit:
+                    tangent = limit if tangent > 0 else -limit
+        tangents[i] = tangent
+    return tangents
+
+
+def _segment_peak(h, p0, p1, m0, m1):
+    """Highest |velocity| (ns/s) on one Hermite segment of h seconds"""
+    # Position derivative in s (0..1): a*s^2 + b*s + c, divided by h
+    d = p1 - p0
+    a = 3 * h * (m0 + m1) - 6 * d
+    b = 6 * d - h * (4 * m0 + 2 * m1)
+    c = h * m0
+    peak = max(abs(c), abs(a + b + c))
+    if a:
+        s = -b / (2 * a)
+        if 0 < s < 1:
+            peak = max(peak, abs((a * s + b) * s + c))
+    return peak / h
+
+
+def _times(durations):
+    times = [0.0]
+    for duration in durations:
+        times.append(times[-1] + max(duration, 0.001))
+    return times
+
+
+class KeyframePath:
+    def __init__(self, duty, frame_ms):
+        self.duty = duty          # array('i') of duty_ns, one per frame
+        self.frame_ms = frame_ms
+        self.frames = len(duty) - 1
+        self.final_ns = duty[len(duty) - 1]
+
+    def duration(self):
+        return self.frames * self.frame_ms / 1000
+
+
+def fit_path(points, durations, frame_ms=20, monotone=True, min_ns=None, max_ns=None,
+             start_velocity=0.0, max_velocity=None):
+    """
+    Sample a spline through points (duty_ns) into a KeyframePath
+    durations: seconds from each point to the next (len(points) - 1 entries)
+    min_ns/max_ns: optional clamp (the servo's end stops)
+    start_velocity: ns/s at the first point (a move already under way)
+    max_velocity: optional ns/s limit per segment (None entries: as timed)
+    """
+    if len(points) < 2:
+        raise ValueError("a path needs at least two points")
+    times = _times(durations)
+    tangents = _tangents(times, points, monotone)
+    tangents[0] = start_velocity
+    for _ in range(MAX_STRETCH_ROUNDS if max_velocity else 0):
+        # Stretching a segment only lowers the tangents around it: repeat until none is too fast
+        spans = []
+        stretched = False
+        for seg in range(len(points) - 1):
+            h = times[seg + 1] - times[seg]
+            limit = max_velocity[seg]
+            if limit is not None:
+                if seg == 0:
+                    limit = max(limit, abs(start_velocity))  # A move under way may start faster
+                peak = _segment_peak(h, points[seg], points[seg + 1], tangents[seg], tangents[seg + 1])
+                if peak > limit:
+                    h *= peak / limit * STRETCH_MARGIN
+                    stretched = True
+            spans.append(h)
+        if not stretched:
+            break
+        times = _times(spans)
+        tangents = _tangents(times, points, monotone)
+        tangents[0] = start_velocity
+
+    total = times[-1]
+    frames = max(1, int(total * 1000 / frame_ms + 0.999))  # Rounded up: never played faster
+    duty = array('i', [0] * (frames + 1))
+    seg = 0
+    last_seg = len(points) - 2
+    for frame in range(frames + 1):
+        t = total * frame / frames
+        while seg < last_seg and t > times[seg + 1]:
+            seg += 1
+        h = times[seg + 1] - times[seg]
+        s = (t - times[seg]) / h
+        s2 = s * s
+        s3 = s2 * s
+        value = ((2 * s3 - 3 * s2 + 1) * points[seg]
+                 + (s3 - 2 * s2 + s) * h * tangents[seg]
+                 + (-2 * s3 + 3 * s2) * points[seg + 1]
+                 + (s3 - s2) * h * tangents[seg + 1])
+        value = int(value + 0.5)
+        if min_ns is not None and value < min_ns:
+            value = min_ns
+        if max_ns is not None and value > max_ns:
+            value = max_ns
+        duty[frame] = value
+    duty[frames] = points[-1]  # Land exactly on the last keyframe
+    return KeyframePath(duty, frame_ms)
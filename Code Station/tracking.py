@@ -0,0 +1,173 @@
+import utime
+from array import array
+from easing import interpolate
+
+# ==================== TARGET TRACKING ====================
+# Streamed targets (e.g. gaze points from the PC) arrive irregularly. Each
+# sample carries the sender's timestamp; TargetTracker maps it onto the local
+# ticks_us() clock and plays it out delay_us later, so a late packet still
+# lands before it is needed. Every frame, sample() interpolates between the
+# two buffered samples around "now". When the buffer runs dry it extrapolates
+# from the last two samples for up to max_extrapolate_us, then holds.
+#
+#     tracker.push(host_us, utime.ticks_us(), mask, (y_ns, x_ns, z_ns))
+#     tracker.sample(utime.ticks_us(), targets)   # once per frame
+#
+# A new sample only moves the reference the output interpolates along, so
+# motion is never restarted. Latency is measured from a sample's arrival to
+# the frame its value is fully applied: sample() sets fresh/fresh_arrival and
+# the caller records the time once that frame's PWM write is done.
+
+TICKS_MASK = (1 << 30) - 1      # ticks_us() wraps at 2**30
+BUFFER_SLOTS = 8
+DEFAULT_DELAY_US = 40000        # Two samples at 50 Hz
+MAX_EXTRAPOLATE_US = 60000
+OFFSET_DRIFT_US = 2             # Per sample: lets the clock offset follow drift
+
+
+def q16_ratio(part, span):
+    """
+    part * 65536 // span, exactly: split in two steps so the products stay
+    MicroPython small ints (no heap allocation) for part up to ~4 s of us
+    """
+    high = part * 256
+    return (high // span << 8) + (high % span) * 256 // span
+
+
+class TargetTracker:
+    def __init__(self, axes, delay_us=DEFAULT_DELAY_US, slots=BUFFER_SLOTS,
+                 max_extrapolate_us=MAX_EXTRAPOLATE_US):
+        self.axes = axes
+        self.delay_us = delay_us
+        self.slots = slots
+        self.max_extrapolate_us = max_extrapolate_us
+        self.due = array('i', [0] * slots)        # Local ticks each sample plays at
+        self.arrivals = array('i', [0] * slots)   # Local ticks each sample arrived
+        self.values = [array('i', [0] * slots) for _ in axes]
+        self.latest = array('i', [0] * len(axes))       # Newest value per axis
+        self.prev_values = array('i', [0] * len(axes))  # Sample before the head
+        self.prev_due = 0
+        self.has_prev = False
+        self.head = 0
+        self.count = 0
+        self.head_applied = False
+        self.offset = None        # Sender µs -> local ticks
+        self.fresh = False        # A sample was fully applied this frame
+        self.fresh_arrival = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.received = 0
+        self.late = 0             # Arrived after its playout time
+        self.out_of_order = 0
+        self.overflows = 0
+        self.extrapolated = 0     # Frames run on extrapolation (buffer empty)
+
+    def reset(self, positions):
+        """Forget buffered samples; positions {axis: ns} fill axes a sample leaves out"""
+        for k, axis in enumerate(self.axes):
+            self.latest[k] = positions[axis]
+        self.count = 0
+        self.has_prev = False
+        self.fresh = False
+
+    def push(self, host_us, arrival, mask, values):
+        """
+        Add one sample: host_us = sender timestamp (µs), arrival = local
+        ticks_us() when it was read; values[k] for each axis whose mask bit
+        is set (the others keep their latest value)
+        """
+        host = host_us & TICKS_MASK
+        raw = utime.ticks_diff(arrival, host)
+        # Smallest transit seen = best estimate of the clock offset
+        if self.offset is None or raw < self.offset:
+            self.offset = raw
+        else:
+            self.offset += OFFSET_DRIFT_US
+        due = utime.ticks_add(utime.ticks_add(host, self.offset), self.delay_us)
+        self.received += 1
+
+        if self.count:
+            newest = (self.head + self.count - 1) % self.slots
+            if utime.ticks_diff(due, self.due[newest]) <= 0:
+                self.out_of_order += 1
+                return False
+        if utime.ticks_diff(due, arrival) < 0:
+            self.late += 1
+        if self.count == self.slots:
+            self._pop()
+            self.overflows += 1
+
+        slot = (self.head + self.count) % self.slots
+        latest = self.latest
+        for k in range(len(self.axes)):
+            if mask & (1 << k):
+                latest[k] = values[k]
+            self.values[k][slot] = latest[k]
+        self.due[slot] = due
+        self.arrivals[slot] = arrival
+        if not self.count:
+            self.head_applied = False
+        self.count += 1
+        return True
+
+    def _pop(self):
+        head = self.head
+        for k in range(len(self.axes)):
+            self.prev_values[k] = self.values[k][head]
+        self.prev_due = self.due[head]
+        self.has_prev = True
+        self.head = (head + 1) % self.slots
+        self.head_applied = False
+        self.count -= 1
+
+    def sample(self, now, targets):
+        """Write the reference for now into targets {axis: ns}; False if idle"""
+        if not self.count:
+            return False
+        due = self.due
+        slots = self.slots
+        # Drop samples whose successor is already due
+        while self.count >= 2 and utime.ticks_diff(now, due[(self.head + 1) % slots]) >= 0:
+            self._pop()
+
+        head = self.head
+        since = utime.ticks_diff(now, due[head])
+        if since < 0:
+            return False  # First sample not due yet: hold the current pose
+        if not self.head_applied:
+            self.head_applied = True
+            self.fresh = True
+            self.fresh_arrival = self.arrivals[head]
+
+        axes = self.axes
+        values = self.values
+        if self.count >= 2:
+            nxt = (head + 1) % slots
+            span = utime.ticks_diff(due[nxt], due[head])
+            weight = q16_ratio(since, span)
+            for k in range(len(axes)):
+                targets[axes[k]] = interpolate(values[k][head], values[k][nxt], weight)
+        elif self.has_prev and since <= self.max_extrapolate_us:
+            # Buffer ran dry: continue along the last two samples
+            span = utime.ticks_diff(due[head], self.prev_due)
+            weight = q16_ratio(span + since, span)
+            prev = self.prev_values
+            for k in range(len(axes)):
+                targets[axes[k]] = interpolate(prev[k], values[k][head], weight)
+            if since:
+                self.extrapolated += 1
+        else:
+            for k in range(len(axes)):
+                targets[axes[k]] = values[k][head]
+        return True
+
+    def report(self):
+        """Return buffer statistics as a dict"""
+        return {
+            'received': self.received,
+            'late': self.late,
+            'out_of_order': self.out_of_order,
+            'overflows': self.overflows,
+            'extrapolated': self.extrapolated,
+        }
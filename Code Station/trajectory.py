@@ -0,0 +1,226 @@
+import gc
+import sys
+from array import array
+import kernels
+from kernels import AXIS_PARAMS
+
+# ==================== INTEGER MOVE KERNEL ====================
+# Allocation-free interpolation for the per-tick hot loop.
+#
+# MicroPython small ints are 31-bit on the RP2040; anything larger becomes a
+# heap-allocated long. delta_ns * weight_q16 (up to 2e6 * 65536) does not fit,
+# so each axis delta is precomputed split into a high part (delta >> 7) and a
+# low part (delta & 127). Both products then stay below 2**30:
+#
+#     duty = start + ((hi * w) >> 9) + ((lo * w) >> 16)
+#
+# which equals start + (delta * w) >> 16 to within 1 ns. The per-tick loop
+# itself is kernels.sample_axes (native code on the Pico).
+
+DELTA_SPLIT = 7
+MAX_DELTA_NS = (1 << (30 - 16 + DELTA_SPLIT)) - 1  # ~2.09 ms, the full servo range
+
+# ==================== VELOCITY CARRY ====================
+# A move that starts while the servo is still moving (a preempted move) adds
+# a carry term: carry_ns * h10(s), the Hermite basis for the start tangent,
+# over the first blend_frames. h10 is 0 at both ends with slope 1 at s=0 and
+# 0 at s=1, so the servo leaves with its current velocity
+# (carry_ns / blend time) and the term has died away by the end of the blend.
+
+CARRY_RESOLUTION = 64
+CARRY_TABLE = array('i', [int((s * s * s - 2 * s * s + s) * 65536 + 0.5)
+                          for s in [i / CARRY_RESOLUTION for i in range(CARRY_RESOLUTION + 1)]])
+
+
+def carry_weight(step, total_steps):
+    """Q16 Hermite h10 weight for step out of total_steps (0 outside the blend)"""
+    if step <= 0 or step >= total_steps:
+        return 0
+    scaled = step * CARRY_RESOLUTION
+    idx = scaled // total_steps
+    frac = scaled - idx * total_steps
+    a = CARRY_TABLE[idx]
+    return a + (CARRY_TABLE[idx + 1] - a) * frac // total_steps
+
+
+class MoveKernel:
+    def __init__(self, max_axes=3):
+        self.max_axes = max_axes
+        self.count = 0
+        self.pwms = [None] * max_axes
+        # Per axis: start, delta_hi, delta_lo, carry_hi, carry_lo (kernels.AXIS_PARAMS)
+        self.params = array('i', [0] * (max_axes * AXIS_PARAMS))
+        self.weights = array('i', [0, 0, 0])    # Axis count, eased weight, carry weight
+        self.target = array('i', [0] * max_axes)
+        self.out = array('i', [0] * max_axes)   # Last duty written per axis
+        self.prev = array('i', [0] * max_axes)  # Duty written the frame before
+
+    def clear(self):
+        self.count = 0
+        self.weights[0] = 0
+
+    def add(self, pwm, start_ns, target_ns, carry_ns=0):
+        """
+        Load one axis; returns its slot index
+        carry_ns: start velocity x blend time, for moves that begin in motion
+        """
+        delta = target_ns - start_ns
+        if delta > MAX_DELTA_NS or delta < -MAX_DELTA_NS:
+            raise ValueError("move of %d ns is outside the kernel range" % delta)
+        carry_ns = max(-MAX_DELTA_NS, min(MAX_DELTA_NS, carry_ns))
+        k = self.count
+        if k >= self.max_axes:
+            raise ValueError("MoveKernel is full")
+        params = self.params
+        i = k * AXIS_PARAMS
+        params[i] = start_ns
+        params[i + 1] = delta >> DELTA_SPLIT
+        params[i + 2] = delta & ((1 << DELTA_SPLIT) - 1)
+        params[i + 3] = carry_ns >> DELTA_SPLIT
+        params[i + 4] = carry_ns & ((1 << DELTA_SPLIT) - 1)
+        self.pwms[k] = pwm
+        self.target[k] = target_ns
+        self.out[k] = start_ns
+        self.prev[k] = start_ns
+        self.count = k + 1
+        self.weights[0] = k + 1
+        return k
+
+    def write(self, weight, carry=0):
+        """
+        Write every loaded axis at a Q16 eased weight plus a Q16 carry weight
+        (see carry_weight) - no heap allocation
+        """
+        weights = self.weights
+        weights[1] = weight
+        weights[2] = carry
+        out = self.out
+        kernels.sample_axes(self.params, weights, out, self.prev)
+        pwms = self.pwms
+        for k in range(self.count):
+            pwms[k].duty_ns(out[k])
+
+    def finish(self):
+        """Write the exact targets"""
+        for k in range(self.count):
+            self.prev[k] = self.target[k]
+            self.out[k] = self.target[k]
+            self.pwms[k].duty_ns(self.target[k])
+
+
+# ==================== ALLOCATION CHECK ====================
+HEAP_BLOCK = 16  # Smallest MicroPython heap allocation, in bytes
+
+
+def count_allocations(run, ticks):
+    """
+    Bytes allocated while run(ticks) executes, including what is freed again
+    MicroPython: exact gc.mem_alloc() difference with the GC paused.
+    CPython: see _host_allocations()
+    """
+    try:
+        mem_alloc = gc.mem_alloc
+    except AttributeError:
+        return without_sim_trace(_host_allocations, run, ticks)
+
+    gc.collect()
+    gc.disable()
+    try:
+        before = mem_alloc()
+        run(ticks)
+        return mem_alloc() - before
+    finally:
+        gc.enable()
+
+
+def _host_allocations(run, ticks):
+    """
+    CPython stand-in for count_allocations(). Every int is boxed there, so
+    only objects MicroPython heap-allocates as well are counted: the ones the
+    GC tracks (tuples, lists, dicts, bound methods, closures, generators).
+    The GC's youngest generation is checked opcode by opcode, so an object
+    freed straight away (or reused from one of CPython's free lists) is still
+    seen; tracemalloc gives what the opcode allocated. Not counted: floats
+    (the kernels are integer-only), dicts holding only ints and strings (the
+    GC doesn't track those), and objects of sim_hardware's types (stand-ins
+    for hardware and viper's pointer casts).
+    """
+    import tracemalloc
+    total = [0]
+    last = [0, 0, None]  # After the previous opcode: traced bytes, young objects, id of the newest
+
+    def opcode(frame, event, arg):
+        young = gc.get_objects(0)
+        newest = young[-1] if young else None
+        if event == 'opcode' and newest is not None and type(newest).__module__ != 'sim_hardware':
+            # More objects, or as many with a different newest one: one was tracked
+            if len(young) > last[1] or (len(young) == last[1] and id(newest) != last[2]):
+                total[0] += max(HEAP_BLOCK, tracemalloc.get_traced_memory()[1] - last[0])
+        last[0] = tracemalloc.get_traced_memory()[0]
+        last[1] = len(young)
+        last[2] = id(newest)
+        tracemalloc.reset_peak()
+        return opcode
+
+    def call(frame, event, arg):
+        if frame.f_code.co_filename.endswith('sim_hardware.py'):
+            return None  # Hardware that is C code on the Pico
+        frame.f_trace_opcodes = True
+        return opcode
+
+    gc.collect()  # Leaves the youngest generation empty
+    gc.disable()  # Collections would empty it again
+    tracemalloc.start()
+    sys.settrace(call)
+    try:
+        run(ticks)
+    finally:
+        sys.settrace(None)
+        tracemalloc.stop()
+        gc.enable()
+    return total[0]
+
+
+def without_sim_trace(run, *args):
+    """
+    run(*args) with sim_hardware's trace paused when running on the PC sim:
+    the trace keeps every value written alive, which the Pico never does
+    """
+    sim = sys.modules.get('sim_hardware')
+    if sim is None or sim._active is None:
+        return run(*args)
+    trace = sim.active().trace
+    enabled = trace.enabled
+    trace.enabled = False
+    try:
+        return run(*args)
+    finally:
+        trace.enabled = enabled
+
+
+def heap_in_use():
+    """
+    Live heap bytes after a collection
+    MicroPython: gc.mem_alloc(). CPython: tracemalloc's traced memory
+    (tracing starts on the first call, so take a baseline first)
+    """
+    gc.collect()
+    try:
+        return gc.mem_alloc()
+    except AttributeError:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        return tracemalloc.get_traced_memory()[0]
+
+
+def per_tick_allocation(run, short=50, long=500):
+    """
+    Whole bytes allocated per extra tick: 0 means the loop body is
+    allocation-free (any real per-tick allocation is at least one 16-byte
+    heap block per tick, so rounding down only hides one-off noise)
+    """
+    run(short)  # Warm up caches (easing tables, method lookups)
+    base = count_allocations(run, short)
+    extended = count_allocations(run, long)
+    return (extended - base) // (long - short)
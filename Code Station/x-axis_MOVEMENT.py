@@ -1,6 +1,6 @@
 from machine import Pin, PWM
 import utime
-import math
+from easing import get_table, interpolate
 
 MID = 1500000
 MIN = 1000000
@@ -10,6 +10,7 @@ pwm = PWM(Pin(14))
 pwm.freq(50)
 
 current_position = MID
+easing = get_table('smoothstep')
 
 def super_smooth_move(target_ns, duration=5.0):
     """
@@ -28,12 +29,10 @@ def super_smooth_move(target_ns, duration=5.0):
     total_updates = int(duration / update_interval)
     
     for i in range(total_updates + 1):
-        t = i / total_updates
-        
         # **Consistent cubic easing for all movements**
-        ease_t = t * t * (3 - 2 * t)  # Perfect balance of smoothness
+        ease_w = easing.sample(i, total_updates)  # Perfect balance of smoothness
         
-        current_pos = int(start_ns + (target_ns - start_ns) * ease_t)
+        current_pos = interpolate(start_ns, target_ns, ease_w)
         pwm.duty_ns(current_pos)
         utime.sleep(update_interval)
     
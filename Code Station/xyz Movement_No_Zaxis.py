@@ -3,6 +3,7 @@
 
 from machine import Pin, PWM
 import time
+from calibration import get_profile
 
 # Setup PWM for each axis
 servo_y = PWM(Pin(15))  # Y-axis
@@ -13,11 +14,11 @@ servo_z = PWM(Pin(13))  # Z-axis
 for servo in [servo_y, servo_x, servo_z]:
     servo.freq(50)
 
+servo_profile = get_profile('df9gms_wide')  # 0.5-2.5 ms over 180°
+
 def set_angle(servo, angle):
 #     """Set angle (0–180°) safely using duty_ns."""
-    angle = max(0, min(180, angle))
-    duty_ns = int(500000 + (angle / 180) * 2000000)
-    servo.duty_ns(duty_ns)
+    servo.duty_ns(servo_profile.to_ns(angle))
 
 # Custom angle limits
 MIN_ANGLE = 40
@@ -1,5 +1,6 @@
 from machine import Pin, PWM
 import time
+from calibration import get_profile
 
 # === Setup PWM for each servo ===
 servo_y = PWM(Pin(15))  # Y-axis
@@ -9,16 +10,19 @@ servo_z = PWM(Pin(13))  # Z-axis
 for s in (servo_y, servo_x, servo_z):
     s.freq(50)
 
+profile_165 = get_profile('df9gms_165')   # Y and Z axes
+profile_180 = get_profile('df9gms_wide')  # X axis
+
 # === General smooth movement (for Y and Z axes using 165° scaling) ===
 def smooth_move(servo, start, end, delay=0.05, step=1):
     if start < end:
         for angle in range(start, end + 1, step):
-            duty_ns = int(500_000 + (angle / 165) * 2_000_000)
+            duty_ns = profile_165.to_ns(angle)
             servo.duty_ns(duty_ns)
             time.sleep(delay)
     else:
         for angle in range(start, end - 1, -step):
-            duty_ns = int(500_000 + (angle / 165) * 2_000_000)
+            duty_ns = profile_165.to_ns(angle)
             servo.duty_ns(duty_ns)
             time.sleep(delay)
 
@@ -26,12 +30,12 @@ def smooth_move(servo, start, end, delay=0.05, step=1):
 def smooth_move_x(servo, start, end, delay=0.07, step=1):
     if start < end:
         for angle in range(start, end + 1, step):
-            duty_ns = int(500_000 + (angle / 180) * 2_000_000)
+            duty_ns = profile_180.to_ns(angle)
             servo.duty_ns(duty_ns)
             time.sleep(delay)
     else:
         for angle in range(start, end - 1, -step):
-            duty_ns = int(500_000 + (angle / 180) * 2_000_000)
+            duty_ns = profile_180.to_ns(angle)
             servo.duty_ns(duty_ns)
             time.sleep(delay)
 
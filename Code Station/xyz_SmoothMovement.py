@@ -1,5 +1,6 @@
 from machine import Pin, PWM
 import time
+from calibration import get_profile
 
 # Setup PWM for all three axes
 servo_y = PWM(Pin(15))
@@ -9,10 +10,10 @@ servo_z = PWM(Pin(13))
 for s in [servo_y, servo_x, servo_z]:
     s.freq(50)
 
+servo_profile = get_profile('df9gms_wide')  # 0.5-2.5 ms over 180°
+
 def set_angle(servo, angle):
-    angle = max(0, min(180, angle))
-    duty_ns = int(500000 + (angle / 180) * 2000000)
-    servo.duty_ns(duty_ns)
+    servo.duty_ns(servo_profile.to_ns(angle))
 
 def smooth_move(servo, start, end, step=2, delay=0.01):
     if start < end: